@@ -1,61 +1,61 @@
 from collections import deque
-from typing import Set, List, Tuple
+from typing import Dict, Set, List, Tuple
 from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+from environment import is_definition_name
 
 
 class AlphaConversion:
     def alpha_convert(self, ast: Expression, old_param: str, new_param: str):
+        # Every occurrence of old_param, binder or variable, becomes new_param.
+        # Iterative: work holds nodes still to visit and rebuild markers (a
+        # binder name for an abstraction, None for an application).
+        work: List = [ast]
+        values: List[Expression] = []
 
-        def normalize(ast: Expression, scope: List[Set]):
-            if isinstance(ast, VariableNode):
-                if ast.value == old_param and old_param in scope[-1]:
-                    return VariableNode(new_param)
-                return ast
-            elif isinstance(ast, LambdaAbstractionNode):
-                new_scope = set(scope[-1]) # create a new scope by extending the current scope
-
-                # Handle the parameter
-                new_param_name = ast.param
-                if ast.param == old_param and old_param in scope[-1]:
-                    new_param_name = new_param
-                    # Add new param to the scope for the body
-                    new_scope.add(new_param)
-                else:
-                    new_scope.add(ast.param)
-                
-                # Process the body with the new scope
-                new_body = normalize(ast.body, scope + [new_scope])
-                return LambdaAbstractionNode(new_param_name, new_body)
-            elif isinstance(ast, LambdaApplicationNode):
-                new_left = normalize(ast.left, scope)
-                new_right = normalize(ast.right, scope)
-                return LambdaApplicationNode(new_left, new_right)
+        while work:
+            item = work.pop()
+            if item is None:
+                right = values.pop()
+                values.append(LambdaApplicationNode(values.pop(), right))
+            elif isinstance(item, str):
+                values.append(LambdaAbstractionNode(item, values.pop()))
+            elif isinstance(item, VariableNode):
+                values.append(VariableNode(new_param) if item.value == old_param else item)
+            elif isinstance(item, LambdaAbstractionNode):
+                work.append(new_param if item.param == old_param else item.param)
+                work.append(item.body)
+            elif isinstance(item, LambdaApplicationNode):
+                work.append(None)
+                work.append(item.right)
+                work.append(item.left)
             else:
-                raise SyntaxError(f"Unknown node type: {ast}")
-        initial_scope = {old_param}
-        return normalize(ast, [initial_scope])
+                raise SyntaxError(f"Unknown node type: {item}")
+        return values.pop()
 
     def get_free_variables(self, ast: Expression):
-        if isinstance(ast, VariableNode):
-            return {ast.value}
-        elif isinstance(ast, LambdaAbstractionNode):
-            return self.get_free_variables(ast.body) - {ast.param}
-        elif isinstance(ast, LambdaApplicationNode):
-            return self.get_free_variables(ast.left) | self.get_free_variables(ast.right)
-        else:
+        # Free variables are computed once when the node is built
+        if not isinstance(ast, (VariableNode, LambdaAbstractionNode, LambdaApplicationNode)):
             raise SyntaxError(f"Unknown node type: {ast}")
+        return set(ast.free_vars)
 
     def get_bound_variables(self, ast: Expression, scope: Set = set()):
-        if isinstance(ast, VariableNode):
-            return {ast.value} if ast.value in scope else set()
-        elif isinstance(ast, LambdaAbstractionNode):
-            new_scope: Set = scope | {ast.param}
-            inner_bound: Set = self.get_bound_variables(ast.body, new_scope)
-            return inner_bound | {ast.param}
-        elif isinstance(ast, LambdaApplicationNode):
-            return self.get_bound_variables(ast.left, scope) | self.get_bound_variables(ast.right, scope)
-        else:
-            raise SyntaxError(f"Unknown node type: {ast}")
+        # Every parameter in ast, and every variable bound by scope or by one of them
+        bound: Set = set()
+        work: List[Tuple[Expression, Set]] = [(ast, scope)]
+        while work:
+            node, node_scope = work.pop()
+            if isinstance(node, VariableNode):
+                if node.value in node_scope:
+                    bound.add(node.value)
+            elif isinstance(node, LambdaAbstractionNode):
+                bound.add(node.param)
+                work.append((node.body, node_scope | {node.param}))
+            elif isinstance(node, LambdaApplicationNode):
+                work.append((node.left, node_scope))
+                work.append((node.right, node_scope))
+            else:
+                raise SyntaxError(f"Unknown node type: {node}")
+        return bound
 
 
     def get_free_and_bound_variables(self, ast: Expression, scope: Set = set()):
@@ -84,12 +84,120 @@ class AlphaConversion:
         result: Tuple[List, List] = (list(free_variables), list(bound_variables))
         return result
 
+    def alpha_hash(self, ast: Expression) -> int:
+        # Structural hash in which bound variables count by binder distance (De Bruijn
+        # index) instead of by name, so alpha-equivalent terms hash the same.
+        # Computed in one pass and cached on the node; closed subterms hash the
+        # same in any context, so their hashes are cached and reused as well.
+        if ast._alpha_hash is not None:
+            return ast._alpha_hash
+
+        binders: Dict[str, List[int]] = {} # name -> depths of the binders currently in scope
+        depth: int = 0
+        work: List = [ast]
+        values: List[int] = []
+
+        while work:
+            item = work.pop()
+
+            if type(item) is tuple:
+                # Exit marker, all children of the node have been hashed
+                node = item[0]
+                if isinstance(node, LambdaAbstractionNode):
+                    binders[node.param].pop()
+                    depth -= 1
+                    value = hash(("l", values.pop()))
+                else:
+                    right = values.pop()
+                    value = hash(("a", values.pop(), right))
+                if not node.free_vars:
+                    object.__setattr__(node, "_alpha_hash", value)
+                values.append(value)
+            elif not item.free_vars and item._alpha_hash is not None:
+                values.append(item._alpha_hash)
+            elif isinstance(item, VariableNode):
+                scope = binders.get(item.value)
+                if scope:
+                    values.append(hash(("b", depth - scope[-1] - 1)))
+                else:
+                    values.append(hash(("f", item.value)))
+            elif isinstance(item, LambdaAbstractionNode):
+                binders.setdefault(item.param, []).append(depth)
+                depth += 1
+                work.append((item,))
+                work.append(item.body)
+            elif isinstance(item, LambdaApplicationNode):
+                work.append((item,))
+                work.append(item.right)
+                work.append(item.left)
+            else:
+                raise SyntaxError(f"Unknown node type: {item}")
+
+        result = values.pop()
+        object.__setattr__(ast, "_alpha_hash", result)
+        return result
+
+    def alpha_equivalent(self, first: Expression, second: Expression) -> bool:
+        # Equal up to the names of bound variables
+        if first is second:
+            return True
+        if first.size != second.size or first.free_vars != second.free_vars:
+            return False
+        if self.alpha_hash(first) != self.alpha_hash(second):
+            return False
+
+        first_binders: Dict[str, List[int]] = {}
+        second_binders: Dict[str, List[int]] = {}
+        depth: int = 0
+        work: List = [(first, second)]
+
+        while work:
+            item = work.pop()
+
+            if len(item) == 3:
+                # Leaving a pair of abstractions
+                first_binders[item[1]].pop()
+                second_binders[item[2]].pop()
+                depth -= 1
+                continue
+
+            left, right = item
+            if left is right and not left.free_vars:
+                continue
+            if type(left) is not type(right):
+                return False
+
+            if isinstance(left, VariableNode):
+                left_scope = first_binders.get(left.value)
+                right_scope = second_binders.get(right.value)
+                left_level = left_scope[-1] if left_scope else None
+                right_level = right_scope[-1] if right_scope else None
+                if left_level != right_level:
+                    return False
+                if left_level is None and left.value != right.value:
+                    return False
+            elif isinstance(left, LambdaAbstractionNode):
+                first_binders.setdefault(left.param, []).append(depth)
+                second_binders.setdefault(right.param, []).append(depth)
+                depth += 1
+                work.append((None, left.param, right.param))
+                work.append((left.body, right.body))
+            elif isinstance(left, LambdaApplicationNode):
+                work.append((left.right, right.right))
+                work.append((left.left, right.left))
+            else:
+                raise SyntaxError(f"Unknown node type: {left}")
+
+        return True
+
     def generate_new_variable(self, old_param: str, forbidded_variables: Set):
         # The newly generated variable shouldn't be part of the "free_variables" set
-        # and it should be like "old_param"
+        # and it should be like "old_param". It must never look like a definition
+        # name (X1 for X), or a reference to that definition would capture it.
         candidate = old_param
+        stem = old_param.lower() if is_definition_name(f"{old_param}1") else old_param
         counter = 1
-        while candidate in forbidded_variables:
-            candidate = f"{old_param}{counter}"
+        while candidate in forbidded_variables or is_definition_name(candidate):
+            candidate = f"{stem}{counter}"
             counter += 1
         return candidate
@@ -1,8 +1,34 @@
 from abc import ABC
-from dataclasses import dataclass
+from weakref import WeakValueDictionary
 
 
 class Expression(ABC):
+    # Nodes are immutable and hash-consed through NodeFactory: building a node
+    # that is structurally identical to a live one returns that same object, so
+    # equality is identity and the hash is computed once at construction.
+    #
+    # Every node also carries, computed once from its children:
+    #   free_vars: frozenset of the names that occur free in the node
+    #   size:      number of nodes in the tree
+    #   depth:     length of the longest path from the node to a variable
+    #
+    # _alpha_hash caches AlphaConversion.alpha_hash, filled in on first use.
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def to_json(self):
         if isinstance(self, VariableNode):
@@ -13,39 +39,200 @@ class Expression(ABC):
             return {"type": self.type, "func": self.left.to_json(), "arg": self.right.to_json()}
 
 
-@dataclass
 class VariableNode(Expression):
-    value: str
+    __slots__ = ("value", "free_vars", "size", "depth", "_hash", "_alpha_hash", "__weakref__")
+    __match_args__ = ("value",)
     type: str = "Variable"
 
+    def __new__(cls, value: str):
+        return node_factory.variable(value)
+
+    def __reduce__(self):
+        return (VariableNode, (self.value,))
+
     def __str__(self):
-        return f"{self.value}"
-    
+        return render(self, False)
+
     def __repr__(self):
-        return f"VariableNode({self.value})"
+        return render(self, True)
 
 
-@dataclass
 class LambdaAbstractionNode(Expression):
-    param: str
-    body: Expression
+    __slots__ = ("param", "body", "free_vars", "size", "depth", "_hash", "_alpha_hash", "__weakref__")
+    __match_args__ = ("param", "body")
     type: str = "Lambda"
 
+    def __new__(cls, param: str, body: Expression):
+        return node_factory.abstraction(param, body)
+
+    def __reduce__(self):
+        return (LambdaAbstractionNode, (self.param, self.body))
+
     def __str__(self):
-        return f"fn {self.param}.{repr(self.body)}"
+        return render(self, False)
 
     def __repr__(self):
-        return f"LambdaAbstractionNode('{self.param}', '{repr(self.body)}')"
+        return render(self, True)
 
 
-@dataclass
 class LambdaApplicationNode(Expression):
-    left: Expression
-    right: Expression
+    __slots__ = ("left", "right", "free_vars", "size", "depth", "_hash", "_alpha_hash", "__weakref__")
+    __match_args__ = ("left", "right")
     type: str = "Application"
 
+    def __new__(cls, left: Expression, right: Expression):
+        return node_factory.application(left, right)
+
+    def __reduce__(self):
+        return (LambdaApplicationNode, (self.left, self.right))
+
     def __str__(self):
-        return f"({self.left} {self.right})"
-    
+        return render(self, False)
+
     def __repr__(self):
-        return f"LambdaApplicationNode({repr(self.left)}, {repr(self.right)})"
\ No newline at end of file
+        return render(self, True)
+
+
+def render(ast: Expression, as_repr: bool) -> str:
+    # str() and repr() of a node, built with an explicit stack so terms of any
+    # depth print. A body is always shown as its repr, an application's
+    # children as whichever the application is shown as.
+    parts = []
+    stack = [(ast, as_repr)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        node, as_repr = item
+        if isinstance(node, VariableNode):
+            parts.append(f"VariableNode({node.value})" if as_repr else node.value)
+        elif isinstance(node, LambdaAbstractionNode):
+            if as_repr:
+                stack.extend(("')", (node.body, True), f"LambdaAbstractionNode('{node.param}', '"))
+            else:
+                stack.extend(((node.body, True), f"fn {node.param}."))
+        else:
+            if as_repr:
+                stack.extend((")", (node.right, True), ", ", (node.left, True), "LambdaApplicationNode("))
+            else:
+                stack.extend((")", (node.right, False), " ", (node.left, False), "("))
+    return "".join(parts)
+
+
+class Definition:
+    # A top-level "def NAME = expression" statement; not part of any term
+    __slots__ = ("name", "expression")
+    __match_args__ = ("name", "expression")
+
+    def __init__(self, name: str, expression: Expression):
+        self.name = name
+        self.expression = expression
+
+    def __eq__(self, other):
+        return isinstance(other, Definition) and self.name == other.name and self.expression is other.expression
+
+    def __hash__(self):
+        return hash((self.name, self.expression))
+
+    def __str__(self):
+        return f"def {self.name} = {self.expression}"
+
+    def __repr__(self):
+        return f"Definition('{self.name}', {repr(self.expression)})"
+
+
+class Import:
+    # A top-level 'import "path"' statement
+    __slots__ = ("path",)
+    __match_args__ = ("path",)
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __eq__(self, other):
+        return isinstance(other, Import) and self.path == other.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __str__(self):
+        return f'import "{self.path}"'
+
+    def __repr__(self):
+        return f"Import('{self.path}')"
+
+
+class NodeFactory:
+    """
+    Builds every AST node. Structurally identical nodes are created once and
+    shared for as long as something references them; the table only holds weak
+    references so unused nodes are still garbage collected.
+
+    Children are already hash-consed, so a node is identified by its own
+    fields plus the identities of its children.
+    """
+    def __init__(self):
+        self.table: WeakValueDictionary = WeakValueDictionary()
+
+    def variable(self, value: str) -> VariableNode:
+        key = ("v", value)
+        node = self.table.get(key)
+        if node is None:
+            node = object.__new__(VariableNode)
+            object.__setattr__(node, "value", value)
+            object.__setattr__(node, "free_vars", frozenset((value,)))
+            object.__setattr__(node, "size", 1)
+            object.__setattr__(node, "depth", 1)
+            object.__setattr__(node, "_hash", hash(key))
+            object.__setattr__(node, "_alpha_hash", None)
+            self.table[key] = node
+        return node
+
+    def abstraction(self, param: str, body: Expression) -> LambdaAbstractionNode:
+        key = ("l", param, id(body))
+        node = self.table.get(key)
+        if node is None:
+            node = object.__new__(LambdaAbstractionNode)
+            object.__setattr__(node, "param", param)
+            object.__setattr__(node, "body", body)
+            free_vars = body.free_vars
+            object.__setattr__(node, "free_vars", free_vars - {param} if param in free_vars else free_vars)
+            object.__setattr__(node, "size", body.size + 1)
+            object.__setattr__(node, "depth", body.depth + 1)
+            object.__setattr__(node, "_hash", hash(("l", param, body._hash)))
+            object.__setattr__(node, "_alpha_hash", None)
+            self.table[key] = node
+        return node
+
+    def application(self, left: Expression, right: Expression) -> LambdaApplicationNode:
+        key = ("a", id(left), id(right))
+        node = self.table.get(key)
+        if node is None:
+            node = object.__new__(LambdaApplicationNode)
+            object.__setattr__(node, "left", left)
+            object.__setattr__(node, "right", right)
+            object.__setattr__(node, "free_vars", self.union(left.free_vars, right.free_vars))
+            object.__setattr__(node, "size", left.size + right.size + 1)
+            object.__setattr__(node, "depth", max(left.depth, right.depth) + 1)
+            object.__setattr__(node, "_hash", hash(("a", left._hash, right._hash)))
+            object.__setattr__(node, "_alpha_hash", None)
+            self.table[key] = node
+        return node
+
+    def union(self, left: frozenset, right: frozenset) -> frozenset:
+        # Reuse a child's set when one contains the other, so chains such as
+        # f (f (f x)) share a single frozenset instead of allocating one per node
+        if right <= left:
+            return left
+        if left <= right:
+            return right
+        return left | right
+
+    def __len__(self):
+        return len(self.table)
+
+
+# Shared by every node constructor, so the lexer/parser pipeline, the
+# evaluators and ChurchNumeral all build through the same table.
+node_factory: NodeFactory = NodeFactory()
@@ -0,0 +1,34 @@
+from typing import Callable, Dict, Optional, Set
+from ast_internal import Expression
+from combinators import GraphReducer
+from de_bruijn import DeBruijnEvaluator
+from explicit_substitution import ExplicitSubstitutionEvaluator
+from g_machine import GMachine
+from interaction_net import InteractionNet
+from iterative_reduction import IterativeEvaluator
+from lazy_machine import LazyMachine
+from nbe import NbeEvaluator
+from python_compiler import python_compiler
+
+# Alternative evaluation engines selectable from the Repl and main.py. Each one
+# takes a parsed expression and the session's step budget, and returns its
+# normal form. The default engine, "substitution", is Evaluator itself and is
+# handled by the Repl directly since it also supports strategies, budgets and
+# metrics.
+SUBSTITUTION: str = "substitution"
+
+BACKENDS: Dict[str, Callable[[Expression, Optional[int]], Expression]] = {
+    "iterative": lambda ast, max_steps: IterativeEvaluator().beta_reduce(ast),
+    "de-bruijn": lambda ast, max_steps: DeBruijnEvaluator().evaluate(ast),
+    "lazy": lambda ast, max_steps: LazyMachine().evaluate(ast),
+    "nbe": lambda ast, max_steps: NbeEvaluator().normalize(ast),
+    "python": lambda ast, max_steps: python_compiler.normalize(ast),
+    "ski": lambda ast, max_steps: GraphReducer().evaluate(ast),
+    "g-machine": lambda ast, max_steps: GMachine().evaluate(ast),
+    "interaction-net": lambda ast, max_steps: InteractionNet(max_interactions=max_steps).evaluate(ast),
+    "explicit": lambda ast, max_steps: ExplicitSubstitutionEvaluator().evaluate(ast),
+}
+
+# Engines that stop with BudgetExceeded once max_steps is used up (the
+# interaction net counts interactions, which are at least its beta steps)
+STEP_BUDGET_BACKENDS: Set[str] = {"interaction-net"}
@@ -1,12 +1,193 @@
-from typing import Dict, Set
+import time
+from typing import Dict, List, Optional, Set
 from alpha_conversion import AlphaConversion
 from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
-from stack import print_stack
+from reduction_metrics import ReductionMetrics, ReductionInterrupted, BudgetExceeded, ReductionCancelled, CycleDetected, UnboundedGrowth, EvaluationResult
+from reduction_strategy import ReductionStrategy
+from normal_form_cache import NormalFormCache
+from cancellation import CancellationToken
+from environment import Environment
+from tracing import traced
+
+# Context frames: where the subterm currently being reduced sits inside the whole term
+_BODY = 0 # under fn payload. (hole)
+_HEAD = 1 # (hole payload)
+_ARGUMENT = 2 # (payload hole)
+
+# Strategies run by Evaluator.run
+_DEFAULT = 0
+_NORMAL = 1
+_APPLICATIVE = 2
+_VALUE = 3
+_NAME = 4
+_HEAD_NORMAL = 5
+_FULL_NORMAL_FORMS = (_DEFAULT, _NORMAL, _APPLICATIVE) # strategies that can use the normal form cache
+
+# Continuation frames of Evaluator.run: (kind, payload, strategy to go on with)
+_REBUILD_ABSTRACTION = 0 # payload: parameter, value: reduced body
+_REBUILD_APPLICATION = 1 # payload: reduced head, value: reduced argument
+_REDUCED_HEAD = 2 # payload: unreduced argument, value: reduced head
+_NORMALIZED_HEAD = 3 # payload: unreduced argument, value: head in normal form
+_REDUCED_ARGUMENT = 4 # payload: reduced head, value: reduced argument
+_STORE = 5 # payload: closed term whose normal form is the value
+
+# Beta steps between two checks of the cancellation token and the deadline
+CHECK_INTERVAL = 64
 
 
 class Evaluator:
-    def __init__(self):
+    def __init__(
+        self,
+        strategy: ReductionStrategy = ReductionStrategy.DEFAULT,
+        max_steps: Optional[int] = None,
+        max_size: Optional[int] = None,
+        cache: Optional[NormalFormCache] = None,
+        detect_divergence: bool = False,
+        growth_window: int = 100,
+        cancellation: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None,
+        environment: Optional[Environment] = None
+    ):
         self.alpha_conversion = AlphaConversion()
+        self.strategy: ReductionStrategy = strategy
+        self.max_steps: Optional[int] = max_steps # beta steps allowed per run
+        self.max_size: Optional[int] = max_size # nodes the whole term may grow to
+        self.cache: Optional[NormalFormCache] = cache # normal forms of closed applications, used by full normal form strategies
+        self.metrics: ReductionMetrics = ReductionMetrics()
+        self.context: List = [] # frames from the root down to the subterm being reduced
+        self.term_size: int = 0 # size of the whole term being reduced, kept up to date by contract()
+        self.detect_divergence: bool = detect_divergence # stop on a repeated term or on unbroken growth
+        self.growth_window: int = growth_window # consecutive growing steps taken as divergence
+        self.checkpoint: Optional[tuple] = None # (step, whole term, its size) that later terms are compared with
+        self.checkpoint_distance: int = 1 # steps after the checkpoint at which it moves on
+        self.growth_streak: int = 0
+        self.cancellation: Optional[CancellationToken] = cancellation # polled every CHECK_INTERVAL steps
+        self.timeout: Optional[float] = timeout # seconds of wall-clock time per run
+        self.deadline: Optional[float] = None
+        self.environment: Optional[Environment] = environment # definitions, expanded when a reference is reached
+
+    @property
+    def beta_steps(self) -> int:
+        return self.metrics.beta_steps
+
+    def evaluate(self, ast: Expression) -> EvaluationResult:
+        # Like reduce(), but never raises for budgets: the outcome and the metrics are returned as data
+        start = time.perf_counter()
+        try:
+            expression = self.reduce(ast)
+            status, reason = "completed", None
+        except ReductionInterrupted as interrupted:
+            expression, status, reason = interrupted.partial, interrupted.status, str(interrupted)
+        self.metrics.wall_time = time.perf_counter() - start
+        return EvaluationResult(expression, self.metrics, status, reason)
+
+    def reduce(self, ast: Expression) -> Expression:
+        # Entry point shared by every strategy
+        self.metrics = ReductionMetrics(peak_term_size=ast.size)
+        self.context = []
+        self.term_size = ast.size
+        self.checkpoint = (0, ast, ast.size)
+        self.checkpoint_distance = 1
+        self.growth_streak = 0
+        self.deadline = time.perf_counter() + self.timeout if self.timeout is not None else None
+        strategies = {
+            ReductionStrategy.DEFAULT: self.beta_reduce,
+            ReductionStrategy.NORMAL_ORDER: self.normal_order,
+            ReductionStrategy.APPLICATIVE_ORDER: self.applicative_order,
+            ReductionStrategy.CALL_BY_VALUE: self.call_by_value,
+            ReductionStrategy.CALL_BY_NAME: self.call_by_name,
+            ReductionStrategy.HEAD_NORMAL_FORM: self.head_normal_form,
+        }
+        return strategies[self.strategy](ast)
+
+    @traced
+    def contract(self, abstraction: LambdaAbstractionNode, argument: Expression) -> Expression:
+        # A single beta step, every strategy goes through here
+        metrics = self.metrics
+        if self.max_steps is not None and metrics.beta_steps >= self.max_steps:
+            raise BudgetExceeded("step", self.max_steps, self.plug(LambdaApplicationNode(abstraction, argument)), metrics)
+
+        if metrics.beta_steps % CHECK_INTERVAL == 0 and (self.cancellation is not None or self.deadline is not None):
+            self.check_cancellation(abstraction, argument)
+
+        metrics.beta_steps += 1
+        result = self.substitute(abstraction.param, abstraction.body, argument)
+
+        # Every change to the whole term is a contraction, so its size moves by
+        # the difference between the contractum and the redex it replaces
+        growth: int = result.size - abstraction.size - argument.size - 1
+        self.term_size += growth
+        if self.term_size > metrics.peak_term_size:
+            metrics.peak_term_size = self.term_size
+            if self.max_size is not None and self.term_size > self.max_size:
+                raise BudgetExceeded("size", self.max_size, self.plug(result), metrics)
+
+        if self.detect_divergence:
+            self.check_divergence(result, growth > 0)
+        return result
+
+    def check_cancellation(self, abstraction: LambdaAbstractionNode, argument: Expression) -> None:
+        reason: Optional[str] = None
+        if self.cancellation is not None and self.cancellation.cancelled:
+            reason = self.cancellation.reason
+        elif self.deadline is not None and time.perf_counter() > self.deadline:
+            reason = f"timed out after {self.timeout}s"
+        if reason is not None:
+            raise ReductionCancelled(reason, self.plug(LambdaApplicationNode(abstraction, argument)), self.metrics)
+
+    def check_divergence(self, result: Expression, grew: bool) -> None:
+        # Brent's cycle detection: each term is compared with one checkpoint,
+        # which moves to the current term whenever the steps since it reach a
+        # power of two, so a loop is reported with its exact length. Only
+        # terms the size of the checkpoint are rebuilt and compared.
+        step: int = self.metrics.beta_steps
+        checkpoint_step, checkpoint, checkpoint_size = self.checkpoint
+        term: Optional[Expression] = None
+        if self.term_size == checkpoint_size:
+            term = self.plug(result)
+            if self.alpha_conversion.alpha_equivalent(checkpoint, term):
+                raise CycleDetected(step - checkpoint_step, term, self.metrics)
+        if step - checkpoint_step == self.checkpoint_distance:
+            self.checkpoint = (step, term if term is not None else self.plug(result), self.term_size)
+            self.checkpoint_distance *= 2
+
+        self.growth_streak = self.growth_streak + 1 if grew else 0
+        if self.growth_streak >= self.growth_window:
+            raise UnboundedGrowth(self.growth_streak, self.plug(result), self.metrics)
+
+    def expand(self, variable: VariableNode) -> Expression:
+        # Delta step: a reference to a definition becomes its normal form
+        if self.environment is None:
+            return variable
+        definition = self.environment.get(variable.value)
+        if definition is None:
+            return variable
+
+        self.metrics.expansions += 1
+        self.term_size += definition.size - 1
+        if self.term_size > self.metrics.peak_term_size:
+            self.metrics.peak_term_size = self.term_size
+        return definition
+
+    def descend(self, kind: int, payload) -> None:
+        self.context.append((kind, payload))
+        if len(self.context) > self.metrics.peak_depth:
+            self.metrics.peak_depth = len(self.context)
+
+    def ascend(self) -> None:
+        self.context.pop()
+
+    def plug(self, focus: Expression) -> Expression:
+        # Rebuild the whole term around the subterm being reduced
+        term = focus
+        for kind, payload in reversed(self.context):
+            if kind == _BODY:
+                term = LambdaAbstractionNode(payload, term)
+            elif kind == _HEAD:
+                term = LambdaApplicationNode(term, payload)
+            else:
+                term = LambdaApplicationNode(payload, term)
+        return term
 
     def normalize(self, ast: Expression, mapping: Dict = None, used: Set = None):
         # Normalize the AST to avoid variable shadowing
@@ -24,6 +205,7 @@ class Evaluator:
             # Generate a fresh name for the current parameter.
             # The forbidden set is everything already used
             new_param = self.alpha_conversion.generate_new_variable(ast.param, used | set(mapping.values()))
+            self.metrics.fresh_names += 1
             used.add(new_param)
 
             # Copy the current mapping and add the new renaming
@@ -40,61 +222,167 @@ class Evaluator:
         else:
             raise SyntaxError(f"Unknown node type: {ast}")
 
-    @print_stack
-    def beta_reduce(self, ast: Expression) -> Expression:
-        # normalized_ast: Expression = self.normalize(ast)
-
-        match ast:
-            case VariableNode(_):
-                return ast
-            case LambdaAbstractionNode(param, body):
-                reduced_body = self.beta_reduce(body)
-                return LambdaAbstractionNode(param, reduced_body)
-            case LambdaApplicationNode(left, right):
-                new_left = self.beta_reduce(left)
-
-                if isinstance(new_left, LambdaAbstractionNode):
-                    substituted_result = self.substitute(new_left.param, new_left.body, right)
-                    return self.beta_reduce(substituted_result)
-                
-                new_right = self.beta_reduce(right)
-                return LambdaApplicationNode(new_left, new_right)
-            case _:
-                raise SyntaxError(f"Unknown node type: {ast}")
-    
-    @print_stack
+    def run(self, ast: Expression, strategy: int, use_cache: bool = True) -> Expression:
+        # The strategies as one machine with an explicit continuation stack, so
+        # neither the number of steps nor the depth of a term is limited by
+        # Python's recursion limit. Every frame also keeps the strategy to go
+        # on with; self.context mirrors the stack for plug().
+        continuations: List = []
+        term: Expression = ast
+
+        while True:
+            node_type = type(term)
+            if use_cache and self.cache is not None and strategy in _FULL_NORMAL_FORMS and node_type is LambdaApplicationNode and not term.free_vars:
+                # A closed term's normal form doesn't depend on where it appears
+                value = self.cache.lookup(term)
+                if value is None:
+                    continuations.append((_STORE, term, strategy))
+                    use_cache = False
+                    continue
+                self.term_size += value.size - term.size
+            elif node_type is VariableNode:
+                value = self.expand(term)
+            elif node_type is LambdaAbstractionNode:
+                if strategy == _VALUE or strategy == _NAME:
+                    value = term
+                else:
+                    self.descend(_BODY, term.param)
+                    continuations.append((_REBUILD_ABSTRACTION, term.param, strategy))
+                    term = term.body
+                    use_cache = True
+                    continue
+            elif node_type is LambdaApplicationNode:
+                self.descend(_HEAD, term.right)
+                continuations.append((_REDUCED_HEAD, term.right, strategy))
+                term = term.left
+                # Normal order and head normal form only need the head in weak head normal form to decide
+                if strategy == _NORMAL or strategy == _HEAD_NORMAL:
+                    strategy = _NAME
+                use_cache = True
+                continue
+            else:
+                raise SyntaxError(f"Unknown node type: {term}")
+
+            # Hand the value back up until a frame has another term to reduce
+            while continuations:
+                kind, payload, strategy = continuations.pop()
+                if kind == _REBUILD_ABSTRACTION:
+                    self.ascend()
+                    value = LambdaAbstractionNode(payload, value)
+                elif kind == _REBUILD_APPLICATION:
+                    self.ascend()
+                    value = LambdaApplicationNode(payload, value)
+                elif kind == _STORE:
+                    self.cache.store(payload, value)
+                elif kind == _REDUCED_HEAD:
+                    self.ascend()
+                    if strategy == _APPLICATIVE or strategy == _VALUE:
+                        # The argument is reduced before contracting
+                        self.descend(_ARGUMENT, value)
+                        continuations.append((_REDUCED_ARGUMENT, value, strategy))
+                        term = payload
+                        break
+                    if type(value) is LambdaAbstractionNode:
+                        term = self.contract(value, payload)
+                        break
+                    if strategy == _NORMAL:
+                        self.descend(_HEAD, payload)
+                        continuations.append((_NORMALIZED_HEAD, payload, strategy))
+                        term = value
+                        break
+                    if strategy == _DEFAULT:
+                        self.descend(_ARGUMENT, value)
+                        continuations.append((_REBUILD_APPLICATION, value, strategy))
+                        term = payload
+                        break
+                    value = LambdaApplicationNode(value, payload)
+                elif kind == _NORMALIZED_HEAD:
+                    self.ascend()
+                    self.descend(_ARGUMENT, value)
+                    continuations.append((_REBUILD_APPLICATION, value, strategy))
+                    term = payload
+                    break
+                else: # _REDUCED_ARGUMENT, the payload is the reduced head
+                    self.ascend()
+                    if type(payload) is LambdaAbstractionNode:
+                        term = self.contract(payload, value)
+                        break
+                    value = LambdaApplicationNode(payload, value)
+            else:
+                return value
+            use_cache = True
+
+    @traced
+    def beta_reduce(self, ast: Expression, use_cache: bool = True) -> Expression:
+        # Leftmost head first, and arguments of stuck applications after it
+        return self.run(ast, _DEFAULT, use_cache)
+
+    @traced
+    def normal_order(self, ast: Expression, use_cache: bool = True) -> Expression:
+        # Only brings the head to weak head normal form before deciding, the argument stays unevaluated
+        return self.run(ast, _NORMAL, use_cache)
+
+    @traced
+    def applicative_order(self, ast: Expression, use_cache: bool = True) -> Expression:
+        return self.run(ast, _APPLICATIVE, use_cache)
+
+    @traced
+    def call_by_value(self, ast: Expression) -> Expression:
+        return self.run(ast, _VALUE)
+
+    @traced
+    def call_by_name(self, ast: Expression) -> Expression:
+        return self.run(ast, _NAME)
+
+    @traced
+    def head_normal_form(self, ast: Expression) -> Expression:
+        return self.run(ast, _HEAD_NORMAL)
+
+    @traced
     def substitute(self, param: Expression, body: Expression, argument: Expression):
+        # Iterative, so the depth of the body isn't limited by Python's recursion
+        # limit: work holds nodes still to visit and rebuild markers (a binder
+        # name for an abstraction, an int for an application), values the
+        # rebuilt subterms
+        fv = argument.free_vars
+        work: List = [body]
+        values: List[Expression] = []
+
+        while work:
+            item = work.pop()
+            item_type = type(item)
+            if item_type is str:
+                values.append(LambdaAbstractionNode(item, values.pop()))
+                continue
+            if item_type is int:
+                right = values.pop()
+                values.append(LambdaApplicationNode(values.pop(), right))
+                continue
+
+            self.metrics.substitutions += 1
+            # Nothing to replace in a subtree that doesn't mention param, share it
+            # as is (this also covers a binder that shadows param)
+            if param not in item.free_vars:
+                values.append(item)
+            elif item_type is VariableNode:
+                values.append(argument)
+            elif item_type is LambdaApplicationNode:
+                work.append(_REBUILD_APPLICATION)
+                work.append(item.right)
+                work.append(item.left)
+            elif item_type is LambdaAbstractionNode:
+                _param, _body = item.param, item.body
+                # Substituting under the binder would capture a free variable of the argument
+                if _param in fv:
+                    new_param: str = self.alpha_conversion.generate_new_variable(_param, fv | _body.free_vars | self.alpha_conversion.get_bound_variables(_body))
+                    self.metrics.fresh_names += 1
 
-        match body:
-            case VariableNode(value):
-                if param == value:
-                    return argument
-                return body
-            case LambdaAbstractionNode(_param, _body):
-                if param != _param:
-                    # Before substituting we have to check, whether the substitution will cause variable capture
-
-                    # Get the free variable in the argument
-                    fv = self.alpha_conversion.get_free_variables(argument)
-
-                    # Check if the free variable conflicts with the lambda's parameter
-                    if _param in fv:
-                        # Generate a new variable
-                        new_param: str = self.alpha_conversion.generate_new_variable(_param, fv | self.alpha_conversion.get_free_variables(_body) | self.alpha_conversion.get_bound_variables(_body))
-
-                        # Once you have a new variable, now alpha convert the body
-                        new_body = self.alpha_conversion.alpha_convert(_body, _param, new_param)
-
-                        # Now substitute the alpha converted body
-                        r = self.substitute(param, new_body, argument)
-                        return LambdaAbstractionNode(new_param, r)
-
-                    r = self.substitute(param, _body, argument)
-                    return LambdaAbstractionNode(_param, r)
-                return body
-            case LambdaApplicationNode(left, right):
-                new_left = self.substitute(param, left, argument)
-                new_right = self.substitute(param, right, argument)
-                return LambdaApplicationNode(new_left, new_right)
-            case _:
-                raise SyntaxError(f"Unknown node type: {body}")
\ No newline at end of file
+                    # Once you have a new variable, now alpha convert the body
+                    _body = self.alpha_conversion.alpha_convert(_body, _param, new_param)
+                    self.metrics.alpha_renamings += 1
+                    _param = new_param
+                work.append(_param)
+                work.append(_body)
+            else:
+                raise SyntaxError(f"Unknown node type: {item}")
+        return values.pop()
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import Optional
+
+
+class CancellationToken:
+    """
+    Set from another thread or a signal handler to ask a running evaluation
+    to stop. The evaluator polls it, so cancelling never interrupts a step
+    half way through.
+    """
+    def __init__(self):
+        self.cancelled: bool = False
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = reason
+        self.cancelled = True
+
+    def reset(self) -> None:
+        self.cancelled = False
+        self.reason = None
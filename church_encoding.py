@@ -2,6 +2,27 @@ from ast_internal import VariableNode, LambdaAbstractionNode, LambdaApplicationN
 from typing import Optional
 
 class ChurchNumeral:
+    def encode_church_numeral(self, n: int, f: str = "f", x: str = "x") -> LambdaAbstractionNode:
+        """
+        Build the Church numeral for n, i.e. fn f. fn x. f (f (... (f x)))
+
+        Args:
+            n: Non-negative integer to encode
+            f: Name of the successor parameter
+            x: Name of the zero parameter
+
+        Returns:
+            LambdaAbstractionNode: The encoded numeral
+        """
+        if n < 0:
+            raise ValueError(f"Church numerals are non-negative, got {n}")
+
+        successor = VariableNode(f)
+        body = VariableNode(x)
+        for _ in range(n):
+            body = LambdaApplicationNode(successor, body)
+        return LambdaAbstractionNode(f, LambdaAbstractionNode(x, body))
+
     def decode_church_numeral(self, expression: LambdaAbstractionNode) -> Optional[int]:
         """
         Check if expression is a Church numeral and return its value.
@@ -0,0 +1,169 @@
+from typing import Dict, List, Set, Tuple
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+# Combinator terms are tuples whose last field is their set of free variables:
+#   ("C", name, fv)      combinator S, K, I, B or C
+#   ("V", name, fv)      variable
+#   ("@", left, right, fv)
+CombinatorTerm = Tuple
+
+ARITY: Dict[str, int] = {"I": 1, "K": 2, "S": 3, "B": 3, "C": 3}
+_NO_FREE_VARIABLES: frozenset = frozenset()
+S = ("C", "S", _NO_FREE_VARIABLES)
+K = ("C", "K", _NO_FREE_VARIABLES)
+I = ("C", "I", _NO_FREE_VARIABLES)
+B = ("C", "B", _NO_FREE_VARIABLES)
+C = ("C", "C", _NO_FREE_VARIABLES)
+
+
+def apply(left: CombinatorTerm, right: CombinatorTerm) -> CombinatorTerm:
+    return ("@", left, right, left[-1] | right[-1])
+
+
+class BracketAbstraction:
+    """
+    Translates lambda terms into S/K/I/B/C combinator terms with Turner's
+    optimized bracket abstraction. The result has no bound variables at all,
+    so reducing it needs neither renaming nor capture checks.
+
+    The eta rule ([x] (f x) = f) is only used for closed f, which always reads
+    back as an abstraction; for an open f it would make the read-back result
+    the beta-eta normal form instead of the beta normal form.
+    """
+    def translate(self, ast: Expression) -> CombinatorTerm:
+        match ast:
+            case VariableNode(value):
+                return ("V", value, frozenset((value,)))
+            case LambdaAbstractionNode(param, body):
+                return self.abstract(param, self.translate(body))
+            case LambdaApplicationNode(left, right):
+                return apply(self.translate(left), self.translate(right))
+            case _:
+                raise SyntaxError(f"Unknown node type: {ast}")
+
+    def abstract(self, name: str, term: CombinatorTerm) -> CombinatorTerm:
+        # [name] term: a combinator term that, applied to a value, gives term with name replaced by it
+        if name not in term[-1]:
+            return apply(K, term)
+        if term[0] == "V":
+            return I
+
+        _, left, right, _ = term
+        if right[0] == "V" and right[1] == name and not left[-1]:
+            return left # eta: [x] (f x) = f, for closed f
+        if name in left[-1] and name in right[-1]:
+            return apply(apply(S, self.abstract(name, left)), self.abstract(name, right))
+        if name in left[-1]:
+            return apply(apply(C, self.abstract(name, left)), right)
+        return apply(apply(B, left), self.abstract(name, right))
+
+    def to_string(self, term: CombinatorTerm) -> str:
+        if term[0] != "@":
+            return term[1]
+        right = self.to_string(term[2])
+        return f"{self.to_string(term[1])} {f'({right})' if term[2][0] == '@' else right}"
+
+
+# Graph node tags
+_COMBINATOR = 0 # left: combinator name
+_FREE = 1 # left: variable name
+_APPLICATION = 2 # left: function node, right: argument node
+_INDIRECTION = 3 # left: node this one was reduced to
+
+
+class GraphNode:
+    __slots__ = ("tag", "left", "right")
+
+    def __init__(self, tag: int, left, right=None):
+        self.tag = tag
+        self.left = left
+        self.right = right
+
+
+class GraphReducer:
+    """
+    Reduces combinator graphs by overwriting each redex's root with its result,
+    so a shared subexpression is reduced once for all of its uses.
+
+    evaluate() translates a lambda term, reduces it and reads the normal form
+    back as a lambda term: a partially applied combinator is a function, so it
+    is applied to a fresh variable and the result abstracted again.
+    """
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+        self.bracket_abstraction = BracketAbstraction()
+        self.reductions: int = 0
+        self.free_names: Set[str] = set()
+
+    def evaluate(self, ast: Expression) -> Expression:
+        self.free_names = set(ast.free_vars)
+        return self.read_back(self.build(self.bracket_abstraction.translate(ast)), set())
+
+    def build(self, term: CombinatorTerm) -> GraphNode:
+        # Equal tuples (e.g. the same translated subterm) become one shared node
+        nodes: Dict[int, GraphNode] = {}
+
+        def build_node(term: CombinatorTerm) -> GraphNode:
+            node = nodes.get(id(term))
+            if node is None:
+                if term[0] == "C":
+                    node = GraphNode(_COMBINATOR, term[1])
+                elif term[0] == "V":
+                    node = GraphNode(_FREE, term[1])
+                else:
+                    node = GraphNode(_APPLICATION, build_node(term[1]), build_node(term[2]))
+                nodes[id(term)] = node
+            return node
+        return build_node(term)
+
+    def whnf(self, node: GraphNode) -> Tuple[GraphNode, List[GraphNode]]:
+        # Unwinds the spine and rewrites redexes in place until the head is a free
+        # variable or a combinator without enough arguments. Returns the head and
+        # its arguments, outermost last.
+        stack: List[GraphNode] = [node]
+
+        while True:
+            top = stack[-1]
+            while top.tag == _INDIRECTION:
+                top = top.left
+            stack[-1] = top
+
+            if top.tag == _APPLICATION:
+                stack.append(top.left)
+                continue
+
+            arity: int = ARITY.get(top.left, 0) if top.tag == _COMBINATOR else 0
+            if top.tag == _FREE or len(stack) - 1 < arity:
+                return top, [application.right for application in reversed(stack[:-1])]
+
+            self.reductions += 1
+            root: GraphNode = stack[-1 - arity]
+            x = stack[-2].right
+            name: str = top.left
+            if name == "I" or name == "K":
+                root.tag, root.left, root.right = _INDIRECTION, x, None
+            else:
+                y = stack[-3].right
+                z = stack[-4].right
+                if name == "S":
+                    root.left, root.right = GraphNode(_APPLICATION, x, z), GraphNode(_APPLICATION, y, z)
+                elif name == "B":
+                    root.left, root.right = x, GraphNode(_APPLICATION, y, z)
+                else:
+                    root.left, root.right = GraphNode(_APPLICATION, x, z), y
+            del stack[-arity:]
+
+    def read_back(self, node: GraphNode, scope: Set[str]) -> Expression:
+        head, arguments = self.whnf(node)
+
+        if head.tag == _FREE:
+            result: Expression = VariableNode(head.left)
+            for argument in arguments:
+                result = LambdaApplicationNode(result, self.read_back(argument, scope))
+            return result
+
+        # A combinator waiting for more arguments is a function
+        name: str = self.alpha_conversion.generate_new_variable("x", self.free_names | scope)
+        applied = GraphNode(_APPLICATION, node, GraphNode(_FREE, name))
+        return LambdaAbstractionNode(name, self.read_back(applied, scope | {name}))
@@ -0,0 +1,196 @@
+from abc import ABC
+from dataclasses import dataclass, field
+from typing import List, Set
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+
+class DeBruijnTerm(ABC):
+    # Every term records how many enclosing binders it needs before all of its
+    # indices are bound ("closing depth"). A term whose closing depth is <= d
+    # has no index that reaches past d binders, so shifting or instantiating it
+    # at depth d can return it unchanged.
+    closing_depth: int
+
+
+@dataclass
+class DeBruijnIndex(DeBruijnTerm):
+    index: int
+    closing_depth: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.closing_depth = self.index + 1
+
+    def __str__(self):
+        return f"{self.index}"
+
+
+@dataclass
+class DeBruijnFreeVariable(DeBruijnTerm):
+    name: str
+    closing_depth: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.closing_depth = 0
+
+    def __str__(self):
+        return f"{self.name}"
+
+
+@dataclass
+class DeBruijnAbstraction(DeBruijnTerm):
+    body: DeBruijnTerm
+    hint: str = field(default="x", compare=False) # original parameter name, only used when converting back
+    closing_depth: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.closing_depth = max(self.body.closing_depth - 1, 0)
+
+    def __str__(self):
+        return f"fn.{self.body}"
+
+
+@dataclass
+class DeBruijnApplication(DeBruijnTerm):
+    left: DeBruijnTerm
+    right: DeBruijnTerm
+    closing_depth: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.closing_depth = max(self.left.closing_depth, self.right.closing_depth)
+
+    def __str__(self):
+        return f"({self.left} {self.right})"
+
+
+class DeBruijnConverter:
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+
+    def to_de_bruijn(self, ast: Expression) -> DeBruijnTerm:
+
+        def convert(ast: Expression, context: List[str]) -> DeBruijnTerm:
+            match ast:
+                case VariableNode(value):
+                    # Search from the innermost binder outwards
+                    for index in range(len(context) - 1, -1, -1):
+                        if context[index] == value:
+                            return DeBruijnIndex(len(context) - 1 - index)
+                    return DeBruijnFreeVariable(value)
+                case LambdaAbstractionNode(param, body):
+                    context.append(param)
+                    converted_body = convert(body, context)
+                    context.pop()
+                    return DeBruijnAbstraction(converted_body, param)
+                case LambdaApplicationNode(left, right):
+                    return DeBruijnApplication(convert(left, context), convert(right, context))
+                case _:
+                    raise SyntaxError(f"Unknown node type: {ast}")
+        return convert(ast, [])
+
+    def to_named(self, term: DeBruijnTerm) -> Expression:
+        free_names: Set[str] = self.get_free_names(term)
+
+        def convert(term: DeBruijnTerm, context: List[str]) -> Expression:
+            match term:
+                case DeBruijnIndex(index):
+                    return VariableNode(context[len(context) - 1 - index])
+                case DeBruijnFreeVariable(name):
+                    return VariableNode(name)
+                case DeBruijnAbstraction(body, hint):
+                    # The name must not capture a free variable or shadow an enclosing binder
+                    param: str = self.alpha_conversion.generate_new_variable(hint, free_names | set(context))
+                    context.append(param)
+                    converted_body = convert(body, context)
+                    context.pop()
+                    return LambdaAbstractionNode(param, converted_body)
+                case DeBruijnApplication(left, right):
+                    return LambdaApplicationNode(convert(left, context), convert(right, context))
+                case _:
+                    raise SyntaxError(f"Unknown term type: {term}")
+        return convert(term, [])
+
+    def get_free_names(self, term: DeBruijnTerm) -> Set[str]:
+        match term:
+            case DeBruijnIndex(_):
+                return set()
+            case DeBruijnFreeVariable(name):
+                return {name}
+            case DeBruijnAbstraction(body, _):
+                return self.get_free_names(body)
+            case DeBruijnApplication(left, right):
+                return self.get_free_names(left) | self.get_free_names(right)
+            case _:
+                raise SyntaxError(f"Unknown term type: {term}")
+
+
+class DeBruijnEvaluator:
+    def __init__(self):
+        self.converter = DeBruijnConverter()
+
+    def evaluate(self, ast: Expression) -> Expression:
+        # Convenience entry point: named AST in, named normal form out
+        return self.converter.to_named(self.beta_reduce(self.converter.to_de_bruijn(ast)))
+
+    def beta_reduce(self, term: DeBruijnTerm) -> DeBruijnTerm:
+        # Same strategy as Evaluator.beta_reduce: reduce the head first and only
+        # reduce the argument when the head does not become an abstraction.
+        # Contractions loop instead of recursing so long reduction chains stay flat.
+        while True:
+            match term:
+                case DeBruijnIndex(_) | DeBruijnFreeVariable(_):
+                    return term
+                case DeBruijnAbstraction(body, hint):
+                    reduced_body = self.beta_reduce(body)
+                    if reduced_body is body:
+                        return term
+                    return DeBruijnAbstraction(reduced_body, hint)
+                case DeBruijnApplication(left, right):
+                    new_left = self.beta_reduce(left)
+
+                    if isinstance(new_left, DeBruijnAbstraction):
+                        term = self.instantiate(new_left.body, right)
+                        continue
+
+                    new_right = self.beta_reduce(right)
+                    if new_left is left and new_right is right:
+                        return term
+                    return DeBruijnApplication(new_left, new_right)
+                case _:
+                    raise SyntaxError(f"Unknown term type: {term}")
+
+    def instantiate(self, body: DeBruijnTerm, argument: DeBruijnTerm, depth: int = 0) -> DeBruijnTerm:
+        # Replace index `depth` in body with argument and drop the binder,
+        # i.e. the body of (fn. body) argument after contraction
+        if body.closing_depth <= depth:
+            return body
+
+        match body:
+            case DeBruijnIndex(index):
+                if index == depth:
+                    return self.shift(argument, depth)
+                return DeBruijnIndex(index - 1)
+            case DeBruijnAbstraction(inner_body, hint):
+                return DeBruijnAbstraction(self.instantiate(inner_body, argument, depth + 1), hint)
+            case DeBruijnApplication(left, right):
+                return DeBruijnApplication(
+                    self.instantiate(left, argument, depth),
+                    self.instantiate(right, argument, depth)
+                )
+            case _:
+                raise SyntaxError(f"Unknown term type: {body}")
+
+    def shift(self, term: DeBruijnTerm, amount: int, cutoff: int = 0) -> DeBruijnTerm:
+        # Add amount to every index that points past `cutoff` binders
+        if amount == 0 or term.closing_depth <= cutoff:
+            return term
+
+        match term:
+            case DeBruijnIndex(index):
+                return DeBruijnIndex(index + amount)
+            case DeBruijnAbstraction(body, hint):
+                return DeBruijnAbstraction(self.shift(body, amount, cutoff + 1), hint)
+            case DeBruijnApplication(left, right):
+                return DeBruijnApplication(self.shift(left, amount, cutoff), self.shift(right, amount, cutoff))
+            case _:
+                raise SyntaxError(f"Unknown term type: {term}")
@@ -0,0 +1,90 @@
+import re
+from typing import Callable, Dict, List, Optional, Set
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+_DEFINITION_NAME = re.compile(r"[A-Z][A-Z0-9_]+")
+
+
+def is_definition_name(name: str) -> bool:
+    # Same shape as a NAME token, so it can never be bound by a lambda
+    return _DEFINITION_NAME.fullmatch(name) is not None
+
+
+class Environment:
+    """
+    Top-level definitions of a session, each stored as its normal form.
+
+    A definition is parsed and reduced once, when it is defined; Evaluator
+    then replaces a reference by the stored normal form only when reduction
+    reaches it. Definition names can't be bound (the parser rejects them as
+    parameters and fresh names never take their shape), so a reference is
+    always free and inserting the (closed) normal form can't capture anything.
+
+    Imported modules are only loaded, through loader, when a name that isn't
+    defined yet is looked up, and their definitions are reduced by evaluators
+    from make_evaluator so they get the same strategy and limits as the
+    session. Definitions made here take precedence over imported ones.
+    """
+    def __init__(self, loader=None, make_evaluator: Optional[Callable] = None):
+        self.definitions: Dict[str, Expression] = {}
+        self.loader = loader # ModuleLoader used for imports
+        self.make_evaluator: Optional[Callable] = make_evaluator # Environment -> Evaluator for imported definitions
+        self.imports: List[str] = [] # paths of modules imported but not loaded yet
+        self.loaded: Set[str] = set() # paths of modules merged in already
+
+    def define(self, name: str, normal_form: Expression) -> None:
+        if not is_definition_name(name):
+            raise ValueError(f"Invalid definition name: {name}")
+        open_variables: Set[str] = {variable for variable in normal_form.free_vars if not is_definition_name(variable)}
+        if open_variables:
+            raise ValueError(f"Definition {name} must be closed, it has free variables {sorted(open_variables)}")
+        self.definitions[name] = normal_form
+
+    def add_import(self, path: str) -> None:
+        if self.loader is None:
+            raise ImportError("Imports are not supported in this environment")
+        self.imports.append(path)
+
+    def load_imports(self) -> None:
+        # Modules imported by an imported module are merged in too, after it,
+        # whatever order its forms came in
+        while self.imports:
+            path: str = self.imports.pop(0)
+            if path in self.loaded:
+                continue
+            self.loaded.add(path)
+            module = self.loader.load(path, self.make_evaluator)
+            for name, normal_form in module.definitions.items():
+                self.definitions.setdefault(name, normal_form)
+            self.imports.extend(module.imports)
+
+    def get(self, name: str) -> Optional[Expression]:
+        definition = self.definitions.get(name)
+        if definition is None and self.imports and is_definition_name(name):
+            self.load_imports()
+            definition = self.definitions.get(name)
+        return definition
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self):
+        return len(self.definitions)
+
+    def expand_all(self, ast: Expression, expanding: frozenset = frozenset()) -> Expression:
+        # Eagerly replaces every reference, for engines that don't know about
+        # the environment. A recursive reference is left as it is.
+        if self.imports and not self.definitions.keys() >= {name for name in ast.free_vars if is_definition_name(name)}:
+            self.load_imports()
+        if self.definitions.keys().isdisjoint(ast.free_vars - expanding):
+            return ast
+
+        match ast:
+            case VariableNode(value):
+                return self.expand_all(self.definitions[value], expanding | {value})
+            case LambdaAbstractionNode(param, body):
+                return LambdaAbstractionNode(param, self.expand_all(body, expanding))
+            case LambdaApplicationNode(left, right):
+                return LambdaApplicationNode(self.expand_all(left, expanding), self.expand_all(right, expanding))
+            case _:
+                raise SyntaxError(f"Unknown node type: {ast}")
@@ -0,0 +1,115 @@
+from typing import List, Set, Union
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+
+class Substitution:
+    # body with param replaced by argument, not carried out yet
+    __slots__ = ("body", "param", "argument", "free_vars")
+
+    def __init__(self, body: "Term", param: str, argument: "Term"):
+        self.body = body
+        self.param = param
+        self.argument = argument
+        self.free_vars: frozenset = (body.free_vars - {param}) | argument.free_vars if param in body.free_vars else body.free_vars
+
+
+class Abstraction:
+    # An abstraction whose body may hold pending substitutions
+    __slots__ = ("param", "body", "free_vars")
+
+    def __init__(self, param: str, body: "Term"):
+        self.param = param
+        self.body = body
+        self.free_vars: frozenset = body.free_vars - {param}
+
+
+class Application:
+    # An application whose sides may hold pending substitutions
+    __slots__ = ("left", "right", "free_vars")
+
+    def __init__(self, left: "Term", right: "Term"):
+        self.left = left
+        self.right = right
+        self.free_vars: frozenset = left.free_vars | right.free_vars
+
+
+# Plain Expressions are terms without pending substitutions
+Term = Union[Expression, Substitution, Abstraction, Application]
+
+
+class ExplicitSubstitutionEvaluator:
+    """
+    Normal-order reduction in a calculus of explicit substitutions (lambda-x).
+
+    A contraction only wraps the body in a Substitution node. Substitutions
+    are pushed one level down when the head of the term needs to be inspected,
+    and dropped as soon as the variable does not occur in what they wrap, so
+    parts of a body that end up discarded (like the unused branch of a Church
+    boolean) are never walked. Renaming a binder to avoid capture is itself a
+    pending substitution of a fresh variable.
+    """
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+        self.beta_steps: int = 0
+        self.substitutions_pushed: int = 0
+        self.substitutions_dropped: int = 0
+
+    def evaluate(self, ast: Expression) -> Expression:
+        return self.normalize(ast)
+
+    def normalize(self, term: Term) -> Expression:
+        head, arguments = self.whnf(term)
+        if arguments or not isinstance(head, (LambdaAbstractionNode, Abstraction)):
+            result: Expression = head
+            for argument in arguments:
+                result = LambdaApplicationNode(result, self.normalize(argument))
+            return result
+        return LambdaAbstractionNode(head.param, self.normalize(head.body))
+
+    def whnf(self, term: Term):
+        # Returns the head (a variable, or an abstraction when no arguments are
+        # left) and its arguments in application order
+        arguments: List[Term] = []
+
+        while True:
+            if isinstance(term, Substitution):
+                term = self.push(term)
+            elif isinstance(term, (LambdaApplicationNode, Application)):
+                arguments.append(term.right)
+                term = term.left
+            elif isinstance(term, (LambdaAbstractionNode, Abstraction)) and arguments:
+                self.beta_steps += 1
+                term = Substitution(term.body, term.param, arguments.pop())
+            elif isinstance(term, (VariableNode, LambdaAbstractionNode, Abstraction)):
+                return term, arguments[::-1]
+            else:
+                raise SyntaxError(f"Unknown node type: {term}")
+
+    def push(self, substitution: Substitution) -> Term:
+        # Moves a substitution one level into its body
+        body: Term = substitution.body
+        param: str = substitution.param
+        argument: Term = substitution.argument
+
+        if param not in body.free_vars:
+            self.substitutions_dropped += 1
+            return body
+
+        self.substitutions_pushed += 1
+        if isinstance(body, Substitution):
+            return Substitution(self.push(body), param, argument)
+        if isinstance(body, VariableNode):
+            return argument # body.free_vars contains param, so body is param
+        if isinstance(body, (LambdaApplicationNode, Application)):
+            return Application(Substitution(body.left, param, argument), Substitution(body.right, param, argument))
+        if isinstance(body, (LambdaAbstractionNode, Abstraction)):
+            inner_param: str = body.param
+            inner_body: Term = body.body
+            if inner_param in argument.free_vars:
+                forbidden: Set[str] = set(argument.free_vars) | inner_body.free_vars | {param}
+                fresh: str = self.alpha_conversion.generate_new_variable(inner_param, forbidden)
+                inner_body = Substitution(inner_body, inner_param, VariableNode(fresh))
+                inner_param = fresh
+            return Abstraction(inner_param, Substitution(inner_body, param, argument))
+        raise SyntaxError(f"Unknown node type: {body}")
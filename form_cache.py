@@ -0,0 +1,283 @@
+import os
+import sys
+import mmap
+import hashlib
+from typing import Dict, Iterator, List, Tuple, Union
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode, Definition, Import
+from lexer import Lexer
+from parser import Parser
+from token_stream import TokenStream, map_file
+
+Form = Union[Expression, Definition, Import]
+
+CACHE_DIRECTORY: str = "__pycache__"
+SUFFIX: str = ".lbdc"
+_MAGIC: bytes = b"LBDC"
+VERSION: int = 3 # bumped whenever the same source would parse differently
+_HEADER_SIZE: int = len(_MAGIC) + 1 + hashlib.sha256().digest_size # magic, version, sha256 of the source
+
+# Node tags
+VARIABLE = 0 # name id
+ABSTRACTION = 1 # param name id, body
+APPLICATION = 2 # left, right
+
+# Form kinds, each followed by its first line
+EXPRESSION = 0 # root node
+DEFINITION = 1 # name id, root node
+IMPORT = 2 # path name id
+
+
+def parse_form(source: str, line: int = 1) -> Form:
+    parser = Parser(list(Lexer(source, line).scan()))
+    parser.parse()
+    return parser.get_ast()[0]
+
+
+def cache_path(source_path: str) -> str:
+    directory, name = os.path.split(os.path.abspath(source_path))
+    return os.path.join(directory, CACHE_DIRECTORY, os.path.splitext(name)[0] + SUFFIX)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class FormWriter:
+    """
+    Serializes parsed forms to the .lbdc format.
+
+    After the header comes the number of forms, then one self-contained
+    record per form: its kind and first line, its own name table (variable
+    names, definition names and import paths), its node table and the ids
+    the form points to. Every number is an unsigned LEB128 varint. A node is
+    written after its children and refers to them by how far back they are,
+    so subterms shared within a form are stored once and most references fit
+    in one byte.
+
+    Records share nothing, so neither writing nor reading a file holds more
+    than one form's nodes at a time.
+    """
+    def __init__(self):
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+        self.nodes = bytearray()
+        self.node_count: int = 0 # nodes written for the current form
+        self.handles: Dict[int, int] = {} # id of a node of the current form -> its index in the node table
+        self.forms = bytearray()
+        self.form_count: int = 0
+
+    def intern(self, name: str) -> int:
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def add_node(self, ast: Expression) -> int:
+        stack: List[Expression] = [ast]
+        while stack:
+            node = stack[-1]
+            if id(node) in self.handles:
+                stack.pop()
+                continue
+            match node:
+                case VariableNode(value):
+                    self.emit(node, VARIABLE, self.intern(value))
+                    stack.pop()
+                case LambdaAbstractionNode(param, body):
+                    if id(body) in self.handles:
+                        self.emit(node, ABSTRACTION, self.intern(param), self.distance(body))
+                        stack.pop()
+                    else:
+                        stack.append(body)
+                case LambdaApplicationNode(left, right):
+                    if id(left) in self.handles and id(right) in self.handles:
+                        self.emit(node, APPLICATION, self.distance(left), self.distance(right))
+                        stack.pop()
+                    else:
+                        stack.append(left)
+                        stack.append(right)
+                case _:
+                    raise SyntaxError(f"Unknown node type: {node}")
+        return self.handles[id(ast)]
+
+    def distance(self, child: Expression) -> int:
+        return self.node_count - self.handles[id(child)]
+
+    def emit(self, node: Expression, tag: int, *operands: int) -> None:
+        self.nodes.append(tag)
+        for operand in operands:
+            _write_varint(self.nodes, operand)
+        self.handles[id(node)] = self.node_count
+        self.node_count += 1
+
+    def add_form(self, line: int, form: Form) -> None:
+        # Ids are only valid while form is alive, so the tables are reset for every form
+        self.names, self.name_ids, self.nodes, self.node_count, self.handles = [], {}, bytearray(), 0, {}
+        match form:
+            case Definition(name, expression):
+                operands = (DEFINITION, line, self.intern(name), self.add_node(expression))
+            case Import(path):
+                operands = (IMPORT, line, self.intern(path))
+            case _:
+                operands = (EXPRESSION, line, self.add_node(form))
+
+        _write_varint(self.forms, operands[0])
+        _write_varint(self.forms, operands[1])
+        _write_varint(self.forms, len(self.names))
+        for name in self.names:
+            encoded: bytes = name.encode("utf-8")
+            _write_varint(self.forms, len(encoded))
+            self.forms += encoded
+        _write_varint(self.forms, self.node_count)
+        self.forms += self.nodes
+        for operand in operands[2:]:
+            _write_varint(self.forms, operand)
+        self.form_count += 1
+
+    def to_bytes(self, digest: bytes) -> bytes:
+        out = bytearray(_MAGIC)
+        out.append(VERSION)
+        out += digest
+        _write_varint(out, self.form_count)
+        out += self.forms
+        return bytes(out)
+
+
+class FormReader:
+    # Reads back what FormWriter wrote, from any buffer (bytes or an mmap)
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.position: int = _HEADER_SIZE
+
+    def varint(self) -> int:
+        buffer = self.buffer
+        position = self.position
+        value = shift = 0
+        while True:
+            byte = buffer[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.position = position
+                return value
+            shift += 7
+
+    def read(self) -> Iterator[Tuple[int, Form]]:
+        # Decodes one record at a time, as the forms are consumed
+        for _ in range(self.varint()):
+            kind, line = self.varint(), self.varint()
+            names: List[str] = []
+            for _ in range(self.varint()):
+                length = self.varint()
+                names.append(bytes(self.buffer[self.position:self.position + length]).decode("utf-8"))
+                self.position += length
+
+            nodes: List[Expression] = []
+            for index in range(self.varint()):
+                tag = self.buffer[self.position]
+                self.position += 1
+                if tag == VARIABLE:
+                    nodes.append(VariableNode(names[self.varint()]))
+                elif tag == ABSTRACTION:
+                    param = names[self.varint()]
+                    nodes.append(LambdaAbstractionNode(param, nodes[index - self.varint()]))
+                elif tag == APPLICATION:
+                    left = nodes[index - self.varint()]
+                    nodes.append(LambdaApplicationNode(left, nodes[index - self.varint()]))
+                else:
+                    raise ValueError(f"Unknown node tag in form cache: {tag}")
+
+            if kind == DEFINITION:
+                name = names[self.varint()]
+                yield line, Definition(name, nodes[self.varint()])
+            elif kind == IMPORT:
+                yield line, Import(names[self.varint()])
+            else:
+                yield line, nodes[self.varint()]
+
+
+def open_cache(path: str, digest: bytes):
+    # A memory map of path if it holds a cache of a source with this digest
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if buffer[:_HEADER_SIZE] != _MAGIC + bytes([VERSION]) + digest:
+        buffer.close()
+        return None
+    return buffer
+
+
+def write_cache(path: str, data: bytes) -> None:
+    # Written next to the source and renamed into place, so a reader never sees
+    # half a file; a read-only directory just means no cache
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary: str = f"{path}.{os.getpid()}"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def cached_forms(source_path: str) -> Iterator[Tuple[int, Union[Form, SyntaxError]]]:
+    """
+    Yields (first line, parsed form) for each top-level form of a file. A
+    form that doesn't parse is yielded as its SyntaxError, so the forms after
+    it can still be used; a file with such a form is never cached.
+
+    When __pycache__/<name>.lbdc holds the forms of a source with the same
+    sha256, they are decoded from there one at a time instead of lexing and
+    parsing again. Otherwise forms are parsed one at a time as they are
+    consumed, and the cache is written once the whole file has been parsed.
+    As with Python, setting sys.dont_write_bytecode (python -B) stops caches
+    being written.
+    """
+    with open(source_path, "rb") as f:
+        source = map_file(f)
+        try:
+            digest: bytes = hashlib.sha256(source).digest()
+            path: str = cache_path(source_path)
+
+            done: int = 0 # forms already yielded from the cache
+            cache = open_cache(path, digest)
+            if cache is not None:
+                try:
+                    for line, form in FormReader(cache).read():
+                        yield line, form
+                        done += 1
+                    return
+                except (ValueError, IndexError):
+                    pass # a damaged cache, the remaining forms are parsed from the source
+                finally:
+                    cache.close()
+
+            # The source is tokenized straight from the memory map, never
+            # copied into one string
+            writer = FormWriter()
+            failed: bool = False
+            for line, tokens in TokenStream(source).forms():
+                parser = Parser(tokens)
+                try:
+                    parser.parse()
+                except SyntaxError as error:
+                    failed = True
+                    yield line, error
+                    continue
+                form = parser.get_ast()[0]
+                writer.add_form(line, form)
+                if done:
+                    done -= 1
+                    continue
+                yield line, form
+        finally:
+            if isinstance(source, mmap.mmap):
+                source.close()
+    if not sys.dont_write_bytecode and not failed:
+        write_cache(path, writer.to_bytes(digest))
@@ -0,0 +1,237 @@
+from typing import Dict, List, Set, Tuple
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+# Instruction set. Instructions are (opcode, operand) tuples.
+PUSH = 0 # push the stack entry operand places below the top
+PUSHGLOBAL = 1 # push the node of the supercombinator named operand
+PUSHATOM = 2 # push the node of the free variable named operand
+MKAP = 3 # pop function and argument, push their application
+UPDATE = 4 # pop the result and overwrite the redex root operand + 1 places below with an indirection to it
+POP = 5 # drop operand entries
+UNWIND = 6 # continue evaluating from the node on top of the stack
+
+OPCODES: Tuple[str, ...] = ("PUSH", "PUSHGLOBAL", "PUSHATOM", "MKAP", "UPDATE", "POP", "UNWIND")
+
+MAIN: str = "$main"
+
+
+class Supercombinator:
+    """
+    A closed function of params with a lambda-free body. Supercombinator names
+    start with "$", which the lexer never produces, so they cannot clash with
+    variables of the program.
+    """
+    def __init__(self, name: str, params: List[str], body: Expression):
+        self.name: str = name
+        self.params: List[str] = params
+        self.body: Expression = body
+        self.code: List[Tuple[int, object]] = []
+
+    @property
+    def arity(self) -> int:
+        return len(self.params)
+
+    def __repr__(self):
+        return f"Supercombinator({self.name}, {self.params}, {self.body})"
+
+
+class LambdaLifter:
+    """
+    Turns every maximal chain of abstractions fn p1. ... fn pn. body into a
+    supercombinator whose params are the chain's free variables bound further
+    out, followed by p1 ... pn. The chain itself is replaced by the
+    supercombinator applied to those free variables. Variables free in the
+    whole program stay as they are.
+    """
+    def __init__(self):
+        self.supercombinators: Dict[str, Supercombinator] = {}
+
+    def lift_program(self, ast: Expression) -> Dict[str, Supercombinator]:
+        self.supercombinators = {}
+        self.supercombinators[MAIN] = Supercombinator(MAIN, [], self.lift(ast, set()))
+        return self.supercombinators
+
+    def lift(self, ast: Expression, scope: Set[str]) -> Expression:
+        match ast:
+            case VariableNode(_):
+                return ast
+            case LambdaAbstractionNode(_, _):
+                params: List[str] = []
+                body: Expression = ast
+                while isinstance(body, LambdaAbstractionNode):
+                    params.append(body.param)
+                    body = body.body
+
+                captured: List[str] = sorted(ast.free_vars & scope)
+                name: str = f"${len(self.supercombinators)}"
+                supercombinator = Supercombinator(name, captured + params, body)
+                self.supercombinators[name] = supercombinator
+                supercombinator.body = self.lift(body, set(supercombinator.params))
+
+                result: Expression = VariableNode(name)
+                for variable in captured:
+                    result = LambdaApplicationNode(result, VariableNode(variable))
+                return result
+            case LambdaApplicationNode(left, right):
+                return LambdaApplicationNode(self.lift(left, scope), self.lift(right, scope))
+            case _:
+                raise SyntaxError(f"Unknown node type: {ast}")
+
+
+class GCompiler:
+    """
+    Compiles a supercombinator body into code that builds the body's graph on
+    top of the arguments, overwrites the redex root with it and unwinds.
+    """
+    def compile(self, supercombinator: Supercombinator) -> List[Tuple[int, object]]:
+        # A later param of the same name shadows an earlier one
+        offsets: Dict[str, int] = {param: index for index, param in enumerate(supercombinator.params)}
+        code: List[Tuple[int, object]] = []
+        self.compile_body(supercombinator.body, offsets, code)
+        code.append((UPDATE, supercombinator.arity))
+        code.append((POP, supercombinator.arity))
+        code.append((UNWIND, None))
+        supercombinator.code = code
+        return code
+
+    def compile_body(self, ast: Expression, offsets: Dict[str, int], code: List[Tuple[int, object]]) -> None:
+        # Pushes the graph of ast; offsets gives each param's distance from the top of the stack
+        match ast:
+            case VariableNode(value):
+                if value in offsets:
+                    code.append((PUSH, offsets[value]))
+                elif value.startswith("$"):
+                    code.append((PUSHGLOBAL, value))
+                else:
+                    code.append((PUSHATOM, value))
+            case LambdaApplicationNode(left, right):
+                self.compile_body(right, offsets, code)
+                self.compile_body(left, {param: offset + 1 for param, offset in offsets.items()}, code)
+                code.append((MKAP, None))
+            case _:
+                raise SyntaxError(f"Unknown node type: {ast}")
+
+
+# Heap node tags
+_APPLICATION = 0 # left: function node, right: argument node
+_GLOBAL = 1 # left: Supercombinator
+_ATOM = 2 # left: free variable name
+_INDIRECTION = 3 # left: node this one was reduced to
+
+
+class HeapNode:
+    __slots__ = ("tag", "left", "right")
+
+    def __init__(self, tag: int, left, right=None):
+        self.tag = tag
+        self.left = left
+        self.right = right
+
+
+class GMachine:
+    """
+    Lazy graph reduction of lambda-lifted programs.
+
+    evaluate() lifts the term, compiles every supercombinator and unwinds the
+    graph of the program; each redex root is overwritten with its result, so
+    shared work is done once. The normal form is read back like NbeEvaluator
+    does: a partially applied supercombinator is applied to a fresh atom.
+    executed counts the instructions run per opcode.
+    """
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+        self.lifter = LambdaLifter()
+        self.compiler = GCompiler()
+        self.globals: Dict[str, HeapNode] = {}
+        self.atoms: Dict[str, HeapNode] = {}
+        self.free_names: Set[str] = set()
+        self.executed: List[int] = [0] * len(OPCODES)
+        self.unwinds: int = 0
+
+    def beta_reduce(self, ast: Expression) -> Expression:
+        return self.evaluate(ast)
+
+    def evaluate(self, ast: Expression) -> Expression:
+        self.load(ast)
+        return self.read_back(self.globals[MAIN], set())
+
+    def load(self, ast: Expression) -> None:
+        self.free_names = set(ast.free_vars)
+        self.atoms = {}
+        self.globals = {}
+        for name, supercombinator in self.lifter.lift_program(ast).items():
+            self.compiler.compile(supercombinator)
+            self.globals[name] = HeapNode(_GLOBAL, supercombinator)
+
+    def atom(self, name: str) -> HeapNode:
+        node = self.atoms.get(name)
+        if node is None:
+            node = self.atoms[name] = HeapNode(_ATOM, name)
+        return node
+
+    def whnf(self, node: HeapNode) -> Tuple[HeapNode, List[HeapNode]]:
+        # Unwinds until the head is an atom or a supercombinator short of
+        # arguments. Returns the head and its arguments, outermost last.
+        stack: List[HeapNode] = [node]
+        executed: List[int] = self.executed
+
+        while True:
+            top = stack[-1]
+            while top.tag == _INDIRECTION:
+                top = top.left
+            stack[-1] = top
+
+            if top.tag == _APPLICATION:
+                stack.append(top.left)
+                continue
+
+            self.unwinds += 1
+            if top.tag == _ATOM or len(stack) - 1 < top.left.arity:
+                return top, [application.right for application in reversed(stack[:-1])]
+
+            # Replace the global and the application nodes above the redex root
+            # by their arguments, keeping the root itself below them
+            supercombinator: Supercombinator = top.left
+            arity: int = supercombinator.arity
+            if arity:
+                base: int = len(stack) - 1 - arity
+                stack[base + 1:] = [application.right for application in stack[base:-1]]
+
+            for opcode, operand in supercombinator.code:
+                executed[opcode] += 1
+                if opcode == PUSH:
+                    stack.append(stack[-1 - operand])
+                elif opcode == MKAP:
+                    function = stack.pop()
+                    stack[-1] = HeapNode(_APPLICATION, function, stack[-1])
+                elif opcode == PUSHGLOBAL:
+                    stack.append(self.globals[operand])
+                elif opcode == PUSHATOM:
+                    stack.append(self.atom(operand))
+                elif opcode == UPDATE:
+                    result = stack.pop()
+                    root = stack[-1 - operand]
+                    root.tag, root.left, root.right = _INDIRECTION, result, None
+                elif opcode == POP:
+                    if operand:
+                        del stack[-operand:]
+                # UNWIND: the loop continues from the (updated) root
+
+    def read_back(self, node: HeapNode, scope: Set[str]) -> Expression:
+        head, arguments = self.whnf(node)
+
+        if head.tag == _ATOM:
+            result: Expression = VariableNode(head.left)
+            for argument in arguments:
+                result = LambdaApplicationNode(result, self.read_back(argument, scope))
+            return result
+
+        # A partial application is a function of the next param
+        hint: str = head.left.params[len(arguments)]
+        name: str = self.alpha_conversion.generate_new_variable(hint, self.free_names | scope)
+        applied = HeapNode(_APPLICATION, node, HeapNode(_ATOM, name))
+        return LambdaAbstractionNode(name, self.read_back(applied, scope | {name}))
+
+    def profile(self) -> Dict[str, int]:
+        return dict(zip(OPCODES, self.executed))
@@ -0,0 +1,290 @@
+from typing import Dict, List, Optional, Set, Tuple
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+from reduction_metrics import BudgetExceeded, ReductionMetrics
+
+# Agent kinds
+ROOT = 0 # port 0: the term; also stands in for a bound variable until its binder is encoded
+LAMBDA = 1 # port 0: principal, 1: body, 2: variable
+APPLICATION = 2 # port 0: function (principal), 1: result, 2: argument
+DUPLICATOR = 3 # port 0: principal, 1 and 2: the two copies
+ERASER = 4 # port 0 only
+ATOM = 5 # port 0 only: a free variable of the term
+
+
+class UnsupportedTerm(ValueError):
+    # The term is outside the fragment the net reduces correctly
+    pass
+
+
+class Agent:
+    __slots__ = ("kind", "label", "ports")
+
+    def __init__(self, kind: int, label=None):
+        self.kind: int = kind
+        self.label = label # duplicator label, lambda name hint or atom name
+        self.ports: List[Optional[Tuple["Agent", int]]] = [None, None, None] if kind in (LAMBDA, APPLICATION, DUPLICATOR) else [None]
+
+
+class InteractionNet:
+    """
+    Reduces terms as interaction nets with the abstract algorithm (Lamping's
+    algorithm without the bracket and croissant bookkeeping).
+
+    Every variable used more than once gets a tree of duplicators with labels
+    of their own; a duplicator meeting another one annihilates with it when
+    the labels match and commutes through it otherwise. Sharing is never
+    undone, so a reducible argument used several times is reduced once, not
+    once per copy as with copying substitution.
+
+    Without the bookkeeping oracle a duplicator can't tell copies of another
+    duplicator from unrelated ones, so sharing may only be one level deep.
+    evaluate() first checks, with a control flow analysis, that no variable
+    used more than once can be bound to an abstraction that itself shares a
+    variable (directly or through its free variables), and raises
+    UnsupportedTerm otherwise. Accepted are, for instance, Church numeral
+    addition and multiplication and shared reducible arguments such as
+    (fn f. f (f y)) ((fn a. fn b. b) c); rejected are self-application of
+    numerals like (fn x. x x) 2 and Church exponentiation like 2 2.
+    The net is reduced completely before reading back, so a divergent
+    subterm diverges even if it would be discarded; max_interactions bounds
+    the work.
+    """
+    def __init__(self, max_interactions: Optional[int] = None):
+        self.alpha_conversion = AlphaConversion()
+        self.max_interactions: Optional[int] = max_interactions
+        self.interactions: int = 0
+        self.beta_steps: int = 0
+        self.labels: int = 0
+        self.active_pairs: List[Tuple[Agent, Agent]] = []
+        self.free_names: Set[str] = set()
+
+    def evaluate(self, ast: Expression) -> Expression:
+        self.check_supported(ast)
+        self.free_names = set(ast.free_vars)
+        root: Agent = self.encode(ast)
+        self.reduce(ast)
+        return self.read_back(root.ports[0], [], {}, set())
+
+    def check_supported(self, ast: Expression) -> None:
+        # Numbers every node occurrence in pre-order, so the subterm of node n
+        # is n up to ends[n]; each variable occurrence points at its binder
+        kinds: List[type] = []
+        labels: List[str] = []
+        binders: List[int] = []
+        ends: List[int] = []
+        stack: List = [(ast, {})]
+        while stack:
+            item = stack.pop()
+            if type(item) is int:
+                ends[item] = len(kinds)
+                continue
+            node, scope = item
+            index: int = len(kinds)
+            kinds.append(type(node))
+            binders.append(-1)
+            ends.append(index + 1)
+            stack.append(index)
+            match node:
+                case VariableNode(value):
+                    labels.append(value)
+                    binders[index] = scope.get(value, -1)
+                case LambdaAbstractionNode(param, body):
+                    labels.append(param)
+                    stack.append((body, {**scope, param: index}))
+                case LambdaApplicationNode(left, right):
+                    labels.append("")
+                    stack.append((right, scope))
+                    stack.append((left, scope))
+                case _:
+                    raise SyntaxError(f"Unknown node type: {node}")
+
+        uses: Dict[int, int] = {}
+        for binder in binders:
+            if binder >= 0:
+                uses[binder] = uses.get(binder, 0) + 1
+
+        # 0-CFA: the abstractions each node may evaluate to and each binder may be bound to
+        flows: List[Set[int]] = [set() for _ in kinds]
+        bound: Dict[int, Set[int]] = {index: set() for index, kind in enumerate(kinds) if kind is LambdaAbstractionNode}
+        changed: bool = True
+        while changed:
+            changed = False
+            for index in range(len(kinds) - 1, -1, -1):
+                kind = kinds[index]
+                if kind is LambdaAbstractionNode:
+                    values: Set[int] = {index}
+                elif kind is VariableNode:
+                    values = bound[binders[index]] if binders[index] >= 0 else set()
+                else:
+                    left, right = index + 1, ends[index + 1]
+                    values = set()
+                    for abstraction in list(flows[left]):
+                        if not flows[right] <= bound[abstraction]:
+                            bound[abstraction] |= flows[right]
+                            changed = True
+                        values |= flows[abstraction + 1]
+                if not values <= flows[index]:
+                    flows[index] |= values
+                    changed = True
+
+        copyable: Dict[int, bool] = {}
+
+        def is_copyable(abstraction: int) -> bool:
+            # Duplicating it must not duplicate another duplicator; a cycle
+            # through free variables is conservatively not copyable
+            if abstraction in copyable:
+                return copyable[abstraction]
+            copyable[abstraction] = False
+            inside = range(abstraction, ends[abstraction])
+            for index in inside:
+                if kinds[index] is LambdaAbstractionNode and uses.get(index, 0) > 1:
+                    return False
+                if binders[index] >= 0 and binders[index] not in inside:
+                    if not all(is_copyable(value) for value in bound[binders[index]]):
+                        return False
+            copyable[abstraction] = True
+            return True
+
+        for binder, count in uses.items():
+            if count > 1 and not all(is_copyable(value) for value in bound[binder]):
+                raise UnsupportedTerm(
+                    f"The interaction net can't reduce this term: {labels[binder]} is used {count} times "
+                    "and may be bound to an abstraction that shares a variable itself"
+                )
+
+    def link(self, first: Tuple[Agent, int], second: Tuple[Agent, int]) -> None:
+        first[0].ports[first[1]] = second
+        second[0].ports[second[1]] = first
+        if first[1] == 0 and second[1] == 0 and self.interacts(first[0], second[0]):
+            self.active_pairs.append((first[0], second[0]))
+
+    def interacts(self, first: Agent, second: Agent) -> bool:
+        kinds = {first.kind, second.kind}
+        # An application whose function is a free variable is stuck
+        return ROOT not in kinds and kinds != {APPLICATION, ATOM}
+
+    def encode(self, ast: Expression) -> Agent:
+        self.active_pairs = []
+        root = Agent(ROOT)
+        self.link((root, 0), self.encode_term(ast, {}))
+        return root
+
+    def encode_term(self, ast: Expression, occurrences: Dict[str, List[Tuple[Agent, int]]]) -> Tuple[Agent, int]:
+        # Returns the port standing for ast. occurrences collects the variable
+        # ports of each bound name, which are connected once its binder is done.
+        match ast:
+            case VariableNode(value):
+                if value not in occurrences:
+                    return (Agent(ATOM, value), 0)
+                occurrence = Agent(ROOT)
+                occurrences[value].append((occurrence, 0))
+                return (occurrence, 0)
+            case LambdaAbstractionNode(param, body):
+                abstraction = Agent(LAMBDA, param)
+                outer = occurrences.get(param)
+                occurrences[param] = []
+                self.link((abstraction, 1), self.encode_term(body, occurrences))
+                self.share((abstraction, 2), [placeholder[0].ports[0] for placeholder in occurrences[param]])
+                if outer is None:
+                    del occurrences[param]
+                else:
+                    occurrences[param] = outer
+                return (abstraction, 0)
+            case LambdaApplicationNode(left, right):
+                application = Agent(APPLICATION)
+                self.link((application, 0), self.encode_term(left, occurrences))
+                self.link((application, 2), self.encode_term(right, occurrences))
+                return (application, 1)
+            case _:
+                raise SyntaxError(f"Unknown node type: {ast}")
+
+    def share(self, variable: Tuple[Agent, int], uses: List[Tuple[Agent, int]]) -> None:
+        # Connects a lambda's variable port to all of its uses
+        if not uses:
+            self.link(variable, (Agent(ERASER), 0))
+            return
+        while len(uses) > 1:
+            self.labels += 1
+            duplicator = Agent(DUPLICATOR, self.labels)
+            self.link(variable, (duplicator, 0))
+            self.link((duplicator, 1), uses[0])
+            variable, uses = (duplicator, 2), uses[1:]
+        self.link(variable, uses[0])
+
+    def reduce(self, ast: Expression) -> None:
+        while self.active_pairs:
+            first, second = self.active_pairs.pop()
+            self.interactions += 1
+            if self.max_interactions is not None and self.interactions > self.max_interactions:
+                raise BudgetExceeded("interaction", self.max_interactions, ast, ReductionMetrics(beta_steps=self.beta_steps))
+
+            if first.kind == ERASER or second.kind == ERASER:
+                self.erase(first, second)
+            elif first.kind == ATOM or second.kind == ATOM:
+                self.copy_atom(first, second)
+            elif first.kind == second.kind == DUPLICATOR and first.label != second.label:
+                self.commute(first, second)
+            elif first.kind == DUPLICATOR or second.kind == DUPLICATOR:
+                if first.kind == second.kind:
+                    self.annihilate(first, second)
+                else:
+                    self.commute(first, second)
+            else:
+                self.beta_steps += 1
+                self.annihilate(first, second)
+
+    def annihilate(self, first: Agent, second: Agent) -> None:
+        # Ports are re-read after each link since they may point into the pair itself
+        self.link(first.ports[1], second.ports[1])
+        self.link(first.ports[2], second.ports[2])
+
+    def commute(self, first: Agent, second: Agent) -> None:
+        # Each agent is copied onto the auxiliary ports of the other
+        first_copies = (Agent(first.kind, first.label), Agent(first.kind, first.label))
+        second_copies = (Agent(second.kind, second.label), Agent(second.kind, second.label))
+        self.link((second_copies[0], 0), first.ports[1])
+        self.link((second_copies[1], 0), first.ports[2])
+        self.link((first_copies[0], 0), second.ports[1])
+        self.link((first_copies[1], 0), second.ports[2])
+        for i in (0, 1):
+            for j in (0, 1):
+                self.link((first_copies[i], j + 1), (second_copies[j], i + 1))
+
+    def erase(self, first: Agent, second: Agent) -> None:
+        other: Agent = second if first.kind == ERASER else first
+        for port in other.ports[1:]:
+            self.link((Agent(ERASER), 0), port)
+
+    def copy_atom(self, first: Agent, second: Agent) -> None:
+        atom, duplicator = (first, second) if first.kind == ATOM else (second, first)
+        self.link((Agent(ATOM, atom.label), 0), duplicator.ports[1])
+        self.link((Agent(ATOM, atom.label), 0), duplicator.ports[2])
+
+    def read_back(self, port: Tuple[Agent, int], exits: List[int], names: Dict[Agent, List[str]], scope: Set[str]) -> Expression:
+        # Duplicators entered through a copy port push it on exits, so leaving
+        # through the principal port of a later one takes the matching copy
+        agent, slot = port
+        if agent.kind == ATOM:
+            return VariableNode(agent.label)
+        if agent.kind == LAMBDA:
+            if slot == 2:
+                return VariableNode(names[agent][-1])
+            name: str = self.alpha_conversion.generate_new_variable(agent.label, self.free_names | scope)
+            names.setdefault(agent, []).append(name)
+            body: Expression = self.read_back(agent.ports[1], exits, names, scope | {name})
+            names[agent].pop()
+            return LambdaAbstractionNode(name, body)
+        if agent.kind == APPLICATION:
+            return LambdaApplicationNode(self.read_back(agent.ports[0], exits, names, scope), self.read_back(agent.ports[2], exits, names, scope))
+        if agent.kind == DUPLICATOR:
+            if slot == 0:
+                exit = exits.pop()
+                result: Expression = self.read_back(agent.ports[exit], exits, names, scope)
+                exits.append(exit)
+                return result
+            exits.append(slot)
+            result = self.read_back(agent.ports[0], exits, names, scope)
+            exits.pop()
+            return result
+        raise SyntaxError(f"Cannot read back agent of kind {agent.kind}")
@@ -0,0 +1,130 @@
+from typing import List, Set
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+# Continuation frames used by IterativeEvaluator.beta_reduce
+_REBUILD_ABSTRACTION = 0 # payload: parameter name, value: reduced body
+_REDUCE_HEAD = 1         # payload: unreduced argument, value: reduced head
+_REBUILD_APPLICATION = 2 # payload: reduced head, value: reduced argument
+
+
+class IterativeEvaluator:
+    """
+    Stack-safe counterpart of Evaluator.
+
+    Produces exactly the same normal forms (including the names picked when
+    renaming) as Evaluator.beta_reduce and Evaluator.substitute, but walks the
+    term with explicit continuation stacks instead of Python recursion, so the
+    depth of a term or of a reduction chain is only limited by memory.
+    """
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+
+    def beta_reduce(self, ast: Expression) -> Expression:
+        continuations: List = []
+        term: Expression = ast
+
+        while True:
+            # Walk down the left spine, remembering what to do on the way back up
+            while True:
+                node_type = type(term)
+                if node_type is LambdaApplicationNode:
+                    continuations.append((_REDUCE_HEAD, term.right))
+                    term = term.left
+                elif node_type is LambdaAbstractionNode:
+                    continuations.append((_REBUILD_ABSTRACTION, term.param))
+                    term = term.body
+                elif node_type is VariableNode:
+                    break
+                else:
+                    raise SyntaxError(f"Unknown node type: {term}")
+
+            value: Expression = term
+            while continuations:
+                kind, payload = continuations.pop()
+                if kind == _REBUILD_ABSTRACTION:
+                    value = LambdaAbstractionNode(payload, value)
+                elif kind == _REDUCE_HEAD:
+                    if type(value) is LambdaAbstractionNode:
+                        # Contract the redex and reduce the result in place of the application
+                        term = self.substitute(value.param, value.body, payload)
+                    else:
+                        continuations.append((_REBUILD_APPLICATION, value))
+                        term = payload
+                    break
+                else:
+                    value = LambdaApplicationNode(payload, value)
+            else:
+                return value
+
+    def substitute(self, param: str, body: Expression, argument: Expression) -> Expression:
+        argument_free_variables: Set = argument.free_vars
+        work: List = [body]
+        values: List[Expression] = []
+
+        while work:
+            item = work.pop()
+            item_type = type(item)
+
+            if item_type is str:
+                # Rebuild marker for an abstraction, the item is its parameter name
+                values.append(LambdaAbstractionNode(item, values.pop()))
+            elif item_type is int:
+                right = values.pop()
+                values.append(LambdaApplicationNode(values.pop(), right))
+            elif param not in item.free_vars:
+                # Nothing to replace below this node (this also covers a shadowing binder)
+                values.append(item)
+            elif item_type is VariableNode:
+                values.append(argument)
+            elif item_type is LambdaApplicationNode:
+                work.append(_REBUILD_APPLICATION)
+                work.append(item.right)
+                work.append(item.left)
+            elif item_type is LambdaAbstractionNode:
+                inner_param: str = item.param
+                inner_body: Expression = item.body
+                if inner_param in argument_free_variables:
+                    # Substituting would capture a free variable of the argument, rename the binder first
+                    bound = self.alpha_conversion.get_free_and_bound_variables(inner_body)[1]
+                    new_param: str = self.alpha_conversion.generate_new_variable(
+                        inner_param, argument_free_variables | inner_body.free_vars | set(bound)
+                    )
+                    inner_body = self.rename(inner_body, inner_param, new_param)
+                    inner_param = new_param
+
+                work.append(inner_param)
+                work.append(inner_body)
+            else:
+                raise SyntaxError(f"Unknown node type: {item}")
+
+        return values.pop()
+
+    def rename(self, ast: Expression, old_param: str, new_param: str) -> Expression:
+        # Iterative equivalent of AlphaConversion.alpha_convert: every occurrence
+        # of old_param, binder or variable, becomes new_param
+        work: List = [ast]
+        values: List[Expression] = []
+
+        while work:
+            item = work.pop()
+            item_type = type(item)
+
+            if item_type is VariableNode:
+                values.append(VariableNode(new_param) if item.value == old_param else item)
+            elif item_type is LambdaApplicationNode:
+                work.append(_REBUILD_APPLICATION)
+                work.append(item.right)
+                work.append(item.left)
+            elif item_type is LambdaAbstractionNode:
+                work.append(new_param if item.param == old_param else item.param)
+                work.append(item.body)
+            elif item_type is str:
+                values.append(LambdaAbstractionNode(item, values.pop()))
+            elif item == _REBUILD_APPLICATION:
+                right = values.pop()
+                values.append(LambdaApplicationNode(values.pop(), right))
+            else:
+                raise SyntaxError(f"Unknown node type: {item}")
+
+        return values.pop()
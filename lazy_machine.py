@@ -0,0 +1,127 @@
+from typing import List, Optional, Set, Tuple
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+# Environments are linked frames: (name, thunk, parent) or None for the empty environment
+Environment = Optional[Tuple]
+
+
+class Thunk:
+    # A suspended argument. Once forced, value holds its weak head normal form and
+    # the term/environment are dropped, so every later use shares the result.
+    __slots__ = ("term", "env", "value")
+
+    def __init__(self, term: Optional[Expression], env: Environment, value=None):
+        self.term = term
+        self.env = env
+        self.value = value
+
+
+class Closure:
+    # An abstraction paired with the environment it was evaluated in
+    __slots__ = ("param", "body", "env")
+
+    def __init__(self, param: str, body: Expression, env: Environment):
+        self.param = param
+        self.body = body
+        self.env = env
+
+
+class Neutral:
+    # A free variable applied to (still suspended) arguments
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: Tuple[Thunk, ...] = ()):
+        self.name = name
+        self.args = args
+
+
+class LazyMachine:
+    """
+    Call-by-need environment machine (a Krivine machine with update markers).
+
+    Terms are never copied: arguments become thunks in the environment and are
+    evaluated at most once, when first needed. The result is read back into
+    the regular AST nodes, reducing under binders, so the full normal form is
+    produced just like Evaluator.beta_reduce.
+    """
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+        self.beta_steps: int = 0
+        self.thunks_forced: int = 0
+        self.free_names: Set[str] = set()
+
+    def evaluate(self, ast: Expression) -> Expression:
+        self.free_names = set(ast.free_vars)
+        return self.read_back(self.whnf(ast, None), set())
+
+    def whnf(self, term: Expression, env: Environment):
+        # The stack holds pending arguments (Thunk) and update markers (1-tuples
+        # of the thunk whose value is being computed)
+        stack: List = []
+
+        while True:
+            term_type = type(term)
+            if term_type is LambdaApplicationNode:
+                stack.append(Thunk(term.right, env))
+                term = term.left
+                continue
+            elif term_type is VariableNode:
+                thunk: Optional[Thunk] = self.lookup(env, term.value)
+                if thunk is None:
+                    value = Neutral(term.value)
+                elif thunk.value is not None:
+                    value = thunk.value
+                else:
+                    # Evaluate the suspended argument, remembering to update it afterwards
+                    self.thunks_forced += 1
+                    stack.append((thunk,))
+                    term, env = thunk.term, thunk.env
+                    continue
+            elif term_type is LambdaAbstractionNode:
+                value = Closure(term.param, term.body, env)
+            else:
+                raise SyntaxError(f"Unknown node type: {term}")
+
+            while stack:
+                top = stack.pop()
+                if type(top) is tuple:
+                    updated: Thunk = top[0]
+                    updated.value = value
+                    updated.term = updated.env = None
+                elif type(value) is Closure:
+                    self.beta_steps += 1
+                    term = value.body
+                    env = (value.param, top, value.env)
+                    break
+                else:
+                    value = Neutral(value.name, value.args + (top,))
+            else:
+                return value
+
+    def force(self, thunk: Thunk):
+        if thunk.value is None:
+            self.thunks_forced += 1
+            thunk.value = self.whnf(thunk.term, thunk.env)
+            thunk.term = thunk.env = None
+        return thunk.value
+
+    def read_back(self, value, scope: Set[str]) -> Expression:
+        if type(value) is Closure:
+            # Go under the binder by applying the closure to a fresh variable
+            name: str = self.alpha_conversion.generate_new_variable(value.param, self.free_names | scope)
+            variable = Thunk(None, None, Neutral(name))
+            body = self.whnf(value.body, (value.param, variable, value.env))
+            return LambdaAbstractionNode(name, self.read_back(body, scope | {name}))
+
+        result: Expression = VariableNode(value.name)
+        for thunk in value.args:
+            result = LambdaApplicationNode(result, self.read_back(self.force(thunk), scope))
+        return result
+
+    def lookup(self, env: Environment, name: str) -> Optional[Thunk]:
+        while env is not None:
+            if env[0] == name:
+                return env[1]
+            env = env[2]
+        return None
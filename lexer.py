@@ -1,57 +1,146 @@
+import re
+import string
 from token_type import TokenType
 from token_internal import Token
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Iterator
+
+KEYWORDS: Dict[str, str] = {
+    "fn": TokenType.LAMBDA.name,
+    "def": TokenType.DEF.name,
+    "import": TokenType.IMPORT.name,
+}
+
+# Each match is the whitespace and comment before a token, then the token. A
+# comment runs to the end of its line, so the engine can't backtrack into one,
+# and every position matches something (an empty token at the end of the line),
+# so findall never skips over characters.
+_TOKEN_PATTERN = re.compile(r"""
+    ((?:[ \t\r]+|;.*$)*)
+    ([A-Za-z][A-Za-z0-9_]* | [0-9]+ | "[^"]*" | [^ \t\r;] | $)
+""", re.VERBOSE)
+
+# Token type by the first character of a lexeme; others can't start a token
+_FIRST_CHARACTER_TYPES: Dict[str, str] = {
+    **{c: TokenType.VARIABLE.name for c in string.ascii_letters},
+    **{c: TokenType.NUMBER.name for c in string.digits},
+    '"': TokenType.STRING.name,
+    "(": TokenType.LPAREN.name,
+    ")": TokenType.RPAREN.name,
+    ".": TokenType.DOT.name,
+    "=": TokenType.EQUALS.name,
+}
+
+
+def identifier_type(lexeme: str) -> str:
+    # Keywords, definition names (an uppercase letter followed by uppercase
+    # letters, digits or "_") and variables share the identifier syntax
+    keyword = KEYWORDS.get(lexeme)
+    if keyword is not None:
+        return keyword
+    if len(lexeme) > 1 and lexeme[0].isupper() and not any(c.islower() for c in lexeme):
+        return TokenType.NAME.name
+    return TokenType.VARIABLE.name
+
 
 class Lexer:
-    def __init__(self, source: str):
+    def __init__(self, source: str, line: int = 1):
         self.source: str = source
         self.tokens: List[Token] = []
         self.start_position: int = 0
         self.current_position: int = 0
-        self.line: int = 1
+        self.line: int = line # line of the file the source starts on
         self.column: int = 1
-    
-    def tokenize(self) -> List[Token]:
-        while not self.is_at_end():
-            self.start_position = self.current_position
-            self.scan_tokens()
-
-    def scan_tokens(self) -> None:
-        c: str = self.advance()
-
-        symbols: Dict[str, Callable] = {
+        self.symbols: Dict[str, Callable] = {
             "(": lambda: self.add_token(TokenType.LPAREN.name),
             ")": lambda: self.add_token(TokenType.RPAREN.name),
             ".": lambda: self.add_token(TokenType.DOT.name),
+            "=": lambda: self.add_token(TokenType.EQUALS.name),
+            '"': lambda: self.scan_string(),
             ";": lambda: self.skip_comments()
         }
-
-        fn: Callable = symbols.get(c, lambda: self.default_case(c))
+    
+    def tokenize(self) -> List[Token]:
         try:
-            fn()
+            while not self.is_at_end():
+                self.start_position = self.current_position
+                self.scan_tokens()
         except Exception as e:
             raise SyntaxError(f"something went wrong during scanning: {e}")
+
+    def scan_tokens(self) -> None:
+        c: str = self.advance()
+        fn: Callable = self.symbols.get(c)
+        if fn is None:
+            self.default_case(c)
+        else:
+            fn()
+
+    def scan(self) -> Iterator[Token]:
+        """
+        Yields the same tokens as tokenize, with the same lines and columns,
+        but matches whole tokens with one compiled regex instead of going
+        through the source a character at a time. Nothing is stored in tokens.
+        """
+        token_types: Dict[str, str] = {} # memoized per lexeme
+        findall = _TOKEN_PATTERN.findall
+
+        # Tokens never span lines, so each line is scanned on its own and the
+        # column follows from the lengths of what was matched before
+        for line, text in enumerate(self.source.split("\n"), self.line):
+            column: int = 1
+            for skipped, lexeme in findall(text):
+                column += len(skipped)
+                if not lexeme:
+                    break
+                token_type = token_types.get(lexeme)
+                if token_type is None:
+                    token_type = token_types[lexeme] = self.token_type(lexeme, line)
+                yield Token(token_type, lexeme, line, column)
+                column += len(lexeme)
+
+    def token_type(self, lexeme: str, line: int) -> str:
+        token_type = _FIRST_CHARACTER_TYPES.get(lexeme[0])
+        if token_type is None:
+            raise SyntaxError(f"something went wrong during scanning: Unknown character: {lexeme}")
+        if token_type == TokenType.STRING.name and len(lexeme) == 1:
+            raise SyntaxError(f"something went wrong during scanning: Unterminated string at line: {line}")
+        if token_type == TokenType.VARIABLE.name:
+            return identifier_type(lexeme)
+        return token_type
     
     def skip_comments(self):
         while self.peek() != "\n" and not self.is_at_end():
             self.advance()
     
+    def scan_string(self):
+        while self.peek() != '"' and self.peek() != "\n" and not self.is_at_end():
+            self.advance()
+        if self.peek() != '"':
+            raise SyntaxError(f"Unterminated string at line: {self.line}")
+        self.advance() # consume the closing quote
+        self.add_token(TokenType.STRING.name)
+
     def default_case(self, c):
         if self.is_whitespace(c):
             if c == "\n":
                 self.line += 1
                 self.column = 1
         elif self.is_alpha(c):
-            self.scan_identifier(c)
+            self.scan_identifier()
+        elif self.is_digit(c):
+            self.scan_number()
         else:
             raise SyntaxError(f"Unknown character: {c}")
     
-    def scan_identifier(self, current_chr: str):
-        if current_chr == "f" and self.peek() == "n" and self.peek_next() == " ":
-            self.advance() # consume "n" character
-            self.add_token(TokenType.LAMBDA.name)
-        else:
-            self.add_token(TokenType.VARIABLE.name)
+    def scan_identifier(self):
+        while self.is_alpha(self.peek()) or self.is_digit(self.peek()) or self.peek() == "_":
+            self.advance()
+        self.add_token(identifier_type(self.source[self.start_position:self.current_position]))
+
+    def scan_number(self):
+        while self.is_digit(self.peek()):
+            self.advance()
+        self.add_token(TokenType.NUMBER.name)
 
 
     def add_token(self, token_type: TokenType) -> None:
@@ -60,13 +149,17 @@ class Lexer:
 
     ########################## HELPER FUNCTIONS #######################
     def is_alpha(self, c: str) -> bool:
-        return (c >= 'a' and c <= 'z') or (c >= 'A' or c <= 'Z')
+        return (c >= 'a' and c <= 'z') or (c >= 'A' and c <= 'Z')
+
+    def is_digit(self, c: str) -> bool:
+        return c >= '0' and c <= '9'
 
     def is_whitespace(self, c: str) -> bool:
         SPACE: str = " "
         NEWLINE: str = "\n"
         TABSPACE: str = "\t"
-        return c in [SPACE, NEWLINE, TABSPACE]
+        CARRIAGE_RETURN: str = "\r"
+        return c in [SPACE, NEWLINE, TABSPACE, CARRIAGE_RETURN]
 
     def advance(self) -> str:
         current: str = self.source[self.current_position]
@@ -1,21 +1,90 @@
 #!/usr/bin/env python3
 
 import sys
+import argparse
 from repl import Repl
+from reduction_strategy import ReductionStrategy
+from tracing import tracer
+from backends import BACKENDS, STEP_BUDGET_BACKENDS, SUBSTITUTION
 
 arguments = sys.argv
+PROGRAM_NAME = "lambda_constructor"
 
-def main():
-    PROGRAM_NAME = "lambda_constructor"
-    arg_len = len(arguments)
-    repl = Repl()
-    if arg_len > 2:
-        print(f"Usage: {PROGRAM_NAME} [script]")
+
+class ArgumentParser(argparse.ArgumentParser):
+    def error(self, message):
+        # Keep the conventional EX_USAGE exit code for bad invocations
+        self.print_usage(sys.stderr)
+        print(f"{PROGRAM_NAME}: error: {message}", file=sys.stderr)
         sys.exit(64)
-    elif arg_len == 2:
-        repl.run_file(arguments[1])
-    else:
-        repl.run_prompt()
+
+
+def main():
+    parser = ArgumentParser(prog=PROGRAM_NAME)
+    parser.add_argument("script", nargs="?", help="lambda calculus file to run, starts the REPL when omitted")
+    parser.add_argument(
+        "--strategy",
+        choices=[strategy.value for strategy in ReductionStrategy],
+        default=ReductionStrategy.DEFAULT.value,
+        help="reduction strategy used by the evaluator"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=[SUBSTITUTION, *BACKENDS],
+        default=SUBSTITUTION,
+        help=(
+            "evaluation engine; only substitution supports --strategy, --max-size, --timeout, "
+            "--detect-loops and --cache, and only substitution and interaction-net support --max-steps"
+        )
+    )
+    parser.add_argument("--metrics", action="store_true", help="print reduction metrics after each result")
+    parser.add_argument("--max-steps", type=int, default=None, help="stop a reduction after this many beta steps")
+    parser.add_argument("--max-size", type=int, default=None, help="stop a reduction once a term grows past this many nodes")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS", help="stop a reduction after this much wall-clock time")
+    parser.add_argument("--detect-loops", action="store_true", help="stop when a term repeats or keeps growing, and report the loop")
+    parser.add_argument("--cache", type=int, default=None, metavar="ENTRIES", help="memoize normal forms of up to ENTRIES closed subterms")
+    parser.add_argument("--trace", metavar="FILE", default=None, help="write evaluator trace events to FILE as JSON lines")
+    parser.add_argument("--trace-sample", type=float, default=1.0, help="fraction of calls written to the trace (default: 1.0)")
+    parser.add_argument("--profile", action="store_true", help="print time and calls per evaluator operation when done")
+    args = parser.parse_args(arguments[1:])
+    if args.backend != SUBSTITUTION:
+        unsupported = [
+            flag for flag, given in (
+                ("--strategy", args.strategy != ReductionStrategy.DEFAULT.value),
+                ("--max-steps", args.max_steps is not None and args.backend not in STEP_BUDGET_BACKENDS),
+                ("--max-size", args.max_size is not None),
+                ("--timeout", args.timeout is not None),
+                ("--detect-loops", args.detect_loops),
+                ("--cache", args.cache is not None),
+            ) if given
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} not supported by the {args.backend} backend")
+
+    repl = Repl(
+        strategy=ReductionStrategy(args.strategy),
+        show_metrics=args.metrics,
+        max_steps=args.max_steps,
+        max_size=args.max_size,
+        cache_entries=args.cache,
+        backend=args.backend,
+        detect_divergence=args.detect_loops,
+        timeout=args.timeout
+    )
+
+    trace_sink = open(args.trace, "w") if args.trace else None
+    if trace_sink or args.profile:
+        tracer.enable(trace_sink, args.trace_sample)
+    try:
+        if args.script:
+            repl.run_file(args.script)
+        else:
+            repl.run_prompt()
+    finally:
+        if args.profile:
+            print(tracer.report(), file=sys.stderr)
+        if trace_sink:
+            trace_sink.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,99 @@
+import os
+from typing import Callable, Dict, List, Optional, Set
+from ast_internal import Definition, Import
+from beta_reduction import Evaluator
+from environment import Environment
+from form_cache import cached_forms
+
+
+class Module:
+    __slots__ = ("path", "mtime", "definitions", "imports", "dependencies")
+
+    def __init__(self, path: str, mtime: int, definitions: Dict, imports: List[str], dependencies: Dict[str, int]):
+        self.path: str = path
+        self.mtime: int = mtime # st_mtime_ns of the file when it was loaded
+        self.definitions: Dict = definitions # name -> normal form, including imported ones loaded while reducing
+        self.imports: List[str] = imports # resolved paths of the modules it imports, re-exported to importers
+        self.dependencies: Dict[str, int] = dependencies # imported modules loaded while reducing it -> their mtime then
+
+
+class ModuleLoader:
+    """
+    Loads the definitions of imported files. Each file is read, parsed and
+    reduced once per process; later imports of the same path reuse the module
+    until the modification time of the file, or of a module it imports,
+    changes.
+
+    Only definitions and imports of a module are run, other top-level
+    expressions in it are skipped. Imports inside a module are resolved
+    relative to its own directory and loaded lazily like any other.
+
+    Definitions are reduced by make_evaluator(environment), normally the
+    importing session's evaluator settings. One that stops before its normal
+    form (a budget, timeout or Ctrl-C) fails the import with ImportError.
+    """
+    def __init__(self):
+        self.modules: Dict[str, Module] = {}
+        self.loading: Set[str] = set()
+        self.loads: int = 0 # files actually read and parsed
+
+    def resolve(self, path: str, directory: str) -> str:
+        resolved: str = os.path.abspath(os.path.join(directory, path))
+        if not os.path.isfile(resolved):
+            raise ImportError(f"No module file {path} (looked for {resolved})")
+        return resolved
+
+    def load(self, path: str, make_evaluator: Optional[Callable[[Environment], Evaluator]] = None) -> Module:
+        module = self.modules.get(path)
+        if module is not None and self.is_current(module):
+            return module
+        if path in self.loading:
+            raise ImportError(f"Circular import of {path}")
+
+        self.loading.add(path)
+        try:
+            mtime: int = os.stat(path).st_mtime_ns
+            make_evaluator = make_evaluator or (lambda environment: Evaluator(environment=environment))
+            environment = Environment(self, make_evaluator)
+            imports: List[str] = []
+            for line, form in cached_forms(path):
+                match form:
+                    case Import(target):
+                        imports.append(self.resolve(target, os.path.dirname(path)))
+                        environment.add_import(imports[-1])
+                    case SyntaxError() as error:
+                        raise ImportError(f"Could not import {path}: line {line}: {error}")
+                    case Definition(name, expression):
+                        result = make_evaluator(environment).evaluate(expression)
+                        if not result.completed:
+                            raise ImportError(f"Could not import {path}: {name} at line {line} stopped, {result.reason}")
+                        environment.define(name, result.expression)
+        finally:
+            self.loading.discard(path)
+
+        dependencies: Dict[str, int] = {dependency: self.modules[dependency].mtime for dependency in environment.loaded}
+        module = self.modules[path] = Module(path, mtime, environment.definitions, imports, dependencies)
+        self.loads += 1
+        return module
+
+    def is_current(self, module: Module, checked: Optional[Set[str]] = None) -> bool:
+        # A module is stale when its file changed, or when a module its
+        # definitions were reduced with did; imports it never needed don't count
+        checked = checked if checked is not None else set()
+        checked.add(module.path)
+        try:
+            if os.stat(module.path).st_mtime_ns != module.mtime:
+                return False
+            for path, mtime in module.dependencies.items():
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+                dependency = self.modules.get(path)
+                if path not in checked and dependency is not None and not self.is_current(dependency, checked):
+                    return False
+        except OSError:
+            return False
+        return True
+
+
+# Shared so a module is parsed once per process, whichever session imports it
+module_loader: ModuleLoader = ModuleLoader()
@@ -0,0 +1,89 @@
+from typing import Callable, Set, Tuple
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+
+class Neutral:
+    # A free variable applied to arguments. Calling it just records the argument,
+    # so neutral values can be applied exactly like compiled abstractions.
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: Tuple = ()):
+        self.name = name
+        self.args = args
+
+    def __call__(self, argument):
+        return Neutral(self.name, self.args + (argument,))
+
+
+class NbeEvaluator:
+    """
+    Normalization by evaluation.
+
+    compile() turns an Expression into nested Python closures once; running
+    them evaluates the term with native Python calls (abstractions become
+    Python functions), and read_back() turns the resulting value into a
+    beta-normal Expression using the regular node classes. No intermediate
+    AST is rebuilt while evaluating.
+
+    Arguments are evaluated before the call (call-by-value), so a term that
+    only terminates by discarding a divergent argument will not terminate
+    here; use Evaluator for those.
+    """
+    def __init__(self):
+        self.alpha_conversion = AlphaConversion()
+        self.free_names: Set[str] = set()
+
+    def normalize(self, ast: Expression) -> Expression:
+        self.free_names = set(ast.free_vars)
+        return self.read_back(self.compile(ast)(None), set())
+
+    def compile(self, ast: Expression, scope: Tuple[str, ...] = ()) -> Callable:
+        # The environment is a linked list (value, parent); a bound variable is
+        # compiled to the number of links to follow
+        match ast:
+            case VariableNode(value):
+                if value not in scope:
+                    neutral = Neutral(value)
+                    return lambda env: neutral
+
+                distance: int = scope[::-1].index(value)
+                if distance == 0:
+                    return lambda env: env[0]
+                if distance == 1:
+                    return lambda env: env[1][0]
+                if distance == 2:
+                    return lambda env: env[1][1][0]
+
+                def lookup(env):
+                    for _ in range(distance):
+                        env = env[1]
+                    return env[0]
+                return lookup
+            case LambdaAbstractionNode(param, body):
+                compiled_body: Callable = self.compile(body, scope + (param,))
+
+                def abstraction(env):
+                    # param is kept as a default so read_back can reuse the name
+                    def value(argument, param=param):
+                        return compiled_body((argument, env))
+                    return value
+                return abstraction
+            case LambdaApplicationNode(left, right):
+                compiled_left: Callable = self.compile(left, scope)
+                compiled_right: Callable = self.compile(right, scope)
+                return lambda env: compiled_left(env)(compiled_right(env))
+            case _:
+                raise SyntaxError(f"Unknown node type: {ast}")
+
+    def read_back(self, value, scope: Set[str]) -> Expression:
+        if isinstance(value, Neutral):
+            result: Expression = VariableNode(value.name)
+            for argument in value.args:
+                result = LambdaApplicationNode(result, self.read_back(argument, scope))
+            return result
+
+        # An abstraction: apply it to a fresh variable and read back the body
+        hint: str = value.__defaults__[0] if value.__defaults__ else "x"
+        name: str = self.alpha_conversion.generate_new_variable(hint, self.free_names | scope)
+        return LambdaAbstractionNode(name, self.read_back(value(Neutral(name)), scope | {name}))
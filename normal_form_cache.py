@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+from alpha_conversion import AlphaConversion
+from ast_internal import Expression
+
+
+class NormalFormCache:
+    """
+    LRU map from closed terms to their normal forms.
+
+    Entries are keyed by AlphaConversion.alpha_hash, so alpha-equivalent terms
+    share an entry; a hash collision is detected with alpha_equivalent and
+    counted as a miss. The cache is bounded both by number of entries and by
+    the total size (in nodes) of the terms it holds.
+    """
+    def __init__(self, max_entries: int = 4096, max_nodes: int = 1_000_000):
+        self.alpha_conversion = AlphaConversion()
+        self.max_entries: int = max_entries
+        self.max_nodes: int = max_nodes
+        self.entries: OrderedDict = OrderedDict() # alpha hash -> (term, normal form)
+        self.nodes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def lookup(self, term: Expression) -> Optional[Expression]:
+        key: int = self.alpha_conversion.alpha_hash(term)
+        entry: Optional[Tuple[Expression, Expression]] = self.entries.get(key)
+        if entry is None or not self.alpha_conversion.alpha_equivalent(entry[0], term):
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def store(self, term: Expression, normal_form: Expression) -> None:
+        if term.free_vars:
+            raise ValueError(f"Only closed terms can be cached, {term} has free variables {set(term.free_vars)}")
+
+        entry_nodes: int = term.size + normal_form.size
+        if entry_nodes > self.max_nodes:
+            return
+
+        key: int = self.alpha_conversion.alpha_hash(term)
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.nodes -= previous[0].size + previous[1].size
+
+        self.entries[key] = (term, normal_form)
+        self.nodes += entry_nodes
+
+        while len(self.entries) > self.max_entries or self.nodes > self.max_nodes:
+            _, (evicted_term, evicted_normal_form) = self.entries.popitem(last=False)
+            self.nodes -= evicted_term.size + evicted_normal_form.size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.nodes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "nodes": self.nodes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self):
+        return len(self.entries)
@@ -1,7 +1,8 @@
 from token_type import TokenType
 from token_internal import Token
-from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
-from typing import List
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode, Definition, Import
+from church_encoding import ChurchNumeral
+from typing import List, Union
 
 
 class Parser:
@@ -10,8 +11,24 @@ class Parser:
         self.current_position: int = 0
         self.ast = []
 
-    def parse(self) -> Expression:
-        self.ast.append(self.parse_expression())
+    def parse(self) -> Union[Expression, Definition, Import]:
+        if self.match(TokenType.DEF.name):
+            self.ast.append(self.parse_definition())
+        elif self.match(TokenType.IMPORT.name):
+            path: Token = self.consume(TokenType.STRING.name, "Expected a quoted path after 'import'.")
+            self.ast.append(Import(path.lexeme[1:-1]))
+        else:
+            self.ast.append(self.parse_expression())
+        if not self.is_at_end():
+            # e.g. an unmatched ')', reported on the line it is on
+            stray: Token = self.peek()
+            raise SyntaxError(f"Unexpected '{stray.lexeme}' after the end of the expression at line: {stray.line}, column: {stray.column}")
+
+    def parse_definition(self) -> Definition:
+        # we have already consumed the DEF token
+        name: Token = self.consume(TokenType.NAME.name, "Expected a definition name after 'def'.")
+        self.consume(TokenType.EQUALS.name, "Expected '=' after the definition name.")
+        return Definition(name.lexeme, self.parse_expression())
     
     def parse_expression(self) -> Expression:
         left: Expression = self.parse_term()
@@ -38,7 +55,12 @@ class Parser:
         # we have already consumed the LAMBDA token, now let's consume the params
         params: List[Token] = []
         while not self.is_at_end() and self.peek().token_type != TokenType.DOT.name:
-            params.append(self.advance())
+            param: Token = self.advance()
+            if param.token_type == TokenType.NAME.name:
+                raise SyntaxError(f"Definition name {param.lexeme} can't be a parameter, at line: {param.line}, column: {param.column}")
+            if param.token_type == TokenType.NUMBER.name:
+                raise SyntaxError(f"Number {param.lexeme} can't be a parameter, at line: {param.line}, column: {param.column}")
+            params.append(param)
 
         self.match(TokenType.DOT.name) # consume the "DOT" token
 
@@ -57,10 +79,20 @@ class Parser:
 
             return expr
 
-        # Else it must be a Variable/Atom
-        if self.match(TokenType.VARIABLE.name):
+        # Else it must be a Variable/Atom, or a reference to a definition
+        if self.match(TokenType.VARIABLE.name, TokenType.NAME.name):
             return VariableNode(self.peek_previous().lexeme)
 
+        # A numeric literal stands for its Church numeral
+        if self.match(TokenType.NUMBER.name):
+            return ChurchNumeral().encode_church_numeral(int(self.peek_previous().lexeme))
+
+        if self.is_at_end():
+            last: Token = self.peek_previous()
+            raise SyntaxError(f"Expected an expression after '{last.lexeme}' at line: {last.line}, column: {last.column}")
+        current_token: Token = self.peek()
+        raise SyntaxError(f"Expected an expression. Got '{current_token.lexeme}' at line: {current_token.line}, column: {current_token.column}")
+
     ########################### HELPER FUNCTION ################################
     def consume(self, token_type: TokenType, error_msg: str) -> Token:
         if self.check(token_type):
@@ -0,0 +1,119 @@
+from types import CodeType
+from typing import Dict, List, Set
+from weakref import WeakKeyDictionary
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+from nbe import Neutral, NbeEvaluator
+
+
+def mangle(name: str) -> str:
+    # Lambda calculus names to Python identifiers, injectively
+    return "".join(c if c.isalnum() and c.isascii() else ("__" if c == "_" else f"_{ord(c)}_") for c in name)
+
+
+class CompiledTerm:
+    """
+    A term compiled to a Python code object. Calling it with argument
+    Expressions applies the compiled function to (compiled) arguments and reads
+    the result back into a normal-form Expression.
+    """
+    def __init__(self, compiler: "PythonCompiler", ast: Expression, source: str, code: CodeType):
+        self.compiler: "PythonCompiler" = compiler
+        self.free_names: frozenset = ast.free_vars # not the ast itself, which keys the compiler's weak cache
+        self.source: str = source
+        self.code: CodeType = code
+        self._value = None
+
+    def value(self):
+        # The Python value of the term: a function for an abstraction, a Neutral otherwise.
+        # Compiled terms are pure, so the value is built once and shared.
+        if self._value is None:
+            namespace: Dict = {f"f_{mangle(name)}": Neutral(name) for name in self.free_names}
+            exec(self.code, namespace)
+            self._value = namespace["_term"]()
+        return self._value
+
+    def __call__(self, *arguments: Expression) -> Expression:
+        value = self.value()
+        free_names: Set[str] = set(self.free_names)
+        for argument in arguments:
+            value = value(self.compiler.compile(argument).value())
+            free_names |= argument.free_vars
+
+        reader = NbeEvaluator()
+        reader.free_names = free_names
+        return reader.read_back(value, set())
+
+
+class PythonCompiler:
+    """
+    Compiles lambda terms to Python source and, through compile(), to code
+    objects that are kept per term for reuse.
+
+    Every abstraction becomes a top-level factory that takes the variables
+    it captures and returns the closure, and every application a statement
+    assigning to a temporary, so the source never nests more than two defs
+    deep, however deeply the term does. Like NbeEvaluator, arguments are
+    evaluated before the call.
+    """
+    def __init__(self):
+        self.compiled: WeakKeyDictionary = WeakKeyDictionary() # Expression -> CompiledTerm
+
+    def compile(self, ast: Expression) -> CompiledTerm:
+        compiled = self.compiled.get(ast)
+        if compiled is None:
+            source: str = self.generate_source(ast)
+            compiled = CompiledTerm(self, ast, source, compile(source, "<lambda term>", "exec"))
+            self.compiled[ast] = compiled
+        return compiled
+
+    def normalize(self, ast: Expression) -> Expression:
+        return self.compile(ast)()
+
+    def generate_source(self, ast: Expression) -> str:
+        definitions: List[str] = []
+        counter: List[int] = [0]
+
+        def fresh(prefix: str) -> str:
+            counter[0] += 1
+            return f"{prefix}{counter[0]}"
+
+        def emit(ast: Expression, scope: Set[str], lines: List[str], indent: str) -> str:
+            # Appends the statements computing ast and returns the name holding its value
+            match ast:
+                case VariableNode(value):
+                    return f"v_{mangle(value)}" if value in scope else f"f_{mangle(value)}"
+                case LambdaAbstractionNode(param, body):
+                    # A top-level factory taking the variables the closure
+                    # captures, so indentation doesn't grow with nesting
+                    name: str = fresh("_lambda_")
+                    captured: List[str] = [f"v_{mangle(variable)}" for variable in sorted(ast.free_vars & scope)]
+                    block: List[str] = [
+                        f"def {name}({', '.join(captured)}):",
+                        # param is kept as a default so read_back can reuse the name
+                        f"    def _closure(v_{mangle(param)}, param={param!r}):",
+                    ]
+                    result: str = emit(body, (ast.free_vars & scope) | {param}, block, "        ")
+                    block.append(f"        return {result}")
+                    block.append("    return _closure")
+                    definitions.extend(block)
+
+                    temporary: str = fresh("_t")
+                    lines.append(f"{indent}{temporary} = {name}({', '.join(captured)})")
+                    return temporary
+                case LambdaApplicationNode(left, right):
+                    function: str = emit(left, scope, lines, indent)
+                    argument: str = emit(right, scope, lines, indent)
+                    temporary: str = fresh("_t")
+                    lines.append(f"{indent}{temporary} = {function}({argument})")
+                    return temporary
+                case _:
+                    raise SyntaxError(f"Unknown node type: {ast}")
+
+        lines: List[str] = ["def _term():"]
+        result: str = emit(ast, set(), lines, "    ")
+        lines.append(f"    return {result}")
+        return "\n".join(definitions + lines) + "\n"
+
+
+# Shared so code objects are reused across evaluations in the same process
+python_compiler: PythonCompiler = PythonCompiler()
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, asdict
+from typing import Optional
+from ast_internal import Expression
+
+
+@dataclass
+class ReductionMetrics:
+    beta_steps: int = 0 # contractions performed
+    substitutions: int = 0 # calls to Evaluator.substitute, including recursive ones
+    alpha_renamings: int = 0 # binders renamed through AlphaConversion.alpha_convert
+    fresh_names: int = 0 # names produced by AlphaConversion.generate_new_variable
+    expansions: int = 0 # references to definitions replaced by their normal form
+    peak_term_size: int = 0 # largest size (in nodes) the whole term reached during the run
+    peak_depth: int = 0 # deepest position (in enclosing nodes) at which reduction took place
+    wall_time: float = 0.0 # seconds
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def __str__(self):
+        return (
+            f"steps: {self.beta_steps}, substitutions: {self.substitutions}, "
+            f"alpha renamings: {self.alpha_renamings}, fresh names: {self.fresh_names}, "
+            f"expansions: {self.expansions}, "
+            f"peak size: {self.peak_term_size}, peak depth: {self.peak_depth}, "
+            f"time: {self.wall_time * 1000:.3f}ms"
+        )
+
+
+class ReductionInterrupted(Exception):
+    """
+    Raised from inside the evaluator when a run has to stop before reaching a
+    normal form. `partial` is the whole term as far as it had been reduced.
+    """
+    status: str = "interrupted"
+
+    def __init__(self, message: str, partial: Expression, metrics: ReductionMetrics):
+        super().__init__(message)
+        self.partial: Expression = partial
+        self.metrics: ReductionMetrics = metrics
+
+
+class BudgetExceeded(ReductionInterrupted):
+    status: str = "budget_exceeded"
+
+    def __init__(self, budget: str, limit: int, partial: Expression, metrics: ReductionMetrics):
+        super().__init__(f"{budget} budget of {limit} exceeded", partial, metrics)
+        self.budget: str = budget
+        self.limit: int = limit
+
+
+class ReductionCancelled(ReductionInterrupted):
+    status: str = "cancelled"
+
+    def __init__(self, reason: str, partial: Expression, metrics: ReductionMetrics):
+        super().__init__(f"{reason} after {metrics.beta_steps} steps", partial, metrics)
+        self.reason: str = reason
+        self.steps: int = metrics.beta_steps
+
+
+class CycleDetected(ReductionInterrupted):
+    status: str = "cycle"
+
+    def __init__(self, cycle_length: int, partial: Expression, metrics: ReductionMetrics):
+        super().__init__(f"reduction loops, the term repeats every {cycle_length} steps", partial, metrics)
+        self.cycle_length: int = cycle_length
+
+
+class UnboundedGrowth(ReductionInterrupted):
+    status: str = "diverging"
+
+    def __init__(self, steps: int, partial: Expression, metrics: ReductionMetrics):
+        super().__init__(f"term grew on each of the last {steps} steps, to {partial.size} nodes", partial, metrics)
+        self.steps: int = steps
+
+
+@dataclass
+class EvaluationResult:
+    expression: Expression # result of the strategy, or the partially reduced term when the run was stopped
+    metrics: ReductionMetrics
+    status: str = "completed"
+    reason: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        return self.status == "completed"
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "reason": self.reason,
+            "expression": str(self.expression),
+            "metrics": self.metrics.to_dict(),
+        }
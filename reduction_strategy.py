@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class ReductionStrategy(Enum):
+    DEFAULT = "default" # Reduce the head first, reduce the argument only when the head is not an abstraction
+    NORMAL_ORDER = "normal" # Leftmost outermost redex first, to full normal form
+    APPLICATIVE_ORDER = "applicative" # Leftmost innermost redex first, arguments before the call, to full normal form
+    CALL_BY_VALUE = "cbv" # Arguments before the call, stops at weak head normal form (no reduction under fn)
+    CALL_BY_NAME = "cbn" # Arguments passed unevaluated, stops at weak head normal form
+    HEAD_NORMAL_FORM = "hnf" # Reduces the head (also under fn) but leaves arguments untouched
@@ -1,21 +1,77 @@
+import os
 import sys
+import time
+import signal
 import readline # needed for input history
-from lexer import Lexer
-from parser import Parser
 from beta_reduction import Evaluator
 from church_encoding import ChurchNumeral
+from reduction_metrics import EvaluationResult, ReductionInterrupted, ReductionMetrics
+from backends import BACKENDS, SUBSTITUTION
+from normal_form_cache import NormalFormCache
+from cancellation import CancellationToken
+from environment import Environment
+from ast_internal import Definition, Import
+from modules import module_loader
+from reduction_strategy import ReductionStrategy
+from tracing import tracer
+from form_cache import Form, cached_forms, parse_form
+from typing import Iterator, Optional
 
 
 class Repl:
-    def __init__(self, debug: int = 0):
-        self.program_contents: str = ""
+    def __init__(
+        self,
+        debug: int = 0,
+        strategy: ReductionStrategy = ReductionStrategy.DEFAULT,
+        show_metrics: bool = False,
+        max_steps: Optional[int] = None,
+        max_size: Optional[int] = None,
+        cache_entries: Optional[int] = None,
+        backend: str = SUBSTITUTION,
+        detect_divergence: bool = False,
+        timeout: Optional[float] = None
+    ):
         self.debug = debug
+        self.strategy: ReductionStrategy = strategy
+        self.show_metrics: bool = show_metrics
+        self.max_steps: Optional[int] = max_steps
+        self.max_size: Optional[int] = max_size
+        # Shared by every evaluation in the session, so combinators reduced once stay reduced
+        self.cache: Optional[NormalFormCache] = NormalFormCache(cache_entries) if cache_entries else None
+        self.backend: str = backend
+        self.detect_divergence: bool = detect_divergence
+        self.timeout: Optional[float] = timeout # seconds allowed per expression
+        self.cancellation: CancellationToken = CancellationToken()
+        self.environment: Environment = Environment(module_loader, self.evaluator) # definitions made so far in the session
 
     def run_file(self, file_path: str) -> None:
-        with open(file_path, "r") as f:
-            file_contents = f.read()
-        self.program_contents = file_contents
-        self.run(self.program_contents)
+        for _ in self.evaluate_file(file_path):
+            pass
+
+    def evaluate_file(self, file_path: str) -> Iterator[Optional[EvaluationResult]]:
+        # Forms are evaluated and printed one at a time, as they are parsed or
+        # read from the file's .lbdc cache. A form that fails is reported with
+        # its line, as the prompt does, and yields None; the rest still run.
+        directory: str = os.path.dirname(os.path.abspath(file_path))
+        forms = cached_forms(file_path)
+        while True:
+            try:
+                line, form = next(forms)
+            except StopIteration:
+                return
+            except SyntaxError as error:
+                # A character that isn't part of any token: the tokenizer can't go on
+                print(f"Error: {error}")
+                return
+
+            result: Optional[EvaluationResult] = None
+            try:
+                if isinstance(form, SyntaxError):
+                    raise form
+                result = self.execute(form, directory)
+            except Exception as error:
+                print(f"Error at line {line}: {error}")
+            yield result
 
     def run_prompt(self):
         from datetime import datetime
@@ -27,24 +83,89 @@ class Repl:
                 line = input(">>> ")
                 if not line: continue
                 if line.strip() == "(exit)": sys.exit(0)
+                if line.strip() == "(trace on)": tracer.enable(sys.stderr); continue
+                if line.strip() == "(trace off)": tracer.disable(); continue
+                if line.strip() == "(profile)": print(tracer.report()); continue
+                previous_handler = signal.signal(signal.SIGINT, self.interrupt)
                 try:
                     self.run(line)
+                except KeyboardInterrupt:
+                    print("Interrupted")
                 except Exception as e:
                     print(f"{e}") 
+                finally:
+                    signal.signal(signal.SIGINT, previous_handler)
+            except KeyboardInterrupt:
+                print()
             except EOFError:
                 sys.exit(0)
 
-    def run(self, source) -> None:
-        lexer = Lexer(source)
-        lexer.tokenize()
+    def interrupt(self, signum, frame):
+        # The first Ctrl-C asks the evaluator to stop at its next check, a second
+        # one interrupts whatever is running. Other backends never check, so
+        # they are interrupted straight away.
+        if self.cancellation.cancelled or self.backend != SUBSTITUTION:
+            raise KeyboardInterrupt
+        self.cancellation.cancel("interrupted")
 
-        parser = Parser(lexer.get_tokens())
-        parser.parse()
+    def evaluator(self, environment: Optional[Environment] = None) -> Evaluator:
+        # The session's settings, for its own expressions or an imported module's definitions
+        return Evaluator(
+            self.strategy,
+            max_steps=self.max_steps,
+            max_size=self.max_size,
+            cache=self.cache,
+            detect_divergence=self.detect_divergence,
+            cancellation=self.cancellation,
+            timeout=self.timeout,
+            environment=environment if environment is not None else self.environment
+        )
 
-        evaluator = Evaluator()
-        reduced_expression = evaluator.beta_reduce(parser.get_ast()[0])
+    def define(self, definition: Definition) -> EvaluationResult:
+        # The body is reduced once here; uses only expand the stored normal form
+        result = self.evaluator().evaluate(definition.expression)
+        if result.completed:
+            self.environment.define(definition.name, result.expression)
+            print(f"Defined {definition.name}")
+        else:
+            print(f"Stopped: {result.reason}")
+        if self.show_metrics:
+            print(f"Metrics: {result.metrics}")
+        return result
+
+    def run(self, source, line: int = 1, directory: str = ".") -> Optional[EvaluationResult]:
+        return self.execute(parse_form(source, line), directory)
+
+    def execute(self, parsed: Form, directory: str = ".") -> Optional[EvaluationResult]:
+        self.cancellation.reset()
+        if isinstance(parsed, Definition):
+            return self.define(parsed)
+        if isinstance(parsed, Import):
+            # Only recorded here, the module is read when one of its names is used
+            self.environment.add_import(module_loader.resolve(parsed.path, directory))
+            print(f"Imported {parsed.path}")
+            return None
+
+        if self.backend == SUBSTITUTION:
+            result = self.evaluator().evaluate(parsed)
+        else:
+            start = time.perf_counter()
+            try:
+                expression = BACKENDS[self.backend](self.environment.expand_all(parsed), self.max_steps)
+                result = EvaluationResult(expression, ReductionMetrics())
+            except ReductionInterrupted as interrupted:
+                result = EvaluationResult(interrupted.partial, interrupted.metrics, interrupted.status, str(interrupted))
+            result.metrics.wall_time = time.perf_counter() - start
+        reduced_expression = result.expression
 
+        if not result.completed:
+            print(f"Stopped: {result.reason}")
         church_numeral = ChurchNumeral().decode_church_numeral(reduced_expression)
         if isinstance(church_numeral, int):
             print(f"Church numeral: {church_numeral}")
-        print(reduced_expression)
\ No newline at end of file
+        print(reduced_expression)
+        if self.show_metrics:
+            print(f"Metrics: {result.metrics}")
+            if self.cache is not None:
+                print(f"Cache: {self.cache.stats()}")
+        return result
\ No newline at end of file
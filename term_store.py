@@ -0,0 +1,185 @@
+import sys
+import struct
+from array import array
+from typing import Dict, List, Set
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+
+# Node tags
+VARIABLE = 0 # left: name id
+ABSTRACTION = 1 # left: param name id, right: body handle
+APPLICATION = 2 # left, right: handles
+
+_MAGIC: bytes = b"LTS1"
+_HEADER = struct.Struct("<4sBII") # magic, little endian flag, nodes, bytes of the name table
+
+
+class TermStore:
+    """
+    Terms as parallel arrays indexed by integer handles instead of one
+    Python object per node.
+
+    A node is only added after its children, so every child has a smaller
+    handle than its parent and the bulk passes (sizes, free variables) are
+    single bottom-up loops over the arrays. Names are interned into a table
+    and stored as ids. Converting from an Expression keeps its sharing: a
+    subterm object appearing several times is stored once.
+    """
+    def __init__(self):
+        self.tags: array = array("b")
+        self.left: array = array("i")
+        self.right: array = array("i")
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.tags)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.tags, self.left, self.right))
+
+    def intern(self, name: str) -> int:
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def add(self, tag: int, left: int, right: int = -1) -> int:
+        self.tags.append(tag)
+        self.left.append(left)
+        self.right.append(right)
+        return len(self.tags) - 1
+
+    def add_variable(self, name: str) -> int:
+        return self.add(VARIABLE, self.intern(name))
+
+    def add_abstraction(self, param: str, body: int) -> int:
+        return self.add(ABSTRACTION, self.intern(param), body)
+
+    def add_application(self, left: int, right: int) -> int:
+        return self.add(APPLICATION, left, right)
+
+    def from_expression(self, ast: Expression) -> int:
+        # Iterative post-order walk; handles are memoized per node object
+        handles: Dict[int, int] = {}
+        stack: List[Expression] = [ast]
+
+        while stack:
+            node = stack[-1]
+            if id(node) in handles:
+                stack.pop()
+                continue
+            match node:
+                case VariableNode(value):
+                    handles[id(node)] = self.add_variable(value)
+                    stack.pop()
+                case LambdaAbstractionNode(param, body):
+                    if id(body) in handles:
+                        handles[id(node)] = self.add_abstraction(param, handles[id(body)])
+                        stack.pop()
+                    else:
+                        stack.append(body)
+                case LambdaApplicationNode(left, right):
+                    if id(left) in handles and id(right) in handles:
+                        handles[id(node)] = self.add_application(handles[id(left)], handles[id(right)])
+                        stack.pop()
+                    else:
+                        stack.append(left)
+                        stack.append(right)
+                case _:
+                    raise SyntaxError(f"Unknown node type: {node}")
+        return handles[id(ast)]
+
+    def to_expression(self, handle: int) -> Expression:
+        # Children have smaller handles, so building every node up to handle in
+        # order never waits on a missing child
+        tags, left, right, names = self.tags, self.left, self.right, self.names
+        needed: bytearray = self.reachable(handle)
+        nodes: Dict[int, Expression] = {}
+
+        for index in range(handle + 1):
+            if not needed[index]:
+                continue
+            tag = tags[index]
+            if tag == VARIABLE:
+                nodes[index] = VariableNode(names[left[index]])
+            elif tag == ABSTRACTION:
+                nodes[index] = LambdaAbstractionNode(names[left[index]], nodes[right[index]])
+            else:
+                nodes[index] = LambdaApplicationNode(nodes[left[index]], nodes[right[index]])
+        return nodes[handle]
+
+    def reachable(self, handle: int) -> bytearray:
+        # Marks the nodes below handle, walking handles downwards
+        needed = bytearray(handle + 1)
+        needed[handle] = 1
+        tags, left, right = self.tags, self.left, self.right
+        for index in range(handle, -1, -1):
+            if not needed[index]:
+                continue
+            tag = tags[index]
+            if tag == ABSTRACTION:
+                needed[right[index]] = 1
+            elif tag == APPLICATION:
+                needed[left[index]] = 1
+                needed[right[index]] = 1
+        return needed
+
+    def sizes(self) -> array:
+        # Tree size of every node, as Expression.size would count it
+        sizes = array("i", bytes(4 * len(self.tags)))
+        tags, left, right = self.tags, self.left, self.right
+        for index in range(len(tags)):
+            tag = tags[index]
+            if tag == VARIABLE:
+                sizes[index] = 1
+            elif tag == ABSTRACTION:
+                sizes[index] = 1 + sizes[right[index]]
+            else:
+                sizes[index] = 1 + sizes[left[index]] + sizes[right[index]]
+        return sizes
+
+    def free_variable_masks(self) -> List[int]:
+        # Bit n of a node's mask is set when names[n] is free in it
+        masks: List[int] = [0] * len(self.tags)
+        tags, left, right = self.tags, self.left, self.right
+        for index in range(len(tags)):
+            tag = tags[index]
+            if tag == VARIABLE:
+                masks[index] = 1 << left[index]
+            elif tag == ABSTRACTION:
+                masks[index] = masks[right[index]] & ~(1 << left[index])
+            else:
+                masks[index] = masks[left[index]] | masks[right[index]]
+        return masks
+
+    def free_variables(self, handle: int) -> Set[str]:
+        mask: int = self.free_variable_masks()[handle]
+        return {name for name_id, name in enumerate(self.names) if mask >> name_id & 1}
+
+    def to_bytes(self) -> bytes:
+        name_table: bytes = "\0".join(self.names).encode("utf-8")
+        header: bytes = _HEADER.pack(_MAGIC, sys.byteorder == "little", len(self.tags), len(name_table))
+        return header + name_table + self.tags.tobytes() + self.left.tobytes() + self.right.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TermStore":
+        magic, little_endian, count, names_length = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized term store")
+
+        store = cls()
+        offset: int = _HEADER.size
+        name_table: str = data[offset:offset + names_length].decode("utf-8")
+        store.names = name_table.split("\0") if names_length else []
+        store.name_ids = {name: name_id for name_id, name in enumerate(store.names)}
+        offset += names_length
+
+        for column in (store.tags, store.left, store.right):
+            end: int = offset + column.itemsize * count
+            column.frombytes(data[offset:end])
+            if bool(little_endian) != (sys.byteorder == "little"):
+                column.byteswap()
+            offset = end
+        return store
@@ -0,0 +1,44 @@
+import unittest
+from typing import Callable, Iterable, List
+from lexer import Lexer
+from parser import Parser
+from ast_internal import Expression
+from alpha_conversion import AlphaConversion
+from beta_reduction import Evaluator
+
+
+def parse(source: str) -> Expression:
+    lexer = Lexer(source)
+    lexer.tokenize()
+
+    parser = Parser(lexer.get_tokens())
+    parser.parse()
+    return parser.get_ast()[0]
+
+
+TWO: str = "(fn f. fn x. f (f x))"
+THREE: str = "(fn f. fn x. f (f (f x)))"
+
+# Terms every alternative engine must normalize like Evaluator; a test module
+# only adds the cases specific to its engine
+NORMAL_FORM_SOURCES: List[str] = [
+    "x",
+    "fn x.x",
+    "(fn x.x) y",
+    "(fn x. x x) y",
+    "(fn x. fn y. x) y", # the binder has to be renamed
+    "fn z. (fn x. fn y. x y) z",
+    "(fn x. fn y. fn z. x z (y z)) (fn x. fn y. x) (fn x. fn y. x)",
+    "(fn f. fn g. fn x. f (g x)) (fn a. a a) (fn b. b)",
+    f"(fn m. fn n. fn f. fn x. m f (n f x)) {TWO} {THREE}",
+    f"(fn m. fn n. fn f. m (n f)) {TWO} {THREE}",
+]
+
+
+def assert_same_normal_forms(test: unittest.TestCase, evaluate: Callable[[Expression], Expression], sources: Iterable[str] = ()) -> None:
+    # Compares evaluate with Evaluator, up to alpha-equivalence, on the shared
+    # terms followed by sources
+    for source in [*NORMAL_FORM_SOURCES, *sources]:
+        with test.subTest(source):
+            expected = Evaluator().beta_reduce(parse(source))
+            test.assertTrue(AlphaConversion().alpha_equivalent(evaluate(parse(source)), expected))
@@ -0,0 +1,49 @@
+import unittest
+from alpha_conversion import AlphaConversion
+from test.helpers import parse
+
+
+class TestAlphaConversion(unittest.TestCase):
+
+    def test_alpha_convert(self):
+        result = AlphaConversion().alpha_convert(parse("fn x. x y"), "x", "z")
+        self.assertEqual(result, parse("fn z. z y"))
+
+    def test_alpha_equivalent_terms_hash_the_same(self):
+        alpha_conversion = AlphaConversion()
+        pairs = [
+            ("fn x.x", "fn y.y"),
+            ("fn f. fn x. f (f x)", "fn g. fn y. g (g y)"),
+            ("fn x. fn y. x (fn z. z y)", "fn a. fn b. a (fn c. c b)"),
+            ("fn x. fn x. x", "fn y. fn z. z"),
+        ]
+        for first, second in pairs:
+            with self.subTest(first):
+                self.assertEqual(alpha_conversion.alpha_hash(parse(first)), alpha_conversion.alpha_hash(parse(second)))
+                self.assertTrue(alpha_conversion.alpha_equivalent(parse(first), parse(second)))
+
+    def test_different_terms(self):
+        alpha_conversion = AlphaConversion()
+        pairs = [
+            ("fn x. fn y. x", "fn x. fn y. y"),
+            ("fn x. y", "fn x. z"), # free variables keep their names
+            ("fn x. fn x. x", "fn x. fn y. x"),
+            ("x y", "y x"),
+        ]
+        for first, second in pairs:
+            with self.subTest(first):
+                self.assertNotEqual(alpha_conversion.alpha_hash(parse(first)), alpha_conversion.alpha_hash(parse(second)))
+                self.assertFalse(alpha_conversion.alpha_equivalent(parse(first), parse(second)))
+
+    def test_same_object_with_different_binders(self):
+        # Both bodies are the very same node x, bound by different lambdas
+        self.assertFalse(AlphaConversion().alpha_equivalent(parse("fn x. fn y. x"), parse("fn y. fn x. x")))
+
+    def test_hash_is_cached_on_node(self):
+        ast = parse("fn a. fn b. a")
+        value = AlphaConversion().alpha_hash(ast)
+        self.assertEqual(ast._alpha_hash, value)
+
+
+if __name__ == "__main__":
+    unittest.main()
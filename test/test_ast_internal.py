@@ -0,0 +1,69 @@
+import gc
+import pickle
+import unittest
+from ast_internal import VariableNode, LambdaAbstractionNode, LambdaApplicationNode, node_factory
+
+
+class TestAstInternal(unittest.TestCase):
+
+    def test_identical_nodes_are_shared(self):
+        first = LambdaAbstractionNode("x", LambdaApplicationNode(VariableNode("f"), VariableNode("x")))
+        second = LambdaAbstractionNode("x", LambdaApplicationNode(VariableNode("f"), VariableNode("x")))
+
+        self.assertIs(first, second)
+        self.assertEqual(hash(first), hash(second))
+
+    def test_different_nodes_are_not_equal(self):
+        self.assertNotEqual(LambdaAbstractionNode("x", VariableNode("x")), LambdaAbstractionNode("y", VariableNode("y")))
+        self.assertNotEqual(VariableNode("x"), VariableNode("y"))
+
+    def test_nodes_are_immutable(self):
+        node = VariableNode("x")
+        with self.assertRaises(AttributeError):
+            node.value = "y"
+
+    def test_nodes_have_no_instance_dict(self):
+        self.assertFalse(hasattr(VariableNode("x"), "__dict__"))
+
+    def test_match_patterns(self):
+        match LambdaApplicationNode(VariableNode("f"), VariableNode("x")):
+            case LambdaApplicationNode(VariableNode(left), VariableNode(right)):
+                self.assertEqual((left, right), ("f", "x"))
+            case _:
+                self.fail("application pattern did not match")
+
+    def test_pickle_round_trip_keeps_sharing(self):
+        node = LambdaAbstractionNode("x", VariableNode("x"))
+        self.assertIs(pickle.loads(pickle.dumps(node)), node)
+
+    def test_cached_free_variables_size_and_depth(self):
+        node = LambdaAbstractionNode("x", LambdaApplicationNode(VariableNode("f"), LambdaApplicationNode(VariableNode("f"), VariableNode("x"))))
+
+        self.assertEqual(node.free_vars, frozenset({"f"}))
+        self.assertEqual(node.size, 6)
+        self.assertEqual(node.depth, 4)
+        self.assertIs(node.body.free_vars, node.body.right.free_vars) # shared, not rebuilt
+
+    def test_unused_nodes_are_released(self):
+        LambdaAbstractionNode("unused", VariableNode("unused"))
+        gc.collect()
+        self.assertNotIn(("v", "unused"), node_factory.table)
+
+
+    def test_printing(self):
+        term = LambdaAbstractionNode("x", LambdaApplicationNode(VariableNode("f"), VariableNode("x")))
+        self.assertEqual(str(LambdaApplicationNode(term, VariableNode("y"))), "(fn x.LambdaApplicationNode(VariableNode(f), VariableNode(x)) y)")
+        self.assertEqual(repr(term), "LambdaAbstractionNode('x', 'LambdaApplicationNode(VariableNode(f), VariableNode(x))')")
+
+    def test_printing_deep_terms(self):
+        # The body of the Church numeral 5000
+        body = VariableNode("x")
+        for _ in range(5000):
+            body = LambdaApplicationNode(VariableNode("f"), body)
+
+        self.assertEqual(repr(body).count("VariableNode(f)"), 5000)
+        self.assertTrue(str(LambdaAbstractionNode("x", body)).startswith("fn x.LambdaApplicationNode(VariableNode(f), "))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -121,6 +121,14 @@ class TestBetaReduction(unittest.TestCase):
         self.assertEqual(result.body, VariableNode("y"))
         self.assertIsInstance(result.body, VariableNode)
 
+    def test_substitute_shares_untouched_subtrees(self):
+        body = LambdaApplicationNode(VariableNode("x"), LambdaAbstractionNode("y", VariableNode("y")))
+
+        result = Evaluator().substitute("x", body, VariableNode("z"))
+
+        self.assertEqual(result.left, VariableNode("z"))
+        self.assertIs(result.right, body.right)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -143,7 +143,18 @@ class TestChurchNumeral(unittest.TestCase):
 
         church_numeral = ChurchNumeral().decode_church_numeral(evaluator.beta_reduce(result))
         self.assertEqual(church_numeral, 10)
-    
+
+    def test_encode_church_numeral(self):
+        lexer = Lexer("fn f. fn x. f (f (f x))")
+        lexer.tokenize()
+
+        parser = Parser(lexer.get_tokens())
+        parser.parse()
+
+        encoded = ChurchNumeral().encode_church_numeral(3)
+        self.assertIs(encoded, parser.get_ast()[0])
+        self.assertEqual(ChurchNumeral().decode_church_numeral(encoded), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import unittest
+from combinators import BracketAbstraction, GraphReducer
+from church_encoding import ChurchNumeral
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestBracketAbstraction(unittest.TestCase):
+
+    def test_translations(self):
+        cases = {
+            "fn x.x": "I",
+            "fn x.y": "K y",
+            "fn x. f x": "B f I",
+            "fn x. fn y. x": "K",
+            "fn x. x x": "S I I",
+            "fn f. fn g. fn x. f (g x)": "C (B B B) (C B I)",
+            "fn x. fn y. y x": "C I",
+        }
+        for source, expected in cases.items():
+            with self.subTest(source):
+                self.assertEqual(BracketAbstraction().to_string(BracketAbstraction().translate(parse(source))), expected)
+
+    def test_closed_terms_have_no_variables(self):
+        term = BracketAbstraction().translate(parse("fn f. fn x. f (f (f x))"))
+        self.assertEqual(term[-1], frozenset())
+
+
+class TestGraphReducer(unittest.TestCase):
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: GraphReducer().evaluate(ast), [
+            "(fn x. fn y. y) ((fn x. x x) (fn x. x x))",
+        ])
+
+    def test_church_arithmetic(self):
+        plus = "(fn m. fn n. fn f. fn x. m f (n f x))"
+        times = "(fn m. fn n. fn f. m (n f))"
+        three = "(fn f. fn x. f (f (f x)))"
+        result = GraphReducer().evaluate(parse(f"{times} ({plus} {three} {three}) {three}"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 18)
+
+    def test_shared_argument_is_reduced_once(self):
+        # x is used three times, but the argument redex is rewritten in place once
+        reducer = GraphReducer()
+        reducer.evaluate(parse("(fn x. x (x x)) ((fn y. y) z)"))
+        shared = reducer.reductions
+
+        reducer = GraphReducer()
+        reducer.evaluate(parse("(fn x. x (x x)) z"))
+        self.assertEqual(shared - reducer.reductions, 1)
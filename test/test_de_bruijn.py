@@ -0,0 +1,51 @@
+import unittest
+from ast_internal import VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+from church_encoding import ChurchNumeral
+from de_bruijn import (
+    DeBruijnConverter, DeBruijnEvaluator, DeBruijnIndex, DeBruijnFreeVariable,
+    DeBruijnAbstraction, DeBruijnApplication
+)
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestDeBruijn(unittest.TestCase):
+
+    def test_to_de_bruijn(self):
+        term = DeBruijnConverter().to_de_bruijn(parse("fn x. fn y. x y z"))
+
+        expected = DeBruijnAbstraction(DeBruijnAbstraction(DeBruijnApplication(
+            DeBruijnApplication(DeBruijnIndex(1), DeBruijnIndex(0)),
+            DeBruijnFreeVariable("z")
+        )))
+        self.assertEqual(term, expected)
+
+    def test_alpha_equivalent_terms_convert_equal(self):
+        converter = DeBruijnConverter()
+        self.assertEqual(converter.to_de_bruijn(parse("fn x.x")), converter.to_de_bruijn(parse("fn y.y")))
+
+    def test_round_trip(self):
+        converter = DeBruijnConverter()
+        ast = parse("fn f. fn x. f (f x)")
+        self.assertEqual(converter.to_named(converter.to_de_bruijn(ast)), ast)
+
+    def test_avoids_capture(self):
+        result = DeBruijnEvaluator().evaluate(parse("(fn x. (fn y. x)) y"))
+
+        self.assertIsInstance(result, LambdaAbstractionNode)
+        self.assertEqual(result.param, "y1")
+        self.assertEqual(result.body, VariableNode("y"))
+
+    def test_self_application(self):
+        result = DeBruijnEvaluator().evaluate(parse("(fn x. x x) y"))
+        self.assertEqual(result, LambdaApplicationNode(VariableNode("y"), VariableNode("y")))
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: DeBruijnEvaluator().evaluate(ast))
+
+    def test_church_numeral(self):
+        result = DeBruijnEvaluator().evaluate(parse("(fn m. fn n. fn f. m (n f)) (fn f. fn x. f (f x)) (fn f. fn x. f (f (f x)))"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from beta_reduction import Evaluator
+from church_encoding import ChurchNumeral
+from alpha_conversion import AlphaConversion
+from environment import Environment, is_definition_name
+from reduction_strategy import ReductionStrategy
+from test.helpers import parse
+
+
+class TestEnvironment(unittest.TestCase):
+
+    def setUp(self):
+        self.environment = Environment()
+        self.environment.define("ADD", parse("fn m n f x. m f (n f x)"))
+        self.environment.define("TWO", parse("fn f x. f (f x)"))
+
+    def test_definition_names(self):
+        self.assertTrue(is_definition_name("ADD_2"))
+        self.assertFalse(is_definition_name("A"))
+        self.assertFalse(is_definition_name("add"))
+
+    def test_rejects_open_definitions(self):
+        with self.assertRaises(ValueError):
+            self.environment.define("BAD", parse("fn x. y"))
+        self.environment.define("LATER", parse("fn x. UNDEFINED x"))
+        self.assertIn("LATER", self.environment)
+
+    def test_references_are_expanded_by_evaluator(self):
+        evaluator = Evaluator(environment=self.environment)
+        result = evaluator.reduce(parse("ADD TWO TWO"))
+
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 4)
+        self.assertEqual(evaluator.metrics.expansions, 3)
+
+    def test_discarded_reference_is_not_expanded(self):
+        evaluator = Evaluator(ReductionStrategy.NORMAL_ORDER, environment=self.environment)
+        result = evaluator.reduce(parse("(fn a. fn b. b) ADD TWO"))
+
+        self.assertIs(result, self.environment.get("TWO"))
+        self.assertEqual(evaluator.metrics.expansions, 1)
+
+    def test_renamed_binder_is_not_taken_for_a_definition(self):
+        # Renaming X away from the free X must not produce X1, a definition name
+        self.environment.define("X1", parse("fn a. fn b. a"))
+        result = Evaluator(environment=self.environment).reduce(parse("(fn y. fn X. y X) X"))
+
+        self.assertTrue(AlphaConversion().alpha_equivalent(result, parse("fn z. X z")))
+        self.assertEqual(result.free_vars, {"X"})
+
+    def test_expand_all(self):
+        self.assertEqual(self.environment.expand_all(parse("ADD x")), parse("(fn m n f x. m f (n f x)) x"))
+
+    def test_expand_all_leaves_recursive_references(self):
+        self.environment.define("LOOP", parse("fn x. LOOP x"))
+        self.assertEqual(self.environment.expand_all(parse("LOOP")), parse("fn x. LOOP x"))
@@ -0,0 +1,28 @@
+import unittest
+from church_encoding import ChurchNumeral
+from explicit_substitution import ExplicitSubstitutionEvaluator
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestExplicitSubstitution(unittest.TestCase):
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: ExplicitSubstitutionEvaluator().evaluate(ast), [
+            "(fn x. fn y. x y) y",
+            "(fn x. fn y. y) ((fn x. x x) (fn x. x x))",
+        ])
+
+    def test_church_arithmetic(self):
+        plus = "(fn m. fn n. fn f. fn x. m f (n f x))"
+        three = "(fn f. fn x. f (f (f x)))"
+        result = ExplicitSubstitutionEvaluator().evaluate(parse(f"{plus} {three} {three}"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 6)
+
+    def test_discarded_branch_is_not_walked(self):
+        # The substitution of a into the unused branch is dropped without visiting it
+        branch = " ".join(["(a b)"] * 50)
+        evaluator = ExplicitSubstitutionEvaluator()
+        result = evaluator.evaluate(parse(f"(fn a. (fn t. fn f. t) a ({branch})) c"))
+
+        self.assertEqual(result, parse("c"))
+        self.assertLess(evaluator.substitutions_pushed, 10)
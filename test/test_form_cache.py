@@ -0,0 +1,102 @@
+import gc
+import weakref
+import os
+import unittest
+import tempfile
+from unittest import mock
+import form_cache
+from ast_internal import Definition, Import
+from form_cache import FormWriter, FormReader, cache_path, cached_forms
+from test.helpers import parse
+
+
+class TestFormCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "program.lbda")
+        self.write("import \"prelude.lbda\"\ndef TWO = fn f x. f (f x)\n; four\nTWO TWO\n")
+        patcher = mock.patch("sys.dont_write_bytecode", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, contents: str) -> None:
+        with open(self.source, "w") as f:
+            f.write(contents)
+
+    def test_round_trip(self):
+        forms = [
+            (1, Import("prelude.lbda")),
+            (2, Definition("TWO", parse("fn f x. f (f x)"))),
+            (4, parse("fn x. (fn y. y x) (fn y. y x)")),
+        ]
+        writer = FormWriter()
+        for line, form in forms:
+            writer.add_form(line, form)
+
+        self.assertEqual(list(FormReader(writer.to_bytes(bytes(32))).read()), forms)
+
+    def test_shared_subterms_are_stored_once(self):
+        writer = FormWriter()
+        writer.add_form(1, Definition("ID", parse("(fn y. y x) (fn y. y x)")))
+
+        self.assertEqual(writer.node_count, 5) # y, x, y x, fn y. y x, the application
+        self.assertEqual(sorted(writer.names), ["ID", "x", "y"])
+
+    def test_written_forms_are_not_kept_alive(self):
+        writer = FormWriter()
+        form = parse("fn unique_name. unique_name")
+        writer.add_form(1, form)
+        released = weakref.ref(form)
+        del form
+        gc.collect()
+
+        self.assertIsNone(released())
+
+    def test_forms_are_read_one_at_a_time(self):
+        writer = FormWriter()
+        writer.add_form(1, parse("fn x. x"))
+        writer.add_form(2, parse("fn y. y y"))
+        data = writer.to_bytes(bytes(32))
+
+        reader = FormReader(data)
+        forms = reader.read()
+        self.assertEqual(next(forms), (1, parse("fn x. x")))
+        self.assertLess(reader.position, len(data))
+        self.assertEqual(next(forms), (2, parse("fn y. y y")))
+
+    def test_damaged_cache_falls_back_to_the_source(self):
+        parsed = list(cached_forms(self.source))
+        with open(cache_path(self.source), "r+b") as f:
+            f.truncate(os.path.getsize(cache_path(self.source)) - 3)
+
+        self.assertEqual(list(cached_forms(self.source)), parsed)
+
+    def test_cache_is_used_for_unchanged_source(self):
+        parsed = list(cached_forms(self.source))
+        self.assertTrue(os.path.isfile(cache_path(self.source)))
+
+        with mock.patch.object(form_cache, "TokenStream") as token_stream, mock.patch.object(form_cache, "Parser") as parser:
+            self.assertEqual(list(cached_forms(self.source)), parsed)
+        token_stream.assert_not_called()
+        parser.assert_not_called()
+        self.assertEqual([line for line, _ in parsed], [1, 2, 4])
+
+    def test_changed_source_is_parsed_again(self):
+        list(cached_forms(self.source))
+        self.write("fn x. x\n")
+
+        self.assertEqual(list(cached_forms(self.source)), [(1, parse("fn x. x"))])
+
+    def test_cache_is_not_written_when_bytecode_is_disabled(self):
+        with mock.patch("sys.dont_write_bytecode", True):
+            list(cached_forms(self.source))
+
+        self.assertFalse(os.path.exists(cache_path(self.source)))
+
+
+if __name__ == "__main__":
+    unittest.main()
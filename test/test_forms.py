@@ -0,0 +1,73 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from typing import List, Tuple
+from repl import Repl
+from token_stream import TokenStream
+
+
+def split(source: str) -> List[Tuple[int, List[str]]]:
+    return [(line, [token.lexeme for token in tokens]) for line, tokens in TokenStream(source.encode("utf-8")).forms()]
+
+
+class TestForms(unittest.TestCase):
+
+    def test_one_form_per_line(self):
+        source = "a ; variable\n\nfn x.x\n; comment\n(x y)\n"
+        self.assertEqual(split(source), [(1, ["a"]), (3, ["fn", "x", ".", "x"]), (5, ["(", "x", "y", ")"])])
+
+    def test_continuation_lines(self):
+        source = "(fn x.\n x)\ny\nfn f.\n  f f\nz"
+        self.assertEqual([line for line, _ in split(source)], [1, 3, 4, 6])
+        self.assertEqual(split(source)[2], (4, ["fn", "f", ".", "f", "f"]))
+
+    def test_parentheses_in_comments_and_strings_are_ignored(self):
+        self.assertEqual([line for line, _ in split("a ; (\nb\n")], [1, 2])
+        self.assertEqual([line for line, _ in split('import "a(b.lbda"\nb\n')], [1, 2])
+
+    def test_is_lazy(self):
+        forms = TokenStream(b"a\nb\n$").forms()
+        self.assertEqual(next(forms)[0], 1)
+        with self.assertRaises(SyntaxError):
+            next(forms)
+
+    def test_evaluate_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".lbda", delete=False) as f:
+            f.write("(fn x. x) a\n\n; comment\n(fn x. fn y. x)\n  b c\n")
+        try:
+            with redirect_stdout(io.StringIO()) as output:
+                results = list(Repl().evaluate_file(f.name))
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual([str(result.expression) for result in results], ["a", "b"])
+        self.assertEqual(output.getvalue(), "a\nb\n")
+
+    def test_errors_report_the_line_in_the_file(self):
+        # Blank and comment lines inside a form still count, and the forms
+        # after a failing one are still run
+        output = self.evaluate("a\n(fn x.\n\n  ; comment\n  x\n\n  ; another\n  ) )\nb\n" + "(fn n f x. f (n f x)) 3000\n")
+
+        self.assertIn("Error at line 2: Unexpected ')' after the end of the expression at line: 8, column: 5", output)
+        self.assertTrue(output.startswith("a\nError at line 2"))
+        self.assertIn("\nb\nChurch numeral: 3001\n", output)
+
+    def test_evaluation_errors_are_reported_per_form(self):
+        output = self.evaluate('import "missing.lbda"\na\n')
+        self.assertTrue(output.startswith("Error at line 1: No module file missing.lbda"))
+        self.assertTrue(output.endswith("\na\n"))
+
+    def test_unknown_character_stops_the_file(self):
+        self.assertEqual(self.evaluate("a\nb $\nc\n"), "a\nError: something went wrong during scanning: Unknown character: $ at line: 2\n")
+
+    def evaluate(self, source: str) -> str:
+        with tempfile.NamedTemporaryFile("w", suffix=".lbda", delete=False) as f:
+            f.write(source)
+        try:
+            with redirect_stdout(io.StringIO()) as output:
+                list(Repl().evaluate_file(f.name))
+        finally:
+            os.unlink(f.name)
+        return output.getvalue()
@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+from ast_internal import VariableNode, LambdaApplicationNode
+from church_encoding import ChurchNumeral
+from g_machine import GMachine, LambdaLifter, MAIN, PUSH, PUSHGLOBAL, MKAP, UPDATE, POP, UNWIND
+from test import test_beta_reduction, test_church_numeral
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestBetaReductionOnGMachine(test_beta_reduction.TestBetaReduction):
+    # Runs the Evaluator tests with GMachine standing in for Evaluator
+
+    def run(self, result=None):
+        with mock.patch.object(test_beta_reduction, "Evaluator", GMachine):
+            return super().run(result)
+
+    @unittest.skip("substitute is specific to Evaluator")
+    def test_substitute_shares_untouched_subtrees(self):
+        pass
+
+
+class TestChurchNumeralOnGMachine(test_church_numeral.TestChurchNumeral):
+
+    def run(self, result=None):
+        with mock.patch.object(test_church_numeral, "Evaluator", GMachine):
+            return super().run(result)
+
+
+class TestLambdaLifter(unittest.TestCase):
+
+    def test_lifts_chains_with_captured_variables(self):
+        supercombinators = LambdaLifter().lift_program(parse("fn x. fn y. (fn z. x z) y"))
+
+        self.assertEqual(supercombinators[MAIN].body, VariableNode("$0"))
+        self.assertEqual(supercombinators["$0"].params, ["x", "y"])
+        self.assertEqual(supercombinators["$0"].body, LambdaApplicationNode(LambdaApplicationNode(VariableNode("$1"), VariableNode("x")), VariableNode("y")))
+        self.assertEqual(supercombinators["$1"].params, ["x", "z"])
+
+    def test_program_free_variables_are_not_captured(self):
+        supercombinators = LambdaLifter().lift_program(parse("fn x. y x"))
+        self.assertEqual(supercombinators["$0"].params, ["x"])
+
+
+class TestGMachine(unittest.TestCase):
+
+    def test_compiled_code(self):
+        machine = GMachine()
+        machine.load(parse("fn f. fn x. f x"))
+        self.assertEqual(machine.globals["$0"].left.code, [(PUSH, 1), (PUSH, 1), (MKAP, None), (UPDATE, 2), (POP, 2), (UNWIND, None)])
+        self.assertEqual(machine.globals[MAIN].left.code, [(PUSHGLOBAL, "$0"), (UPDATE, 0), (POP, 0), (UNWIND, None)])
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: GMachine().evaluate(ast), [
+            "fn x. fn x. x",
+            "y (fn y. fn x. y)",
+            "(fn x. fn y. y) ((fn x. x x) (fn x. x x))",
+        ])
+
+    def test_church_arithmetic(self):
+        plus = "(fn m. fn n. fn f. fn x. m f (n f x))"
+        times = "(fn m. fn n. fn f. m (n f))"
+        three = "(fn f. fn x. f (f (f x)))"
+        result = GMachine().evaluate(parse(f"{times} ({plus} {three} {three}) {three}"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 18)
+
+    def test_shared_argument_is_evaluated_once(self):
+        machine = GMachine()
+        machine.evaluate(parse("(fn x. x (x x)) ((fn y. y) z)"))
+        self.assertEqual(machine.profile()["UPDATE"], 3) # main, the outer redex and the argument once
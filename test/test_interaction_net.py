@@ -0,0 +1,43 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from alpha_conversion import AlphaConversion
+from beta_reduction import Evaluator
+from interaction_net import InteractionNet, UnsupportedTerm
+from reduction_metrics import BudgetExceeded
+from repl import Repl
+from test.helpers import TWO, THREE, parse, assert_same_normal_forms
+
+
+
+class TestInteractionNet(unittest.TestCase):
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: InteractionNet().evaluate(ast))
+
+    def test_shared_redex_is_reduced_once(self):
+        net = InteractionNet()
+        result = net.evaluate(parse("(fn f. f (f (f (f y)))) ((fn a. fn b. b) c)"))
+        self.assertTrue(AlphaConversion().alpha_equivalent(result, parse("y")))
+
+        evaluator = Evaluator()
+        evaluator.beta_reduce(parse("(fn f. f (f (f (f y)))) ((fn a. fn b. b) c)"))
+        self.assertLess(net.beta_steps, evaluator.beta_steps)
+
+    def test_nested_sharing_is_rejected(self):
+        # Each of these would need the oracle to read back correctly
+        for source in [f"(fn x. x x) {TWO}", f"{TWO} {TWO}", f"{THREE} {THREE}", "(fn x. x x) (fn x. x x)"]:
+            with self.subTest(source):
+                net = InteractionNet()
+                with self.assertRaises(UnsupportedTerm):
+                    net.evaluate(parse(source))
+                self.assertEqual(net.interactions, 0)
+
+    def test_interaction_budget(self):
+        with self.assertRaises(BudgetExceeded):
+            InteractionNet(max_interactions=3).evaluate(parse(f"(fn m. fn n. fn f. m (n f)) {THREE} {THREE}"))
+
+    def test_session_step_budget(self):
+        with redirect_stdout(io.StringIO()):
+            result = Repl(backend="interaction-net", max_steps=3).run(f"(fn m. fn n. fn f. m (n f)) {THREE} {THREE}")
+        self.assertEqual(result.status, "budget_exceeded")
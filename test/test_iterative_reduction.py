@@ -0,0 +1,40 @@
+import unittest
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+from church_encoding import ChurchNumeral
+from iterative_reduction import IterativeEvaluator
+from test.helpers import parse, assert_same_normal_forms
+
+
+def church_numeral(n: int) -> Expression:
+    body: Expression = VariableNode("x")
+    for _ in range(n):
+        body = LambdaApplicationNode(VariableNode("f"), body)
+    return LambdaAbstractionNode("f", LambdaAbstractionNode("x", body))
+
+
+class TestIterativeReduction(unittest.TestCase):
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: IterativeEvaluator().beta_reduce(ast), [
+            "(fn x. fn y. y x) y z (fn y. y)",
+            "(fn m. fn n. n m) (fn f. fn x. f (f x)) (fn f. fn x. f (f (f x)))",
+        ])
+
+    def test_capture_avoiding_rename(self):
+        result = IterativeEvaluator().beta_reduce(parse("(fn x. (fn y. x)) y"))
+
+        self.assertIsInstance(result, LambdaAbstractionNode)
+        self.assertEqual(result.param, "y1")
+        self.assertEqual(result.body, VariableNode("y"))
+
+    def test_deep_church_numeral(self):
+        # Deep enough to exceed the default recursion limit of the recursive evaluator
+        add = parse("fn m. fn n. fn f. fn x. m f (n f x)")
+        ast = LambdaApplicationNode(LambdaApplicationNode(add, church_numeral(3000)), church_numeral(2000))
+
+        result = IterativeEvaluator().beta_reduce(ast)
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from church_encoding import ChurchNumeral
+from lazy_machine import LazyMachine
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestLazyMachine(unittest.TestCase):
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: LazyMachine().evaluate(ast))
+
+    def test_argument_is_evaluated_once(self):
+        machine = LazyMachine()
+        result = machine.evaluate(parse("(fn x. fn f. f x x x) ((fn y. y) z)"))
+
+        self.assertEqual(result, parse("fn f. f z z z"))
+        self.assertEqual(machine.beta_steps, 2) # the identity application is shared by all three uses
+
+    def test_unused_argument_is_never_evaluated(self):
+        machine = LazyMachine()
+        result = machine.evaluate(parse("(fn x. fn y. y) ((fn x. x x) (fn x. x x))"))
+
+        self.assertEqual(result, parse("fn y.y"))
+        self.assertEqual(machine.thunks_forced, 0)
+
+    def test_church_numeral(self):
+        result = LazyMachine().evaluate(parse("(fn m. fn n. n m) (fn f. fn x. f (f x)) (fn f. fn x. f (f (f x)))"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
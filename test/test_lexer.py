@@ -111,5 +111,86 @@ class TestLexer(unittest.TestCase):
                 self.assertEqual(expected_tokens[index].token_type.name, token.token_type)
                 self.assertEqual(expected_tokens[index].lexeme, token.lexeme)
 
+    def test_definition(self):
+        lexer = Lexer("def ADD_2 = fn x. X")
+        lexer.tokenize()
+        tokens: List[Token] = lexer.get_tokens()
+
+        self.assertEqual(
+            [(token.token_type, token.lexeme) for token in tokens],
+            [
+                (TokenType.DEF.name, "def"),
+                (TokenType.NAME.name, "ADD_2"),
+                (TokenType.EQUALS.name, "="),
+                (TokenType.LAMBDA.name, "fn"),
+                (TokenType.VARIABLE.name, "x"),
+                (TokenType.DOT.name, "."),
+                (TokenType.VARIABLE.name, "X"),
+            ]
+        )
+
+    def test_starting_line(self):
+        lexer = Lexer("x\ny", 7)
+        lexer.tokenize()
+        tokens: List[Token] = lexer.get_tokens()
+
+        self.assertEqual([token.line for token in tokens], [7, 8])
+
+    def test_import(self):
+        lexer = Lexer('import "prelude.lbda"')
+        lexer.tokenize()
+        tokens: List[Token] = lexer.get_tokens()
+
+        self.assertEqual(
+            [(token.token_type, token.lexeme) for token in tokens],
+            [(TokenType.IMPORT.name, "import"), (TokenType.STRING.name, '"prelude.lbda"')]
+        )
+
+    def test_unterminated_string(self):
+        with self.assertRaises(SyntaxError):
+            Lexer('import "prelude.lbda').tokenize()
+
+    def test_identifiers_and_numbers(self):
+        lexer = Lexer("fn acc x1. ADD Ab 12")
+        lexer.tokenize()
+        tokens: List[Token] = lexer.get_tokens()
+
+        self.assertEqual(
+            [(token.token_type, token.lexeme) for token in tokens],
+            [
+                (TokenType.LAMBDA.name, "fn"),
+                (TokenType.VARIABLE.name, "acc"),
+                (TokenType.VARIABLE.name, "x1"),
+                (TokenType.DOT.name, "."),
+                (TokenType.NAME.name, "ADD"),
+                (TokenType.VARIABLE.name, "Ab"),
+                (TokenType.NUMBER.name, "12"),
+            ]
+        )
+
+    def test_unknown_character(self):
+        with self.assertRaises(SyntaxError):
+            Lexer("x $ y").tokenize()
+        with self.assertRaises(SyntaxError):
+            list(Lexer("x $ y").scan())
+
+    def test_scan_matches_tokenize(self):
+        sources = [
+            "",
+            "; only a comment",
+            "fn x. x ; trailing comment",
+            "def ADD_2 = fn m n f x. m f (n f x)\n  (ADD_2 12)\r\n",
+            'import "lib/prelude.lbda" ; "quoted"',
+            "x\t(fn y1.\n\n   y1 x)   ",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                lexer = Lexer(source, 4)
+                lexer.tokenize()
+                self.assertEqual(
+                    [(token.token_type, token.lexeme, token.line, token.column) for token in Lexer(source, 4).scan()],
+                    [(token.token_type, token.lexeme, token.line, token.column) for token in lexer.get_tokens()]
+                )
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
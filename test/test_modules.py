@@ -0,0 +1,125 @@
+import io
+import os
+import unittest
+import tempfile
+from contextlib import redirect_stdout
+from beta_reduction import Evaluator
+from church_encoding import ChurchNumeral
+from environment import Environment
+from modules import ModuleLoader
+from repl import Repl
+from test.helpers import parse
+
+
+class TestModules(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.loader = ModuleLoader()
+        os.mkdir(os.path.join(self.directory.name, "lib"))
+        self.write("lib/numbers.lbda", "def TWO = fn f x. f (f x)\n")
+        self.write("lib/prelude.lbda", 'import "numbers.lbda"\ndef ADD = fn m n f x. m f (n f x)\ndef FOUR = ADD TWO TWO\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, contents: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        return path
+
+    def test_imports_resolve_relative_to_the_importing_file(self):
+        prelude = self.loader.resolve("lib/prelude.lbda", self.directory.name)
+        module = self.loader.load(prelude)
+
+        self.assertEqual(ChurchNumeral().decode_church_numeral(module.definitions["FOUR"]), 4)
+        self.assertIn("TWO", module.definitions) # imported names are visible to importers too
+
+    def test_missing_module(self):
+        with self.assertRaises(ImportError):
+            self.loader.resolve("missing.lbda", self.directory.name)
+
+    def test_modules_are_cached_until_modified(self):
+        path = self.loader.resolve("lib/numbers.lbda", self.directory.name)
+        first = self.loader.load(path)
+        self.assertIs(self.loader.load(path), first)
+        self.assertEqual(self.loader.loads, 1)
+
+        self.write("lib/numbers.lbda", "def TWO = fn f x. f (f x)\ndef ONE = fn f x. f x\n")
+        os.utime(path, ns=(first.mtime + 1, first.mtime + 1))
+        self.assertIn("ONE", self.loader.load(path).definitions)
+        self.assertEqual(self.loader.loads, 2)
+
+    def test_modules_load_on_first_reference(self):
+        environment = Environment(self.loader)
+        environment.add_import(self.loader.resolve("lib/prelude.lbda", self.directory.name))
+        self.assertEqual(self.loader.loads, 0)
+
+        result = Evaluator(environment=environment).reduce(parse("ADD FOUR FOUR"))
+
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 8)
+        self.assertEqual(self.loader.loads, 2)
+
+    def test_local_definitions_take_precedence(self):
+        environment = Environment(self.loader)
+        environment.define("TWO", parse("fn f x. f x"))
+        environment.add_import(self.loader.resolve("lib/numbers.lbda", self.directory.name))
+
+        self.assertEqual(environment.expand_all(parse("TWO")), parse("fn f x. f x"))
+
+    def test_imports_are_reexported_whatever_their_position(self):
+        for source in ('def ID = fn x. x\nimport "lib/numbers.lbda"\n', 'import "lib/numbers.lbda"\ndef ID = fn x. x\n'):
+            with self.subTest(source=source):
+                environment = Environment(self.loader)
+                environment.add_import(self.loader.resolve(self.write("a.lbda", source), self.directory.name))
+
+                result = Evaluator(environment=environment).reduce(parse("ID TWO"))
+                self.assertEqual(ChurchNumeral().decode_church_numeral(result), 2)
+
+    def test_module_is_reloaded_when_a_dependency_changes(self):
+        prelude = self.loader.resolve("lib/prelude.lbda", self.directory.name)
+        numbers = self.loader.resolve("lib/numbers.lbda", self.directory.name)
+        first = self.loader.load(prelude)
+
+        self.write("lib/numbers.lbda", "def TWO = fn f x. f (f (f x))\n")
+        mtime = self.loader.modules[numbers].mtime + 1
+        os.utime(numbers, ns=(mtime, mtime))
+        self.loader.load(numbers) # reloaded through another import first
+
+        self.assertEqual(ChurchNumeral().decode_church_numeral(self.loader.load(prelude).definitions["FOUR"]), 6)
+        self.assertIsNot(self.loader.load(prelude), first)
+
+    def test_modules_importing_each_other(self):
+        self.write("a.lbda", 'import "b.lbda"\ndef A_1 = fn x. x\n')
+        self.write("b.lbda", 'import "a.lbda"\ndef B_1 = fn x. x\n')
+        environment = Environment(self.loader)
+        environment.add_import(self.loader.resolve("a.lbda", self.directory.name))
+
+        self.assertIn("B_1", environment)
+        self.assertNotIn("C_1", environment)
+
+    def test_imported_definitions_get_the_session_limits(self):
+        path = self.write("loop.lbda", "def LOOP = (fn x. x x) (fn x. x x)\n")
+        repl = Repl(max_steps=1000)
+        with redirect_stdout(io.StringIO()):
+            repl.run(f'import "{path}"')
+            with self.assertRaisesRegex(ImportError, "LOOP at line 1 stopped, step budget of 1000 exceeded"):
+                repl.run("LOOP")
+
+    def test_syntax_error_fails_the_import(self):
+        path = self.write("broken.lbda", "def ONE = fn f x. f x\ndef TWO = )\n")
+        with self.assertRaisesRegex(ImportError, "line 2"):
+            self.loader.load(path)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "__pycache__", "broken.lbdc")))
+
+    def test_circular_import(self):
+        self.write("a.lbda", 'import "b.lbda"\ndef A_1 = B_1\n')
+        self.write("b.lbda", 'import "a.lbda"\ndef B_1 = A_1\n')
+
+        with self.assertRaises(ImportError):
+            self.loader.load(self.loader.resolve("a.lbda", self.directory.name))
+
+
+if __name__ == "__main__":
+    unittest.main()
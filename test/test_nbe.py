@@ -0,0 +1,34 @@
+import unittest
+from ast_internal import VariableNode, LambdaAbstractionNode
+from church_encoding import ChurchNumeral
+from nbe import NbeEvaluator
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestNbe(unittest.TestCase):
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: NbeEvaluator().normalize(ast))
+
+    def test_keeps_parameter_names(self):
+        self.assertEqual(NbeEvaluator().normalize(parse("fn f. fn x. f x")), parse("fn f. fn x. f x"))
+
+    def test_avoids_capture(self):
+        result = NbeEvaluator().normalize(parse("(fn x. (fn y. x)) y"))
+
+        self.assertIsInstance(result, LambdaAbstractionNode)
+        self.assertEqual(result.param, "y1")
+        self.assertEqual(result.body, VariableNode("y"))
+
+    def test_church_arithmetic(self):
+        result = NbeEvaluator().normalize(parse("(fn m. fn n. n m) (fn f. fn x. f (f (f x))) (fn f. fn x. f (f (f x)))"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 27)
+
+    def test_compiled_term_is_reusable(self):
+        evaluator = NbeEvaluator()
+        compiled = evaluator.compile(parse("fn f. fn x. f (f x)"))
+        self.assertIs(evaluator.read_back(compiled(None), set()), evaluator.read_back(compiled(None), set()))
+
+
+if __name__ == "__main__":
+    unittest.main()
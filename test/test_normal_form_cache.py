@@ -0,0 +1,68 @@
+import unittest
+from alpha_conversion import AlphaConversion
+from beta_reduction import Evaluator
+from church_encoding import ChurchNumeral
+from normal_form_cache import NormalFormCache
+from reduction_strategy import ReductionStrategy
+from test.helpers import parse
+
+
+class TestNormalFormCache(unittest.TestCase):
+
+    def test_repeated_closed_subterm_is_reduced_once(self):
+        two_times_two = "((fn m. fn n. fn f. m (n f)) (fn f. fn x. f (f x)) (fn f. fn x. f (f x)))"
+        source = f"(fn a. fn b. fn f. fn x. a f (b f x)) {two_times_two} {two_times_two}"
+
+        uncached = Evaluator()
+        expected = uncached.reduce(parse(source))
+
+        cache = NormalFormCache()
+        cached = Evaluator(cache=cache)
+        result = cached.reduce(parse(source))
+
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 8)
+        self.assertEqual(result, expected)
+        self.assertGreater(cache.hits, 0)
+        self.assertLess(cached.beta_steps, uncached.beta_steps)
+
+    def test_alpha_equivalent_terms_share_an_entry(self):
+        cache = NormalFormCache()
+        Evaluator(cache=cache).reduce(parse("(fn x. x) (fn y. y)"))
+        result = Evaluator(cache=cache).reduce(parse("(fn a. a) (fn b. b)"))
+
+        self.assertEqual(cache.hits, 1)
+        self.assertTrue(AlphaConversion().alpha_equivalent(result, parse("fn z. z")))
+
+    def test_open_terms_are_not_cached(self):
+        cache = NormalFormCache()
+        Evaluator(cache=cache).reduce(parse("(fn x. x) y"))
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(ValueError):
+            cache.store(parse("(fn x. x) y"), parse("y"))
+
+    def test_lru_eviction(self):
+        cache = NormalFormCache(max_entries=2)
+        for source in ("(fn x. x) (fn a. a)", "(fn x. x) (fn a. fn b. a)", "(fn x. x) (fn a. fn b. b)"):
+            Evaluator(cache=cache).reduce(parse(source))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.lookup(parse("(fn x. x) (fn a. a)")))
+
+    def test_node_bound(self):
+        cache = NormalFormCache(max_nodes=12)
+        Evaluator(cache=cache).reduce(parse("(fn x. x) (fn a. a)"))
+        Evaluator(cache=cache).reduce(parse("(fn x. x) (fn a. fn b. a)"))
+
+        self.assertLessEqual(cache.nodes, 12)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_normal_order_uses_cache(self):
+        cache = NormalFormCache()
+        evaluator = Evaluator(ReductionStrategy.NORMAL_ORDER, cache=cache)
+        evaluator.reduce(parse("(fn x. fn y. x y) ((fn z. z) (fn w. w))"))
+        self.assertGreater(cache.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ from token_internal import Token
 from token_type import TokenType
 from lexer import Lexer
 from parser import Parser
-from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode
+from ast_internal import Expression, VariableNode, LambdaAbstractionNode, LambdaApplicationNode, Definition, Import
 
 
 class TestParser(unittest.TestCase):
@@ -96,6 +96,62 @@ class TestParser(unittest.TestCase):
         self.assertEqual(ast[0].left.body.value, "x")
         self.assertEqual(ast[0].right.body.value, "y")
 
+    def test_definition_parser(self):
+        source = "def ID = fn x.x"
+
+        lexer = Lexer(source)
+        lexer.tokenize()
+
+        parser = Parser(lexer.get_tokens())
+        parser.parse()
+        ast: List = parser.get_ast()
+
+        self.assertIsInstance(ast[0], Definition)
+        self.assertEqual(ast[0].name, "ID")
+        self.assertEqual(ast[0].expression, LambdaAbstractionNode("x", VariableNode("x")))
+
+    def test_definition_reference_parser(self):
+        lexer = Lexer("ID y")
+        lexer.tokenize()
+
+        parser = Parser(lexer.get_tokens())
+        parser.parse()
+
+        self.assertEqual(parser.get_ast()[0], LambdaApplicationNode(VariableNode("ID"), VariableNode("y")))
+
+    def test_definition_name_is_not_a_parameter(self):
+        lexer = Lexer("fn ID. ID")
+        lexer.tokenize()
+
+        with self.assertRaises(SyntaxError):
+            Parser(lexer.get_tokens()).parse()
+
+    def test_number_parser(self):
+        lexer = Lexer("fn f. 2 f")
+        lexer.tokenize()
+
+        parser = Parser(lexer.get_tokens())
+        parser.parse()
+
+        two = LambdaAbstractionNode("f", LambdaAbstractionNode("x", LambdaApplicationNode(VariableNode("f"), LambdaApplicationNode(VariableNode("f"), VariableNode("x")))))
+        self.assertEqual(parser.get_ast()[0], LambdaAbstractionNode("f", LambdaApplicationNode(two, VariableNode("f"))))
+
+    def test_number_is_not_a_parameter(self):
+        lexer = Lexer("fn 1. x")
+        lexer.tokenize()
+
+        with self.assertRaises(SyntaxError):
+            Parser(lexer.get_tokens()).parse()
+
+    def test_import_parser(self):
+        lexer = Lexer('import "lib/prelude.lbda"')
+        lexer.tokenize()
+
+        parser = Parser(lexer.get_tokens())
+        parser.parse()
+
+        self.assertEqual(parser.get_ast()[0], Import("lib/prelude.lbda"))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
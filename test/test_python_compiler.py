@@ -0,0 +1,60 @@
+import gc
+import unittest
+from ast_internal import VariableNode, LambdaAbstractionNode
+from alpha_conversion import AlphaConversion
+from church_encoding import ChurchNumeral
+from python_compiler import PythonCompiler
+from test.helpers import parse, assert_same_normal_forms
+
+
+class TestPythonCompiler(unittest.TestCase):
+
+    def test_generated_source(self):
+        source = PythonCompiler().generate_source(parse("fn f. fn x. f (f x)"))
+
+        self.assertIn("def _lambda_2(v_f):", source)
+        self.assertIn("    def _closure(v_x, param='x'):", source)
+        self.assertIn("_t3 = v_f(v_x)", source)
+        compile(source, "<test>", "exec")
+
+    def test_deeply_nested_abstractions(self):
+        depth = 300
+        source = "".join(f"fn x{index}. " for index in range(depth)) + " ".join(f"x{index}" for index in range(0, depth, 50))
+        ast = parse(source)
+
+        generated = PythonCompiler().generate_source(ast)
+        self.assertLessEqual(max(len(line) - len(line.lstrip()) for line in generated.splitlines()), 8)
+        self.assertTrue(AlphaConversion().alpha_equivalent(PythonCompiler().normalize(ast), ast))
+
+    def test_same_normal_forms_as_evaluator(self):
+        assert_same_normal_forms(self, lambda ast: PythonCompiler().normalize(ast))
+
+    def test_code_is_compiled_once(self):
+        compiler = PythonCompiler()
+        ast = parse("fn m. fn n. fn f. fn x. m f (n f x)")
+        self.assertIs(compiler.compile(ast), compiler.compile(ast))
+
+    def test_repeated_application(self):
+        compiler = PythonCompiler()
+        add = compiler.compile(parse("fn m. fn n. fn f. fn x. m f (n f x)"))
+        church = ChurchNumeral()
+
+        for m, n in [(0, 0), (2, 3), (10, 7)]:
+            with self.subTest((m, n)):
+                result = add(church.encode_church_numeral(m), church.encode_church_numeral(n))
+                self.assertEqual(church.decode_church_numeral(result), m + n)
+
+    def test_long_application_chain(self):
+        # Applications become statements, so this doesn't hit Python's nesting limits
+        result = PythonCompiler().normalize(ChurchNumeral().encode_church_numeral(400))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result), 400)
+
+    def test_cache_releases_unused_terms(self):
+        compiler = PythonCompiler()
+        compiler.compile(LambdaAbstractionNode("unused", VariableNode("unused")))
+        gc.collect()
+        self.assertEqual(len(compiler.compiled), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import io
+import sys
+import signal
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+from beta_reduction import Evaluator
+from reduction_metrics import BudgetExceeded, ReductionCancelled
+from cancellation import CancellationToken
+from church_encoding import ChurchNumeral
+from reduction_strategy import ReductionStrategy
+from repl import Repl
+import main
+from test.helpers import parse
+
+
+class TestReductionMetrics(unittest.TestCase):
+
+    def test_counts(self):
+        result = Evaluator().evaluate(parse("(fn x. (fn y. x)) y"))
+
+        self.assertTrue(result.completed)
+        self.assertEqual(result.metrics.beta_steps, 1)
+        self.assertGreaterEqual(result.metrics.alpha_renamings, 1)
+        self.assertEqual(result.metrics.fresh_names, 1)
+        self.assertGreaterEqual(result.metrics.substitutions, 2)
+        self.assertGreater(result.metrics.wall_time, 0)
+
+    def test_peak_size_and_depth(self):
+        result = Evaluator().evaluate(parse("fn a. (fn x. x x x) (y y)"))
+
+        self.assertEqual(result.metrics.peak_term_size, 12) # fn a. (y y) (y y) (y y)
+        self.assertEqual(result.metrics.peak_depth, 5)
+
+    def test_cancellation(self):
+        token = CancellationToken()
+        token.cancel()
+        result = Evaluator(cancellation=token).evaluate(parse("fn a. (fn x. x x) (fn x. x x)"))
+
+        self.assertEqual(result.status, "cancelled")
+        self.assertEqual(result.metrics.beta_steps, 0)
+        self.assertEqual(result.expression, parse("fn a. (fn x. x x) (fn x. x x)"))
+
+    def test_timeout(self):
+        with self.assertRaises(ReductionCancelled) as raised:
+            Evaluator(timeout=0).reduce(parse("(fn x. x x) (fn x. x x)"))
+
+        self.assertIn("timed out", str(raised.exception))
+        self.assertEqual(raised.exception.steps, 0)
+        self.assertEqual(raised.exception.partial, parse("(fn x. x x) (fn x. x x)"))
+
+    def test_timeout_stops_divergent_term(self):
+        result = Evaluator(timeout=0.2).evaluate(parse("(fn x. x x) (fn x. x x)"))
+
+        self.assertEqual(result.status, "cancelled")
+        self.assertIn("timed out", result.reason)
+        self.assertGreater(result.metrics.beta_steps, sys.getrecursionlimit())
+        self.assertEqual(result.expression, parse("(fn x. x x) (fn x. x x)"))
+
+    def test_cancellation_is_polled_periodically(self):
+        token = CancellationToken()
+        evaluator = Evaluator(cancellation=token)
+        original_substitute = evaluator.substitute
+
+        def substitute(*args):
+            if evaluator.metrics.beta_steps == 10:
+                token.cancel("stop requested")
+            return original_substitute(*args)
+
+        evaluator.substitute = substitute
+        result = evaluator.evaluate(parse("(fn x. x x) (fn x. x x)"))
+
+        self.assertEqual(result.status, "cancelled")
+        self.assertEqual(result.reason, "stop requested after 64 steps")
+
+    def test_cycle_detection(self):
+        result = Evaluator(detect_divergence=True).evaluate(parse("(fn x. x x) (fn x. x x)"))
+
+        self.assertEqual(result.status, "cycle")
+        self.assertIn("every 1 steps", result.reason)
+        self.assertEqual(result.metrics.beta_steps, 1)
+        self.assertEqual(result.expression, parse("(fn x. x x) (fn x. x x)"))
+
+    def test_longer_cycle_inside_context(self):
+        # Under a binder, A B A becomes B A B and then A B A again, two steps each
+        source = "fn z. (fn x. fn y. x y x) (fn a. fn b. a b a) (fn c. fn d. c d c)"
+        result = Evaluator(detect_divergence=True).evaluate(parse(source))
+
+        self.assertEqual(result.status, "cycle")
+        self.assertIn("every 4 steps", result.reason)
+
+    def test_unbounded_growth(self):
+        result = Evaluator(detect_divergence=True, growth_window=10).evaluate(parse("(fn x. x x x) (fn x. x x x)"))
+
+        self.assertEqual(result.status, "diverging")
+        self.assertEqual(result.metrics.beta_steps, 10)
+
+    def test_divergence_detection_rebuilds_few_terms(self):
+        # The term grows on every step, so it can only equal the checkpoint
+        # when the checkpoint moves, after 1, 2, 4, ... steps
+        evaluator = Evaluator(detect_divergence=True, growth_window=10_000, max_steps=1000)
+        plug = evaluator.plug
+        calls = []
+        evaluator.plug = lambda focus: calls.append(focus) or plug(focus)
+        result = evaluator.evaluate(parse("(fn x. x x x) (fn x. x x x)"))
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertLessEqual(len(calls), 11)
+        self.assertEqual(evaluator.checkpoint[0], 511)
+
+    def test_divergence_detection_keeps_normal_forms(self):
+        source = "(fn f. fn x. f (f x)) (fn f. fn x. f (f x))"
+        self.assertEqual(Evaluator(detect_divergence=True).reduce(parse(source)), Evaluator().reduce(parse(source)))
+
+    def test_step_budget_stops_divergent_term(self):
+        result = Evaluator(max_steps=50).evaluate(parse("(fn x. x x) (fn x. x x)"))
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertEqual(result.metrics.beta_steps, 50)
+        self.assertEqual(result.expression, parse("(fn x. x x) (fn x. x x)"))
+
+    def test_step_budget_above_the_recursion_limit(self):
+        steps = 5 * sys.getrecursionlimit()
+        for strategy in ReductionStrategy:
+            with self.subTest(strategy=strategy):
+                result = Evaluator(strategy, max_steps=steps).evaluate(parse("(fn x. x x) (fn x. x x)"))
+
+                self.assertEqual(result.status, "budget_exceeded")
+                self.assertEqual(result.metrics.beta_steps, steps)
+
+    def test_growing_head_is_not_limited_by_recursion(self):
+        steps = 2 * sys.getrecursionlimit()
+        result = Evaluator(ReductionStrategy.NORMAL_ORDER, max_steps=steps).evaluate(parse("(fn x. x x y) (fn x. x x y)"))
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertGreater(result.expression.depth, steps)
+
+    def test_substitution_into_deep_terms(self):
+        # A numeral deeper than the recursion limit is substituted into a body,
+        # and in the second case renamed too since the argument's x is free
+        n = 3 * sys.getrecursionlimit()
+        result = Evaluator().evaluate(parse(f"(fn n f x. f (n f x)) {n}"))
+        self.assertEqual(ChurchNumeral().decode_church_numeral(result.expression), n + 1)
+
+        result = Evaluator().evaluate(parse(f"(fn y. fn x. {n} (fn a. a x) y) x"))
+        self.assertEqual(result.status, "completed")
+        self.assertGreaterEqual(result.metrics.alpha_renamings, 1)
+        self.assertEqual(result.expression.free_vars, {"x"})
+
+    def test_size_budget(self):
+        result = Evaluator(max_size=20).evaluate(parse("(fn x. x x x) (fn x. x x x)"))
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertIn("size", result.reason)
+
+    def test_partial_term_keeps_context(self):
+        with self.assertRaises(BudgetExceeded) as context:
+            Evaluator(ReductionStrategy.NORMAL_ORDER, max_steps=1).reduce(parse("fn z. (fn x. x) ((fn x. x) z)"))
+        self.assertEqual(context.exception.partial, parse("fn z. (fn x. x) z"))
+
+    def test_metrics_as_data(self):
+        data = Evaluator().evaluate(parse("(fn x. x) y")).to_dict()
+
+        self.assertEqual(data["status"], "completed")
+        self.assertEqual(data["expression"], "y")
+        self.assertEqual(data["metrics"]["beta_steps"], 1)
+
+
+class TestBackendLimits(unittest.TestCase):
+
+    def test_unsupported_flags_are_rejected_with_a_backend(self):
+        for flags in (["--timeout", "1"], ["--max-size", "10"], ["--detect-loops"], ["--max-steps", "10"], ["--strategy", "normal"]):
+            with self.subTest(flags), mock.patch.object(main, "arguments", ["main.py", "--backend", "nbe", *flags]):
+                with redirect_stderr(io.StringIO()) as errors, self.assertRaises(SystemExit) as exit:
+                    main.main()
+                self.assertEqual(exit.exception.code, 64)
+                self.assertIn(f"{flags[0]} not supported by the nbe backend", errors.getvalue())
+
+    def test_first_interrupt_stops_a_backend_that_never_checks(self):
+        with self.assertRaises(KeyboardInterrupt):
+            Repl(backend="nbe").interrupt(signal.SIGINT, None)
+
+        repl = Repl()
+        repl.interrupt(signal.SIGINT, None)
+        self.assertTrue(repl.cancellation.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from beta_reduction import Evaluator
+from church_encoding import ChurchNumeral
+from reduction_strategy import ReductionStrategy
+from test.helpers import parse
+
+
+class TestReductionStrategy(unittest.TestCase):
+
+    def test_full_normal_form_strategies_agree(self):
+        source = "(fn m. fn n. fn f. m (n f)) (fn f. fn x. f (f x)) (fn f. fn x. f (f (f x)))"
+        for strategy in (ReductionStrategy.DEFAULT, ReductionStrategy.NORMAL_ORDER, ReductionStrategy.APPLICATIVE_ORDER):
+            with self.subTest(strategy):
+                result = Evaluator(strategy).reduce(parse(source))
+                self.assertEqual(ChurchNumeral().decode_church_numeral(result), 6)
+
+    def test_normal_order_discards_divergent_argument(self):
+        result = Evaluator(ReductionStrategy.NORMAL_ORDER).reduce(parse("(fn x. y) ((fn x. x x) (fn x. x x))"))
+        self.assertEqual(result, parse("y"))
+
+    def test_weak_head_normal_form_stops_at_abstraction(self):
+        source = "(fn x. fn y. (fn z. z) x) a"
+        for strategy in (ReductionStrategy.CALL_BY_NAME, ReductionStrategy.CALL_BY_VALUE):
+            with self.subTest(strategy):
+                self.assertEqual(Evaluator(strategy).reduce(parse(source)), parse("fn y. (fn z. z) a"))
+
+    def test_call_by_value_reduces_argument_first(self):
+        evaluator = Evaluator(ReductionStrategy.CALL_BY_VALUE)
+        result = evaluator.reduce(parse("(fn x. fn y. x) ((fn z. z) a)"))
+
+        self.assertEqual(result, parse("fn y. a"))
+        self.assertEqual(evaluator.beta_steps, 2)
+
+    def test_call_by_name_leaves_argument_unevaluated(self):
+        result = Evaluator(ReductionStrategy.CALL_BY_NAME).reduce(parse("(fn x. fn y. x) ((fn z. z) a)"))
+        self.assertEqual(result, parse("fn y. (fn z. z) a"))
+
+    def test_head_normal_form_leaves_arguments(self):
+        result = Evaluator(ReductionStrategy.HEAD_NORMAL_FORM).reduce(parse("(fn x. fn y. y x) ((fn z. z) a)"))
+        self.assertEqual(result, parse("fn y. y ((fn z. z) a)"))
+
+    def test_steps_are_reset_per_reduction(self):
+        evaluator = Evaluator(ReductionStrategy.NORMAL_ORDER)
+        evaluator.reduce(parse("(fn x. x) ((fn x. x) y)"))
+        self.assertEqual(evaluator.beta_steps, 2)
+        evaluator.reduce(parse("(fn x. x) y"))
+        self.assertEqual(evaluator.beta_steps, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from ast_internal import LambdaApplicationNode
+from term_store import TermStore
+from test.helpers import parse
+
+
+class TestTermStore(unittest.TestCase):
+
+    def test_round_trip(self):
+        sources = ["x", "fn x. x", "(fn x. fn y. x y) (fn z. z) w", "fn f. fn x. f (f (f x))"]
+        for source in sources:
+            with self.subTest(source):
+                store = TermStore()
+                self.assertIs(store.to_expression(store.from_expression(parse(source))), parse(source))
+
+    def test_keeps_sharing(self):
+        shared = parse("fn f. fn x. f (f x)")
+        term = LambdaApplicationNode(shared, shared)
+
+        store = TermStore()
+        handle = store.from_expression(term)
+
+        # fn f, fn x, f x, f (f x), f, x and the application; f is one hash-consed node
+        self.assertEqual(len(store), 7)
+        self.assertEqual(store.sizes()[handle], term.size)
+
+    def test_free_variables(self):
+        store = TermStore()
+        handles = [store.from_expression(parse(source)) for source in ["fn x. x y", "(fn y. z y) x", "fn a. a"]]
+        self.assertEqual([store.free_variables(handle) for handle in handles], [{"y"}, {"z", "x"}, set()])
+
+    def test_serialization(self):
+        store = TermStore()
+        handle = store.from_expression(parse("(fn x. fn y. x y) (fn z. z) w"))
+
+        loaded = TermStore.from_bytes(store.to_bytes())
+
+        self.assertEqual(loaded.names, store.names)
+        self.assertIs(loaded.to_expression(handle), parse("(fn x. fn y. x y) (fn z. z) w"))
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            TermStore.from_bytes(b"nope" + bytes(16))
@@ -0,0 +1,80 @@
+import os
+import unittest
+import tempfile
+from lexer import Lexer
+from parser import Parser
+from token_stream import TokenStream, map_file
+from test.helpers import parse
+
+
+class TestTokenStream(unittest.TestCase):
+
+    def test_same_tokens_as_lexer(self):
+        sources = [
+            "",
+            "; only a comment",
+            "def ADD_2 = fn m n f x. m f (n f x)\n  (ADD_2 12)\r\n",
+            'import "lib/préludé.lbda" x ; commentaire é\ny',
+            "x\t(fn y1.\n\n   y1 x)   ",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                stream = TokenStream(source.encode("utf-8"), 3)
+                stream.tokenize()
+                self.assertEqual(list(stream), list(Lexer(source, 3).scan()))
+
+    def test_lexemes_are_interned_when_needed(self):
+        stream = TokenStream(b"fn x. x x")
+        stream.tokenize()
+
+        self.assertEqual(stream.lexemes, {})
+        self.assertIs(stream.lexeme(1), stream.lexeme(4))
+        self.assertEqual(len(stream.lexemes), 1)
+        self.assertEqual(stream.nbytes, 5 * 4 * 4 + 5)
+
+    def test_unknown_character(self):
+        with self.assertRaises(SyntaxError):
+            TokenStream(b"x $ y").tokenize()
+        with self.assertRaises(SyntaxError):
+            TokenStream(b'import "prelude.lbda').tokenize()
+
+    def test_forms_release_the_tokens_of_earlier_forms(self):
+        stream = TokenStream(b"".join(b"(fn x%d. x%d) y\n" % (i, i) for i in range(1000)))
+        sizes = []
+        for line, tokens in stream.forms():
+            self.assertEqual(tokens[1].lexeme, "fn")
+            self.assertEqual(tokens[2].line, line)
+            sizes.append(len(stream))
+
+        self.assertEqual(len(sizes), 1000)
+        self.assertLessEqual(max(sizes), 8)
+        self.assertLessEqual(len(stream.lexemes), 3)
+
+    def test_parser_reads_a_stream(self):
+        parsed = []
+        for _, tokens in TokenStream(b"(fn x. x) y\nfn f. 2 f\n").forms():
+            parser = Parser(tokens)
+            parser.parse()
+            parsed.append(parser.get_ast()[0])
+
+        self.assertEqual(parsed, [parse("(fn x. x) y"), parse("fn f. 2 f")])
+
+    def test_memory_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "program.lbda")
+            with open(path, "w") as f:
+                f.write("fn x. x\n")
+            open(os.path.join(directory, "empty.lbda"), "w").close()
+
+            with open(path, "rb") as f:
+                buffer = map_file(f)
+                stream = TokenStream(buffer)
+                stream.tokenize()
+                self.assertEqual([token.lexeme for token in stream], ["fn", "x", ".", "x"])
+                buffer.close()
+            with open(os.path.join(directory, "empty.lbda"), "rb") as f:
+                self.assertEqual(len(TokenStream(map_file(f))), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import json
+import unittest
+from beta_reduction import Evaluator
+from tracing import tracer, traced
+from test.helpers import parse
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        tracer.disable()
+        tracer.reset()
+
+    def tearDown(self):
+        tracer.disable()
+        tracer.reset()
+
+    def test_disabled_methods_are_plain_functions(self):
+        self.assertFalse(hasattr(Evaluator.beta_reduce, "__wrapped__"))
+        self.assertFalse(hasattr(Evaluator.substitute, "__wrapped__"))
+
+    def test_toggle_at_runtime(self):
+        tracer.enable()
+        self.assertTrue(hasattr(Evaluator.beta_reduce, "__wrapped__"))
+        tracer.disable()
+        self.assertFalse(hasattr(Evaluator.beta_reduce, "__wrapped__"))
+
+    def test_json_line_events(self):
+        sink = io.StringIO()
+        tracer.enable(sink)
+        Evaluator().beta_reduce(parse("(fn x. x) y"))
+
+        events = [json.loads(line) for line in sink.getvalue().splitlines()]
+        self.assertEqual(events[0]["event"], "enter")
+        self.assertEqual(events[0]["op"], "Evaluator.beta_reduce")
+        self.assertEqual(events[0]["args"][1]["kind"], "Application")
+        self.assertEqual(events[0]["args"][1]["size"], 4)
+        self.assertEqual(events[-1]["event"], "exit")
+        self.assertEqual(events[-1]["result"]["kind"], "Variable")
+
+    def test_sampling_keeps_profile_complete(self):
+        sink = io.StringIO()
+        tracer.enable(sink, sample_rate=0.0)
+        Evaluator().beta_reduce(parse("(fn x. x) y"))
+
+        self.assertEqual(sink.getvalue(), "")
+        calls = sum(entry.calls for (operation, _), entry in tracer.profile.items() if operation == "Evaluator.contract")
+        self.assertEqual(calls, 1)
+
+    def test_report(self):
+        tracer.enable()
+        Evaluator().beta_reduce(parse("(fn x. x) y"))
+
+        report = tracer.report()
+        self.assertIn("Evaluator.beta_reduce", report)
+        self.assertIn("Evaluator.substitute", report)
+        self.assertIn("beta_reduction.py:", report)
+
+    def test_free_function(self):
+        @traced
+        def double(x):
+            return x * 2
+
+        self.assertEqual(double(5), 10)
+        tracer.enable()
+        self.assertEqual(double(5), 10)
+        self.assertEqual(sum(entry.calls for entry in tracer.profile.values()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 from token_type import TokenType
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     token_type: TokenType
     lexeme: str
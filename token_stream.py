@@ -0,0 +1,175 @@
+import re
+import mmap
+from array import array
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+from lexer import identifier_type
+from token_internal import Token
+from token_type import TokenType
+
+# Token kinds are stored as indexes into this list
+KIND_NAMES: List[str] = [token_type.name for token_type in TokenType]
+LPAREN: int = KIND_NAMES.index(TokenType.LPAREN.name)
+RPAREN: int = KIND_NAMES.index(TokenType.RPAREN.name)
+STRING: int = KIND_NAMES.index(TokenType.STRING.name)
+
+# Lexer's token syntax over bytes, with newlines as matches of their own so
+# lines can be counted. A comment runs to the end of its line, so the engine
+# can't backtrack into one, and every position matches something.
+_TOKEN_PATTERN = re.compile(rb"""
+    (?:[ \t\r]+|;[^\n]*(?![^\n]))*
+    (?:
+        (?P<NEWLINE>\n)
+      | (?P<TOKEN>[A-Za-z][A-Za-z0-9_]*|[0-9]+|"[^"\n]*"|[().=])
+      | (?P<END>\Z)
+      | (?P<ERROR>[^ \t\r;\n])
+    )
+""", re.VERBOSE)
+
+_FIRST_BYTE_KINDS: Dict[int, int] = {
+    **{c: KIND_NAMES.index(TokenType.NUMBER.name) for c in b"0123456789"},
+    ord('"'): STRING,
+    ord("("): LPAREN,
+    ord(")"): RPAREN,
+    ord("."): KIND_NAMES.index(TokenType.DOT.name),
+    ord("="): KIND_NAMES.index(TokenType.EQUALS.name),
+}
+
+
+def map_file(f: BinaryIO):
+    # A read-only memory map of an open file (mmap refuses empty files)
+    size: int = f.seek(0, 2)
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+
+class TokenStream:
+    """
+    The tokens of a UTF-8 source buffer (usually a memory-mapped file) as
+    parallel arrays of kind, start offset, length, line and column, instead of
+    one Token object and lexeme string per token.
+
+    The stream is a sequence of Tokens, so Parser reads it like a token list:
+    indexing builds a Token on demand, and its lexeme is decoded from the
+    buffer and interned the first time it is needed. Tokens, lines and columns
+    are the same as Lexer.scan gives for the decoded source.
+    """
+    def __init__(self, buffer, line: int = 1):
+        self.buffer = buffer
+        self.line: int = line # line of the file the buffer starts on
+        self.kinds: array = array("b")
+        self.starts: array = array("i")
+        self.lengths: array = array("i")
+        self.lines: array = array("i")
+        self.columns: array = array("i")
+        self.lexemes: Dict[bytes, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(KIND_NAMES[self.kinds[index]], self.lexeme(index), self.lines[index], self.columns[index])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (self.kinds, self.starts, self.lengths, self.lines, self.columns))
+
+    def lexeme(self, index: int) -> str:
+        start: int = self.starts[index]
+        raw: bytes = self.buffer[start:start + self.lengths[index]]
+        lexeme = self.lexemes.get(raw)
+        if lexeme is None:
+            lexeme = self.lexemes[raw] = raw.decode("utf-8")
+        return lexeme
+
+    def tokenize(self) -> None:
+        for _ in self.scan():
+            pass
+
+    def scan(self) -> Iterator[int]:
+        # Appends the tokens of the buffer, yielding the index of each one
+        identifier_kinds: Dict[bytes, int] = {}
+        line: int = self.line
+        line_start: int = 0
+        shift: int = 0 # bytes of the line so far that aren't characters of their own
+
+        for match in _TOKEN_PATTERN.finditer(self.buffer):
+            kind_name: str = match.lastgroup
+            if kind_name == "NEWLINE":
+                line += 1
+                line_start = match.end()
+                shift = 0
+                continue
+            if kind_name == "END":
+                return
+            start, end = match.span(kind_name)
+            if kind_name == "ERROR":
+                character: str = self.buffer[start:end].decode("utf-8", "replace")
+                problem = f"Unterminated string at line: {line}" if character == '"' else f"Unknown character: {character} at line: {line}"
+                raise SyntaxError(f"something went wrong during scanning: {problem}")
+
+            kind = _FIRST_BYTE_KINDS.get(self.buffer[start])
+            if kind is None:
+                raw: bytes = match.group(kind_name)
+                kind = identifier_kinds.get(raw)
+                if kind is None:
+                    kind = identifier_kinds[raw] = KIND_NAMES.index(identifier_type(raw.decode("ascii")))
+
+            self.kinds.append(kind)
+            self.starts.append(start)
+            self.lengths.append(end - start)
+            self.lines.append(line)
+            self.columns.append(start - line_start - shift + 1)
+            if kind == STRING:
+                shift += (end - start) - len(self.buffer[start:end].decode("utf-8"))
+            yield len(self.kinds) - 1
+
+    def forms(self) -> Iterator[Tuple[int, "TokenView"]]:
+        """
+        Scans the buffer and yields (first line, tokens) for each top-level
+        form as soon as it is complete. A token in the first column starts a
+        new form once every parenthesis of the previous one is closed, so
+        indented lines continue a form; comments and strings hold no tokens
+        that count.
+
+        A view is only valid until the next form is asked for: then the
+        tokens and interned lexemes of the previous form are dropped, so the
+        stream holds no more than one form at a time.
+        """
+        first: int = 0
+        depth: int = 0
+        for index in self.scan():
+            if index > first and depth <= 0 and self.columns[index] == 1:
+                yield self.lines[first], TokenView(self, first, index)
+                self.discard(index)
+                first = index = 0
+                depth = 0
+            kind = self.kinds[index]
+            if kind == LPAREN:
+                depth += 1
+            elif kind == RPAREN:
+                depth -= 1
+        if len(self) > first:
+            yield self.lines[first], TokenView(self, first, len(self))
+
+    def discard(self, count: int) -> None:
+        # Drops the first count tokens, so later ones are numbered from 0
+        for column in (self.kinds, self.starts, self.lengths, self.lines, self.columns):
+            del column[:count]
+        self.lexemes.clear()
+
+
+class TokenView:
+    # The tokens of a stream from start up to stop, as a sequence for Parser
+    __slots__ = ("stream", "start", "stop")
+
+    def __init__(self, stream: TokenStream, start: int, stop: int):
+        self.stream = stream
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: int) -> Token:
+        if not 0 <= index < self.stop - self.start:
+            raise IndexError("token index out of range")
+        return self.stream[self.start + index]
@@ -7,4 +7,10 @@ class TokenType(Enum):
     DOT = "dot"
     LPAREN = "lparen"
     RPAREN = "rparen"
+    DEF = "def"
+    NAME = "name" # name of a definition: an uppercase letter followed by uppercase letters, digits or "_"
+    EQUALS = "equals"
+    IMPORT = "import"
+    STRING = "string" # double quoted, the lexeme keeps the quotes
+    NUMBER = "number" # decimal literal, read as the Church numeral
     EOF = "eof"
\ No newline at end of file
@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import random
+import functools
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+from ast_internal import Expression
+
+
+class ProfileEntry:
+    __slots__ = ("calls", "total_time")
+
+    def __init__(self):
+        self.calls: int = 0
+        self.total_time: float = 0.0
+
+
+class Tracer:
+    """
+    Runtime-switchable tracing and profiling for functions marked with @traced.
+
+    While disabled, the marked methods are the plain functions themselves, so
+    tracing costs nothing. enable() swaps instrumented wrappers onto their
+    classes and disable() puts the originals back.
+
+    When enabled, every traced call is aggregated into a profile keyed by
+    operation and call site. If a sink is given, sampled calls are also written
+    to it as JSON lines; AST arguments are identified by node id and size
+    instead of their full repr.
+    """
+    def __init__(self):
+        self.enabled: bool = False
+        self.sink: Optional[TextIO] = None
+        self.sample_rate: float = 1.0
+        self.depth: int = 0
+        self.profile: Dict[Tuple[str, str], ProfileEntry] = {}
+        self.trace_points: List["TracePoint"] = []
+
+    def enable(self, sink: Optional[TextIO] = None, sample_rate: float = 1.0) -> None:
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.enabled = True
+        for trace_point in self.trace_points:
+            trace_point.install()
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.sink = None
+        for trace_point in self.trace_points:
+            trace_point.install()
+
+    def reset(self) -> None:
+        self.profile = {}
+        self.depth = 0
+
+    def register(self, trace_point: "TracePoint") -> None:
+        self.trace_points.append(trace_point)
+
+    def instrument(self, func: Callable) -> Callable:
+        operation: str = func.__qualname__
+        tracer = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            caller = sys._getframe(1)
+            location = f"{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno}"
+            depth = tracer.depth
+            sampled = tracer.sink is not None and (tracer.sample_rate >= 1.0 or random.random() < tracer.sample_rate)
+
+            if sampled:
+                tracer.emit({"event": "enter", "op": operation, "loc": location, "depth": depth, "args": [describe(arg) for arg in args]})
+
+            tracer.depth = depth + 1
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                tracer.depth = depth
+                entry = tracer.profile.get((operation, location))
+                if entry is None:
+                    entry = tracer.profile[(operation, location)] = ProfileEntry()
+                entry.calls += 1
+                entry.total_time += elapsed
+
+            if sampled:
+                tracer.emit({"event": "exit", "op": operation, "loc": location, "depth": depth, "result": describe(result), "time": elapsed})
+            return result
+
+        return wrapper
+
+    def emit(self, event: dict) -> None:
+        self.sink.write(json.dumps(event) + "\n")
+
+    def report(self) -> str:
+        # Times are inclusive: a recursive call is also counted in its callers
+        operations: Dict[str, ProfileEntry] = {}
+        for (operation, _), entry in self.profile.items():
+            total = operations.setdefault(operation, ProfileEntry())
+            total.calls += entry.calls
+            total.total_time += entry.total_time
+
+        lines: List[str] = [f"{'operation / call site':<50} {'calls':>10} {'time (ms)':>12}"]
+        for operation, total in sorted(operations.items(), key=lambda item: -item[1].total_time):
+            lines.append(f"{operation:<50} {total.calls:>10} {total.total_time * 1000:>12.3f}")
+            sites = [(location, entry) for (op, location), entry in self.profile.items() if op == operation]
+            for location, entry in sorted(sites, key=lambda item: -item[1].total_time):
+                lines.append(f"  {location:<48} {entry.calls:>10} {entry.total_time * 1000:>12.3f}")
+        return "\n".join(lines)
+
+
+def describe(value):
+    # Compact, JSON friendly description of a traced argument or result
+    if isinstance(value, Expression):
+        return {"node": f"{id(value):x}", "kind": value.type, "size": value.size}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return type(value).__name__
+
+
+class TracePoint:
+    """
+    Returned by @traced. Used inside a class body it replaces itself with the
+    plain function (or the instrumented one while tracing is on); used on a
+    free function it stays callable and checks the tracer on every call.
+    """
+    def __init__(self, func: Callable, tracer: Tracer):
+        functools.update_wrapper(self, func)
+        self.func: Callable = func
+        self.tracer: Tracer = tracer
+        self.wrapper: Callable = tracer.instrument(func)
+        self.owner: Optional[type] = None
+        self.name: Optional[str] = None
+
+    def __set_name__(self, owner: type, name: str):
+        self.owner = owner
+        self.name = name
+        self.tracer.register(self)
+        self.install()
+
+    def install(self) -> None:
+        if self.owner is not None:
+            setattr(self.owner, self.name, self.wrapper if self.tracer.enabled else self.func)
+
+    def __call__(self, *args, **kwargs):
+        if self.tracer.enabled:
+            return self.wrapper(*args, **kwargs)
+        return self.func(*args, **kwargs)
+
+
+tracer: Tracer = Tracer()
+
+
+def traced(func: Callable) -> TracePoint:
+    if not callable(func):
+        raise TypeError("Expected an argument of type function")
+    return TracePoint(func, tracer)
+
+
+# Keep DEBUG=1 working as a way to switch tracing on from the environment
+if int(os.getenv("DEBUG", 0)):
+    tracer.enable(sys.stderr)